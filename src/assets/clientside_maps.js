@@ -0,0 +1,70 @@
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    maps: {
+        /**
+         * Recolor the sections of a map for the year selected with the slider, from the frames computed server-side
+         * (see `get_section_map_frames` in plotly_maps.py). The sections are drawn as one trace per color, the
+         * coordinates of the sections are separated by null, as done by `SectionTraceBatch`. The other traces of the
+         * figure (e.g. the colorbar) are kept.
+         */
+        recolor_section_map: function (selectedYear, frames, figure) {
+            if (!frames || !figure) {
+                return window.dash_clientside.no_update;
+            }
+            const EXTRA = "<extra></extra>";
+            const traces = new Map();
+
+            frames.sections.forEach(function (section) {
+                // index of the last assessment year <= selected year, like bisect_right(years, year) - 1
+                let yearIndex = -1;
+                while (yearIndex + 1 < section.years.length && section.years[yearIndex + 1] <= selectedYear) {
+                    yearIndex += 1;
+                }
+                // negative indices count from the end, as in python
+                if (yearIndex < 0) {
+                    yearIndex = section.colors.length + yearIndex;
+                }
+                const color = section.colors[yearIndex];
+                let hovertemplate = section.hovertemplates[yearIndex];
+                const hideTraceName = hovertemplate.endsWith(EXTRA);
+                if (hideTraceName) {
+                    hovertemplate = hovertemplate.slice(0, -EXTRA.length);
+                }
+
+                const key = color + "|" + hideTraceName;
+                if (!traces.has(key)) {
+                    traces.set(key, {
+                        type: "scattermap",
+                        mode: "lines",
+                        lat: [],
+                        lon: [],
+                        customdata: [],
+                        marker: {size: 10, color: color},
+                        line: {width: 10, color: color},
+                        name: frames.name,
+                        opacity: 1,
+                        hovertemplate: "%{customdata}" + (hideTraceName ? EXTRA : ""),
+                        showlegend: false,
+                    });
+                }
+                const trace = traces.get(key);
+                if (trace.lat.length > 0) {
+                    trace.lat.push(null);
+                    trace.lon.push(null);
+                    trace.customdata.push(null);
+                }
+                for (let i = 0; i < section.lat.length; i++) {
+                    trace.lat.push(section.lat[i]);
+                    trace.lon.push(section.lon[i]);
+                    trace.customdata.push(hovertemplate);
+                }
+            });
+
+            const otherTraces = figure.data.filter(function (trace) {
+                return trace.type !== "scattermap";
+            });
+            return Object.assign({}, figure, {
+                data: Array.from(traces.values()).concat(otherTraces),
+            });
+        },
+    },
+});
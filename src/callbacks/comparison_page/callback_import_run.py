@@ -9,7 +9,15 @@ from dash import Input, Output, State, callback, dcc, html
 from vrtool.common.enums import MechanismEnum
 from vrtool.defaults.vrtool_config import VrtoolConfig
 
-from src.component_ids import EDITABLE_COMPARISON_TABLE_ID, STORED_RUNS_COMPARISONS_DATA
+from src.component_ids import (
+    DROPDOWN_COMPARISON_RUNS_ID,
+    EDITABLE_COMPARISON_TABLE_ID,
+    IMPORT_COMPARISON_RUNS_BUTTON_ID,
+    IMPORT_COMPARISON_RUNS_PROGRESS_ID,
+    STORE_COMPARISON_CONFIGS_ID,
+    STORED_RUNS_COMPARISONS_DATA,
+    UPLOAD_COMPARISON_CONFIGS_ID,
+)
 from src.constants import REFERENCE_YEAR, ColorBarResultType, Measures, SubResultType
 from src.linear_objects.dike_traject import DikeTraject
 from src.orm.import_database import (
@@ -17,6 +25,8 @@ from src.orm.import_database import (
     get_name_optimization_runs,
     get_run_optimization_ids,
 )
+from src.orm.multi_run_import import BASE_RUN_NAME, import_runs
+from src.utils.traject_codec import load_dike_traject_data
 from src.utils.utils import export_to_json, get_vr_config_from_dict
 
 
@@ -54,7 +64,7 @@ def upload_and_save_in_project_data(
             content_type, content_string = contents.split(",")
 
             decoded = base64.b64decode(content_string)
-            json_content = json.loads(decoded)
+            json_content = load_dike_traject_data(decoded)
             traject_name, run_name = json_content["name"], json_content["run_name"]
             stored_imported_runs_data[f"{traject_name}|{run_name}"] = json_content
             return stored_imported_runs_data
@@ -65,7 +75,108 @@ def upload_and_save_in_project_data(
         return dash.no_update
 
 
-#
+@callback(
+    [
+        Output(STORE_COMPARISON_CONFIGS_ID, "data"),
+        Output(DROPDOWN_COMPARISON_RUNS_ID, "options"),
+    ],
+    [Input(UPLOAD_COMPARISON_CONFIGS_ID, "contents")],
+    [State(UPLOAD_COMPARISON_CONFIGS_ID, "filename")],
+    prevent_initial_call=True,
+)
+def upload_comparison_configs(contents: list[str], filenames: list[str]) -> tuple:
+    """
+    Callback for the upload of the config.json files of the databases from which runs are imported for the comparison.
+
+    :param contents: list of the string contents of the uploaded json files. Each file should content at least:
+        - traject: name of the traject
+        - input_directory: directory where the input database is located.
+        - input_database_name: name of the input database.
+        - excluded_mechanisms: list of mechanisms to be excluded from the analysis.
+    :param filenames: names of the uploaded files.
+
+    :return: tuple with the list of the configs and the options of the dropdown of the runs, the value of an option is
+    "<index of the config>|<run name>"
+    """
+    if contents is None:
+        return dash.no_update, dash.no_update
+
+    _configs = []
+    _options = []
+    for _content in contents:
+        try:
+            content_type, content_string = _content.split(",")
+            _config = json.loads(base64.b64decode(content_string))
+            _vr_config = get_vr_config_from_dict(_config)
+            _run_names = get_name_optimization_runs(_vr_config)
+        except:
+            continue
+
+        if BASE_RUN_NAME not in _run_names:
+            _run_names = [BASE_RUN_NAME] + _run_names
+        for _run_name in _run_names:
+            _options.append(
+                {
+                    "label": f"{_config['traject']} - {_run_name} ({_config['input_database_name']})",
+                    "value": f"{len(_configs)}|{_run_name}",
+                }
+            )
+        _configs.append(_config)
+
+    return _configs, _options
+
+
+@callback(
+    Output(STORED_RUNS_COMPARISONS_DATA, "data", allow_duplicate=True),
+    Input(IMPORT_COMPARISON_RUNS_BUTTON_ID, "n_clicks"),
+    [
+        State(DROPDOWN_COMPARISON_RUNS_ID, "value"),
+        State(STORE_COMPARISON_CONFIGS_ID, "data"),
+        State(STORED_RUNS_COMPARISONS_DATA, "data"),
+    ],
+    background=True,
+    running=[(Output(IMPORT_COMPARISON_RUNS_BUTTON_ID, "disabled"), True, False)],
+    progress=[Output(IMPORT_COMPARISON_RUNS_PROGRESS_ID, "children")],
+    prevent_initial_call=True,
+)
+def import_comparison_runs(
+    set_progress,
+    n_clicks: int,
+    selected_runs: list[str],
+    configs: list[dict],
+    stored_imported_runs_data: dict,
+):
+    """
+    Background callback importing the selected runs for the comparison. The runs are imported concurrently on a
+    process pool (see `import_runs`), the progress is displayed below the import button.
+
+    :param n_clicks: dummy input to trigger the callback upon clicking.
+    :param selected_runs: values of the selected options of the dropdown, "<index of the config>|<run name>"
+    :param configs: list of the contents of the uploaded config.json files
+    :param stored_imported_runs_data: runs already imported for the comparison
+
+    :return: the imported runs for the comparison, with key format "traject|run"
+    """
+    if not n_clicks or not selected_runs or not configs:
+        return dash.no_update
+
+    _run_selections = []
+    for _selected_run in selected_runs:
+        _config_index, _run_name = _selected_run.split("|", 1)
+        _run_selections.append((configs[int(_config_index)], _run_name))
+
+    def set_import_progress(nb_imported: int, nb_runs: int):
+        set_progress(html.Small(f"{nb_imported}/{nb_runs} berekeningen geïmporteerd"))
+
+    set_import_progress(0, len(_run_selections))
+    _imported_runs_data = import_runs(_run_selections, set_progress=set_import_progress)
+
+    if stored_imported_runs_data is None:
+        stored_imported_runs_data = dict()
+    stored_imported_runs_data.update(_imported_runs_data)
+    return stored_imported_runs_data
+
+
 @callback(
     Output(EDITABLE_COMPARISON_TABLE_ID, "rowData"),
     Input(STORED_RUNS_COMPARISONS_DATA, "data"),
@@ -4,6 +4,7 @@ import json
 import logging
 import shutil
 from pathlib import Path
+from typing import Optional
 
 import dash
 import pandas as pd
@@ -28,8 +29,11 @@ from src.constants import Mechanism
 from src.layouts.layout_database_interaction.layout_custom_measures_table import (
     columns_defs,
 )
-from src.linear_objects.dike_traject import DikeTraject
-from src.orm.import_database import get_all_custom_measures
+from src.orm.database_session import database_writer_session
+from src.orm.import_database import get_custom_measures
+from src.orm.importers.custom_measures_importer import get_last_custom_measure_id
+from src.orm.traject_cache import invalidate_traject_cache
+from src.utils.traject_store import get_dike_traject
 from src.utils.utils import get_vr_config_from_dict
 
 
@@ -48,10 +52,8 @@ def upload_csv_and_add_measure(
     # 1. Get VrConfig from stored_config
     _vr_config = get_vr_config_from_dict(vr_config)
     # get the names of the custom measures that are already in the database
-    custom_measures_ini = get_all_custom_measures(_vr_config)
-    custom_measure_names = list(
-        set([measure["measure_name"] for measure in custom_measures_ini])
-    )
+    custom_measures_ini = get_custom_measures(_vr_config)
+    custom_measure_names = list(set(custom_measures_ini["measure_name"]))
 
     # 2. Get custom measures from the table
     if contents is not None:
@@ -66,12 +68,17 @@ def upload_csv_and_add_measure(
 
         # Convert to list of lists (including headers)
         row_data = [df.columns.tolist()] + df.values.tolist()
-        return process(row_data, _vr_config, custom_measure_names)
+        return process(row_data, _vr_config, custom_measure_names, custom_measures_ini)
 
     return dash.no_update, dash.no_update, dash.no_update
 
 
-def process(row_data, _vr_config, custom_measure_names):
+def process(
+    row_data,
+    _vr_config,
+    custom_measure_names,
+    custom_measures_ini: Optional[pd.DataFrame] = None,
+):
     custom_measure_list_1 = convert_custom_table_to_input(row_data)  # "MEASURE_NAME
 
     if custom_measure_list_1 == "Invalid error name":
@@ -142,15 +149,26 @@ def process(row_data, _vr_config, custom_measure_names):
         def emit(self, record):
             return self.format(record)
 
-    with ModalPopupLogHandler() as handler:
+    with ModalPopupLogHandler() as handler, database_writer_session(source_db):
         _added_measures = add_custom_measures(_vr_config, custom_measure_list_1)
+    invalidate_traject_cache(_vr_config)
 
-    # 5. Update table displaying ALL custom measures
-    custom_measures = get_all_custom_measures(_vr_config)
+    # 5. Update table displaying ALL custom measures, only the added rows are read if the initial ones are known
+    if custom_measures_ini is None:
+        custom_measures = get_custom_measures(_vr_config)
+    else:
+        custom_measures = pd.concat(
+            [
+                custom_measures_ini,
+                get_custom_measures(
+                    _vr_config,
+                    after_id=get_last_custom_measure_id(custom_measures_ini),
+                ),
+            ],
+            ignore_index=True,
+        )
 
-    df = pd.DataFrame(
-        columns=[col["field"] for col in columns_defs], data=custom_measures
-    )
+    df = custom_measures[[col["field"] for col in columns_defs]]
 
     # 6. Check if a custom measure was already in database:
     processed_measures_name = []
@@ -192,20 +210,18 @@ def remove_all_custom_measure_in_db(n_clicks, vr_config: dict):
     """
     _vr_config = get_vr_config_from_dict(vr_config)
 
-    custom_measures_ini = get_all_custom_measures(_vr_config)
-    custom_measure_names_ini = list(
-        set([measure["measure_name"] for measure in custom_measures_ini])
-    )
+    custom_measures_ini = get_custom_measures(_vr_config)
+    custom_measure_names_ini = list(set(custom_measures_ini["measure_name"]))
 
-    safe_clear_custom_measure(_vr_config)
-    custom_measures = get_all_custom_measures(_vr_config)
-    custom_measure_names_after = list(
-        set([measure["measure_name"] for measure in custom_measures])
-    )
+    with database_writer_session(
+        _vr_config.input_directory / _vr_config.input_database_name
+    ):
+        safe_clear_custom_measure(_vr_config)
+    invalidate_traject_cache(_vr_config)
+    custom_measures = get_custom_measures(_vr_config)
+    custom_measure_names_after = list(set(custom_measures["measure_name"]))
 
-    df = pd.DataFrame(
-        columns=[col["field"] for col in columns_defs], data=custom_measures
-    )
+    df = custom_measures[[col["field"] for col in columns_defs]]
 
     return df.to_dict("records"), [
         f"{len(custom_measure_names_ini) - len(custom_measure_names_after)} maatregelen verwijderd uit de database."
@@ -267,16 +283,13 @@ def fill_custom_measures_table_from_database(
     """
     _vr_config = get_vr_config_from_dict(vr_config)
 
-    custom_measures = get_all_custom_measures(_vr_config)
+    custom_measures = get_custom_measures(_vr_config)
 
-    df = pd.DataFrame(
-        columns=[col["field"] for col in columns_defs], data=custom_measures
-    )
+    df = custom_measures[[col["field"] for col in columns_defs]]
 
     new_columns_defs = columns_defs.copy()
     new_columns_defs[1]["cellEditorParams"]["values"] = [
-        section.name
-        for section in DikeTraject.deserialize(dike_traject_data).dike_sections
+        section.name for section in get_dike_traject(dike_traject_data).dike_sections
     ]
 
     return df.to_dict("records"), new_columns_defs
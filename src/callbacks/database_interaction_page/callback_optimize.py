@@ -18,11 +18,13 @@ from src.component_ids import (
     STORE_CONFIG,
 )
 from src.constants import REFERENCE_YEAR, Measures
+from src.orm.database_session import database_writer_session
 from src.orm.import_database import (
     get_all_default_selected_measure,
-    get_measure_result_ids_per_section,
+    get_measure_result_ids_index,
     get_name_optimization_runs,
 )
+from src.orm.traject_cache import invalidate_traject_cache
 
 
 @callback(
@@ -159,6 +161,7 @@ def run_optimize_algorithm(
             run_vrtool_optimization(
                 _vr_config, optimization_run_name, selected_measures
             )
+            invalidate_traject_cache(_vr_config)
 
             # 4. Update the selection Dropwdown with all the names of the optimization runs
             _names_optimization_run = get_name_optimization_runs(_vr_config)
@@ -176,7 +179,10 @@ def run_vrtool_optimization(
 
     api = ApiRunWorkflows(_vr_config)
     try:
-        api.run_optimization(optimization_run_name, selected_measures)
+        with database_writer_session(
+            _vr_config.input_directory / _vr_config.input_database_name
+        ):
+            api.run_optimization(optimization_run_name, selected_measures)
     except KeyError as e:
         raise (
             f"Error during optimization: {e}. Make sure config.T is consistent with database"
@@ -198,6 +204,7 @@ def get_selected_measure(
     if dike_traject_table is None:
         raise NotImplementedError()
     else:
+        _measure_result_ids_index = get_measure_result_ids_index(vr_config)
         list_selected_measures = []
         for section_row in dike_traject_table:
             _investment_year = int(section_row["reference_year"]) - REFERENCE_YEAR
@@ -211,8 +218,8 @@ def get_selected_measure(
                 if not section_row[measure.name]:
                     continue
 
-                _measure_result_ids = get_measure_result_ids_per_section(
-                    vr_config, section_row["section_col"], measure.name
+                _measure_result_ids = _measure_result_ids_index.get(
+                    (section_row["section_col"], measure.name), []
                 )
 
                 for measure_result_id in _measure_result_ids:
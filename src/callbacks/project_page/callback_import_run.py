@@ -1,5 +1,4 @@
 import base64
-import json
 
 import dash
 import plotly.graph_objects as go
@@ -10,6 +9,7 @@ from src.component_ids import (
     OVERVIEW_PROJECT_MAP_ID_2,
     STORED_IMPORTED_RUNS_DATA,
 )
+from src.utils.traject_codec import load_dike_traject_data
 
 
 @callback(
@@ -42,7 +42,7 @@ def upload_and_save_in_project_data(
             content_type, content_string = contents.split(",")
 
             decoded = base64.b64decode(content_string)
-            json_content = json.loads(decoded)
+            json_content = load_dike_traject_data(decoded)
             traject_name, run_name = json_content["name"], json_content["run_name"]
             stored_imported_runs_data[f"{traject_name}"] = json_content
             return stored_imported_runs_data
@@ -12,6 +12,7 @@ from src.component_ids import (
     STORED_PROJECT_OVERVIEW_DATA,
     UPLOAD_SAVED_PROJECTS,
 )
+from src.utils.traject_codec import load_dike_traject_data
 
 
 @callback(
@@ -90,7 +91,7 @@ def upload_existing_saved_projects(contents: str, filename: str):
             content_type, content_string = contents.split(",")
 
             decoded = base64.b64decode(content_string)
-            json_content = json.loads(decoded)
+            json_content = load_dike_traject_data(decoded)
             imported_runs_data = json_content["imported_runs_data"]
             project_data = json_content["project_data"]
             return imported_runs_data, project_data
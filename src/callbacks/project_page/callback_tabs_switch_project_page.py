@@ -18,12 +18,12 @@ from src.layouts.layout_project_page.layout_project_visualization_tab import (
     fill_project_display_overview_table,
     project_visualization_tab_layout,
 )
-from src.linear_objects.reinforcement_program import DikeProgram, calc_area_stats_new
 from src.plotly_graphs.project_page.plotly_maps import plot_project_overview_map
 from src.plotly_graphs.project_page.plotly_plots import (
     plot_cost_vs_time_projects,
     projects_reliability_over_time,
 )
+from src.utils.program_cache import get_cached_program
 
 
 @callback(
@@ -101,7 +101,9 @@ def update_project_page_visualization(
             dash.no_update,
         )
 
-    program = DikeProgram(imported_runs_data, project_overview_data)
+    # the program is only built again when the imported runs or the projects change, not for the result type
+    _cached_program = get_cached_program(imported_runs_data, project_overview_data)
+    program = _cached_program.program
     projects, trajects = program.projects, program.dike_trajects
 
     cost_fig = plot_cost_vs_time_projects(projects)
@@ -112,7 +114,7 @@ def update_project_page_visualization(
 
     risk_table = []
 
-    cost, risk_metrics = calc_area_stats_new(program)
+    cost, risk_metrics = _cached_program.cost, _cached_program.risk_metrics
     for year in [2030, 2040, 2050, 2075]:
         risk_table.append(
             {
@@ -1,8 +1,7 @@
-import json
 from pathlib import Path
 
 import dash
-from dash import Input, Output, State, callback
+from dash import Input, Output, State, callback, dcc
 
 from src.component_ids import (
     BUTTON_DOWNLOAD_ASSESSMENT_NB_CLICKS,
@@ -20,7 +19,8 @@ from src.component_ids import (
     SLIDER_YEAR_RELIABILITY_RESULTS_ID,
     STORE_CONFIG,
 )
-from src.linear_objects.dike_traject import DikeTraject
+from src.utils.traject_codec import FORMAT_EXTENSION, encode_dike_traject_data
+from src.utils.traject_store import get_dike_traject, get_dike_traject_data
 from src.utils.utils import export_to_json, get_vr_config_from_dict
 
 
@@ -45,15 +45,19 @@ def download_traject_run_json(
         return dash.no_update
 
     else:
+        dike_traject_data = dict(get_dike_traject_data(dike_traject_data))
         dike_traject_data["run_name"] = run_name
-        content = json.dumps(dike_traject_data)
         _vr_config = get_vr_config_from_dict(vr_config)
         _path_save_dike_traject = _vr_config.input_directory.joinpath(
             f"{run_name}.json"
         )
+        # a JSON copy is kept next to the database, the download is in the compact binary format
         export_to_json(dike_traject_data, _path_save_dike_traject)
 
-        return dict(content=content, filename=f"{run_name}.json")
+        return dcc.send_bytes(
+            encode_dike_traject_data(dike_traject_data),
+            filename=f"{run_name}{FORMAT_EXTENSION}",
+        )
 
 
 @callback(
@@ -88,7 +92,7 @@ def download_overview_geojson(
         return dash.no_update
 
     else:
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
+        _dike_traject = get_dike_traject(dike_traject_data)
         return (
             dict(
                 content=_dike_traject.export_to_geojson(params),
@@ -134,7 +138,7 @@ def download_assessment_geojson(
         return dash.no_update
 
     else:
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
+        _dike_traject = get_dike_traject(dike_traject_data)
         return (
             dict(
                 content=_dike_traject.export_to_geojson(params),
@@ -188,7 +192,7 @@ def download_reinforced_sections_geojson(
         return dash.no_update
 
     else:
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
+        _dike_traject = get_dike_traject(dike_traject_data)
         return (
             dict(
                 content=_dike_traject.export_to_geojson(params),
@@ -19,14 +19,19 @@ from src.component_ids import (
     SELECT_GREEDY_OPTIMIZATION_STOP_CRITERIA,
     SLIDER_YEAR_RELIABILITY_RESULTS_ID,
     STORE_CONFIG,
+    TRAJECT_NOT_FOUND_TOAST_ID,
 )
 from src.constants import REFERENCE_YEAR, ColorBarResultType, Measures, SubResultType
-from src.linear_objects.dike_traject import DikeTraject
 from src.orm.import_database import (
-    get_dike_traject_from_config_ORM,
     get_name_optimization_runs,
     get_run_optimization_ids,
 )
+from src.orm.traject_cache import get_cached_dike_traject_data
+from src.utils.traject_store import (
+    get_dike_traject,
+    is_dike_traject_stored,
+    store_dike_traject_data,
+)
 from src.utils.utils import export_to_json, get_vr_config_from_dict
 
 
@@ -156,7 +161,7 @@ def selection_traject_run(name: str, vr_config: dict) -> dict:
 
     :param name: name of the traject
     :param vr_config: dictionary with the configuration of the traject.
-    :return: DikeTraject object
+    :return: token of the serialized DikeTraject in the server-side store
     """
 
     if vr_config is None or vr_config == {}:
@@ -168,26 +173,26 @@ def selection_traject_run(name: str, vr_config: dict) -> dict:
         return dash.no_update
 
     if name == "Basisberekening":
-        _dike_traject = get_dike_traject_from_config_ORM(
+        _dike_traject_data = get_cached_dike_traject_data(
             _vr_config, run_id_dsn=2, run_is_vr=1
         )
 
     elif name in get_name_optimization_runs(_vr_config):
         run_id_vr, run_id_dsn = get_run_optimization_ids(_vr_config, name)
-        _dike_traject = get_dike_traject_from_config_ORM(
+        _dike_traject_data = get_cached_dike_traject_data(
             _vr_config, run_id_dsn=run_id_dsn, run_is_vr=run_id_vr
         )
     else:
         raise ValueError("Name of the Optimization run is not correct.")
 
-    _dike_traject.run_name = name
+    _dike_traject_data["run_name"] = name
 
     _path_save_dike_traject = _vr_config.input_directory.joinpath(
         f"dike_traject_{_vr_config.traject}_{name}.json"
     )
-    # export_to_json(_dike_traject.serialize(), _path_save_dike_traject)
+    # export_to_json(_dike_traject_data, _path_save_dike_traject)
 
-    return _dike_traject.serialize()
+    return store_dike_traject_data(_dike_traject_data)
 
 
 @callback(
@@ -241,7 +246,7 @@ def recompute_dike_traject_with_new_greedy_criteria(
     _vr_config = get_vr_config_from_dict(vr_config)
 
     if name == "Basisberekening":
-        _dike_traject = get_dike_traject_from_config_ORM(
+        _dike_traject_data = get_cached_dike_traject_data(
             _vr_config,
             run_id_dsn=2,
             run_is_vr=1,
@@ -252,7 +257,7 @@ def recompute_dike_traject_with_new_greedy_criteria(
 
     elif name in get_name_optimization_runs(_vr_config):
         run_id_vr, run_id_dsn = get_run_optimization_ids(_vr_config, name)
-        _dike_traject = get_dike_traject_from_config_ORM(
+        _dike_traject_data = get_cached_dike_traject_data(
             _vr_config,
             run_id_dsn=run_id_dsn,
             run_is_vr=run_id_vr,
@@ -263,9 +268,28 @@ def recompute_dike_traject_with_new_greedy_criteria(
     else:
         raise ValueError("Name of the Optimization run is not correct.")
 
-    _dike_traject.run_name = name
+    _dike_traject_data["run_name"] = name
+
+    return store_dike_traject_data(_dike_traject_data), n_click
+
 
-    return _dike_traject.serialize(), n_click
+@callback(
+    Output(TRAJECT_NOT_FOUND_TOAST_ID, "is_open"),
+    [Input("stored-data", "data"), Input("url", "pathname")],
+)
+def check_stored_dike_traject(dike_traject_data: dict, pathname: str) -> bool:
+    """
+    Callback to ask the user to re-import the run when the traject of "stored-data" is not (anymore) in the traject
+    store, e.g. after a restart of the server with a cleared cache. The callbacks reading the traject are then stopped
+    by `TrajectNotFound`.
+
+    :param dike_traject_data: content of "stored-data"
+    :param pathname: current page, the traject is checked again on every page change
+    :return: True to open the toast
+    """
+    return dike_traject_data is not None and not is_dike_traject_stored(
+        dike_traject_data
+    )
 
 
 @callback(
@@ -400,7 +424,7 @@ def fill_traject_table_from_database(dike_traject_data: dict) -> list[dict]:
     """
     df = pd.DataFrame(columns=["section_col", "reinforcement_col"])
     if dike_traject_data is not None:
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
+        _dike_traject = get_dike_traject(dike_traject_data)
 
         for section in _dike_traject.dike_sections:
             df_add = pd.DataFrame.from_records(
@@ -451,7 +475,7 @@ def update_slider_years_from_database(dike_traject_data: dict):
         }
         return marks
     else:
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
+        _dike_traject = get_dike_traject(dike_traject_data)
         _assessment_years = _dike_traject.dike_sections[
             0
         ].years  # all sections should have the same assessment years
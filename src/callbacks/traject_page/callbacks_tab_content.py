@@ -1,14 +1,26 @@
 from bisect import bisect_right
 from pathlib import Path
+from typing import Optional
 
 import dash
-from dash import Input, Output, State, callback, dcc
+from dash import (
+    ClientsideFunction,
+    Input,
+    Output,
+    State,
+    callback,
+    clientside_callback,
+    dcc,
+)
+from dash.exceptions import PreventUpdate
 from plotly.graph_objs import Figure
 from vrtool.defaults.vrtool_config import VrtoolConfig
 
 from src.component_ids import (
     CLOSE_MEASURE_MODAL_BUTTON_ID,
     DIKE_TRAJECT_PF_COST_GRAPH_ID,
+    GRAPH_MAP_INITIAL_ASSESSMENT_ID,
+    GRAPH_MAP_MEASURES_ID,
     GRAPH_MEASURE_COMPARISON_ID,
     GRAPH_MEASURE_RELIABILITY_TIME_ID,
     MEASURE_MODAL_ID,
@@ -16,13 +28,19 @@ from src.component_ids import (
     SELECT_LENGTH_COST_SWITCH,
     SLIDER_YEAR_RELIABILITY_RESULTS_ID,
     STORE_CONFIG,
+    STORE_MAP_INITIAL_ASSESSMENT_FRAMES_ID,
+    STORE_MAP_MEASURES_FRAMES_ID,
 )
-from src.constants import REFERENCE_YEAR, Mechanism
-from src.linear_objects.dike_traject import DikeTraject
+from src.constants import REFERENCE_YEAR, ColorBarResultType, Mechanism
 from src.orm.import_database import (
     get_all_measure_results,
     get_measure_reliability_over_time,
 )
+from src.orm.traject_cache import get_cached_step_numbers_per_section
+from src.plotly_graphs.map_figure_cache import (
+    get_cached_map_figure,
+    get_year_indices,
+)
 from src.plotly_graphs.measure_comparison_graph import plot_measure_results_graph
 from src.plotly_graphs.measure_reliability_time import (
     plot_measure_results_over_time_graph,
@@ -35,13 +53,19 @@ from src.plotly_graphs.pf_length_cost import (
 from src.plotly_graphs.plotly_maps import (
     dike_traject_pf_cost_helping_map_detail,
     dike_traject_pf_cost_helping_map_simple,
+    get_initial_assessment_map_frames,
+    get_measures_assessment_map_frames,
     plot_default_overview_map_dummy,
     plot_dike_traject_reliability_initial_assessment_map,
     plot_dike_traject_reliability_measures_assessment_map,
     plot_dike_traject_urgency,
     plot_overview_map,
 )
-from src.utils.utils import export_to_json
+from src.utils.debug_snapshot import (
+    is_debug_snapshot_enabled,
+    request_debug_snapshot,
+)
+from src.utils.traject_store import get_dike_traject, get_dike_traject_data
 
 
 @callback(Output("overview_map_div", "children"), [Input("stored-data", "data")])
@@ -52,13 +76,17 @@ def make_graph_overview_dike(dike_traject_data: dict) -> dcc.Graph:
     :param dike_traject_data: The data of the dike traject to be displayed.
     """
 
-    export_to_json(dike_traject_data)
+    # opt-in, see `enable_debug_snapshots`
+    if is_debug_snapshot_enabled():
+        request_debug_snapshot(
+            "dike_traject_data", get_dike_traject_data(dike_traject_data)
+        )
 
     if dike_traject_data is None or dike_traject_data == {}:
         _fig = plot_default_overview_map_dummy()
     else:
 
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
+        _dike_traject = get_dike_traject(dike_traject_data)
         _fig = plot_overview_map(_dike_traject)
     return dcc.Graph(
         figure=_fig,
@@ -70,7 +98,8 @@ def make_graph_overview_dike(dike_traject_data: dict) -> dcc.Graph:
     Output("dike_traject_reliability_map_initial", "children"),
     [
         Input("stored-data", "data"),
-        Input(SLIDER_YEAR_RELIABILITY_RESULTS_ID, "value"),
+        # the slider only recolors the map clientside, see assets/clientside_maps.js
+        State(SLIDER_YEAR_RELIABILITY_RESULTS_ID, "value"),
         Input("select_result_type", "value"),
         Input("select_mechanism_type", "value"),
     ],
@@ -93,11 +122,22 @@ def make_graph_map_initial_assessment(
     if dike_traject_data is None:
         _fig = plot_default_overview_map_dummy()
     else:
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
-        _fig = plot_dike_traject_reliability_initial_assessment_map(
-            _dike_traject, selected_year, result_type, mechanism_type
+        _dike_traject = get_dike_traject(dike_traject_data)
+        # the map only changes when the slider crosses an assessment year
+        _fig = get_cached_map_figure(
+            dike_traject_data,
+            (
+                "initial_assessment",
+                get_year_indices(_dike_traject, selected_year),
+                result_type,
+                mechanism_type,
+            ),
+            lambda: plot_dike_traject_reliability_initial_assessment_map(
+                _dike_traject, selected_year, result_type, mechanism_type
+            ),
         )
     return dcc.Graph(
+        id=GRAPH_MAP_INITIAL_ASSESSMENT_ID,
         figure=_fig,
         style={"width": "100%", "height": "100%"},
     )
@@ -107,7 +147,8 @@ def make_graph_map_initial_assessment(
     Output("dike_traject_reliability_map_measures", "children"),
     [
         Input("stored-data", "data"),
-        Input(SLIDER_YEAR_RELIABILITY_RESULTS_ID, "value"),
+        # the slider only recolors the map clientside, see assets/clientside_maps.js
+        State(SLIDER_YEAR_RELIABILITY_RESULTS_ID, "value"),
         Input("select_result_type", "value"),
         Input("select_calculation_type", "value"),
         Input("select_measure_map_result_type", "value"),
@@ -143,22 +184,179 @@ def make_graph_map_measures(
     if dike_traject_data is None:
         _fig = plot_default_overview_map_dummy()
     else:
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
-        _fig = plot_dike_traject_reliability_measures_assessment_map(
-            _dike_traject,
-            selected_year,
-            result_type,
-            calc_type,
-            color_bar_result_type,
-            mechanism_type,
-            sub_result_type,
+        _dike_traject = get_dike_traject(dike_traject_data)
+        # the map only changes when the slider crosses an assessment year, except for the map of the measures which
+        # depends on the investment years
+        _year_key = (
+            selected_year
+            if color_bar_result_type == ColorBarResultType.MEASURE.name
+            else get_year_indices(_dike_traject, selected_year)
+        )
+        _fig = get_cached_map_figure(
+            dike_traject_data,
+            (
+                "measures",
+                _year_key,
+                result_type,
+                calc_type,
+                color_bar_result_type,
+                mechanism_type,
+                sub_result_type,
+            ),
+            lambda: plot_dike_traject_reliability_measures_assessment_map(
+                _dike_traject,
+                selected_year,
+                result_type,
+                calc_type,
+                color_bar_result_type,
+                mechanism_type,
+                sub_result_type,
+            ),
         )
     return dcc.Graph(
+        id=GRAPH_MAP_MEASURES_ID,
         figure=_fig,
         style={"width": "100%", "height": "100%"},
     )
 
 
+@callback(
+    Output(STORE_MAP_INITIAL_ASSESSMENT_FRAMES_ID, "data"),
+    [
+        Input("stored-data", "data"),
+        Input("select_result_type", "value"),
+        Input("select_mechanism_type", "value"),
+    ],
+)
+def make_frames_map_initial_assessment(
+    dike_traject_data: dict, result_type: str, mechanism_type: str
+) -> Optional[dict]:
+    """
+    Call to store the colors of the sections of the map of the initial assessment for all the assessment years, used
+    to recolor the map clientside when the year slider moves.
+
+    :param dike_traject_data: The data of the dike traject to be displayed.
+    :param result_type: Selected result type by the user from the OptionField, one of "RELIABILITY" or "PROBABILITY"
+    :param mechanism_type: Selected mechanism type by the user from the OptionField, one of "PIPING", "STABILITY",
+    "OVERFLOW", "REVETMENT" or "SECTION"
+
+    :return: frames of the map, see `get_section_map_frames`
+    """
+    if dike_traject_data is None:
+        return None
+    _dike_traject = get_dike_traject(dike_traject_data)
+    return get_initial_assessment_map_frames(_dike_traject, result_type, mechanism_type)
+
+
+@callback(
+    Output(STORE_MAP_MEASURES_FRAMES_ID, "data"),
+    [
+        Input("stored-data", "data"),
+        Input("select_result_type", "value"),
+        Input("select_calculation_type", "value"),
+        Input("select_measure_map_result_type", "value"),
+        Input("select_mechanism_type", "value"),
+        Input("select_sub_result_type_measure_map", "value"),
+    ],
+)
+def make_frames_map_measures(
+    dike_traject_data: dict,
+    result_type: str,
+    calc_type: str,
+    color_bar_result_type: str,
+    mechanism_type: str,
+    sub_result_type: str,
+) -> Optional[dict]:
+    """
+    Call to store the colors of the sections of the map after measures for all the assessment years, used to recolor
+    the map clientside when the year slider moves. Nothing is stored for the map of the measures, which depends on the
+    investment years and is updated server-side (see `update_graph_map_measures_investment_year`).
+
+    :param dike_traject_data: The data of the dike traject to be displayed.
+    :param result_type: Selected result type by the user from the OptionField, one of "RELIABILITY" or "PROBABILITY"
+    :param calc_type: Selected calculation type by the user from the OptionField, one of "VEILIGHEIDSRENDEMENT" or "DOORSNEDE"
+    :param color_bar_result_type: one of "RELIABILITY" or "COST" or "MEASURE"
+    :param mechanism_type: Selected mechanism type by the user from the OptionField, one of "PIPING", "STABILITY",
+    "OVERFLOW", "REVETMENT or "SECTION"
+    :param sub_result_type: Selected sub result type by the user from the OptionField, one of "ABSOLUTE" or "DIFFERENCE"
+    or "RATIO"
+
+    :return: frames of the map, see `get_section_map_frames`
+    """
+    if dike_traject_data is None:
+        return None
+    _dike_traject = get_dike_traject(dike_traject_data)
+    return get_measures_assessment_map_frames(
+        _dike_traject,
+        result_type,
+        calc_type,
+        color_bar_result_type,
+        mechanism_type,
+        sub_result_type,
+    )
+
+
+# Recolor the maps in the browser when the year slider moves, without a round-trip to the server.
+clientside_callback(
+    ClientsideFunction(namespace="maps", function_name="recolor_section_map"),
+    Output(GRAPH_MAP_INITIAL_ASSESSMENT_ID, "figure"),
+    Input(SLIDER_YEAR_RELIABILITY_RESULTS_ID, "value"),
+    State(STORE_MAP_INITIAL_ASSESSMENT_FRAMES_ID, "data"),
+    State(GRAPH_MAP_INITIAL_ASSESSMENT_ID, "figure"),
+    prevent_initial_call=True,
+)
+
+clientside_callback(
+    ClientsideFunction(namespace="maps", function_name="recolor_section_map"),
+    Output(GRAPH_MAP_MEASURES_ID, "figure"),
+    Input(SLIDER_YEAR_RELIABILITY_RESULTS_ID, "value"),
+    State(STORE_MAP_MEASURES_FRAMES_ID, "data"),
+    State(GRAPH_MAP_MEASURES_ID, "figure"),
+    prevent_initial_call=True,
+)
+
+
+@callback(
+    Output("dike_traject_reliability_map_measures", "children", allow_duplicate=True),
+    [
+        Input(SLIDER_YEAR_RELIABILITY_RESULTS_ID, "value"),
+        State("stored-data", "data"),
+        State("select_result_type", "value"),
+        State("select_calculation_type", "value"),
+        State("select_measure_map_result_type", "value"),
+        State("select_mechanism_type", "value"),
+        State("select_sub_result_type_measure_map", "value"),
+    ],
+    prevent_initial_call=True,
+)
+def update_graph_map_measures_investment_year(
+    selected_year: float,
+    dike_traject_data: dict,
+    result_type: str,
+    calc_type: str,
+    color_bar_result_type: str,
+    mechanism_type: str,
+    sub_result_type: str,
+) -> dcc.Graph:
+    """
+    Call to update the map of the measures when the year slider moves. The measures are displayed according to their
+    investment year, which is not covered by the clientside recoloring of the map.
+
+    :return: dcc.Graph with the plotly figure
+    """
+    if color_bar_result_type != ColorBarResultType.MEASURE.name:
+        raise PreventUpdate
+    return make_graph_map_measures(
+        dike_traject_data,
+        selected_year,
+        result_type,
+        calc_type,
+        color_bar_result_type,
+        mechanism_type,
+        sub_result_type,
+    )
+
+
 @callback(
     Output(DIKE_TRAJECT_PF_COST_GRAPH_ID, "figure"),
     [
@@ -186,7 +384,7 @@ def make_graph_pf_vs_cost(
     if dike_traject_data is None:
         return plot_default_scatter_dummy()
     else:
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
+        _dike_traject = get_dike_traject(dike_traject_data)
         _fig = plot_pf_length_cost(
             _dike_traject, selected_year, result_type, cost_length_switch
         )
@@ -220,7 +418,7 @@ def make_graph_map_urgency(
     if dike_traject_data is None:
         _fig = plot_default_overview_map_dummy()
     else:
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
+        _dike_traject = get_dike_traject(dike_traject_data)
         _fig = plot_dike_traject_urgency(
             _dike_traject, selected_year, length_urgency, calc_type
         )
@@ -256,7 +454,7 @@ def update_click(
     elif dike_traject_data is None:
         return plot_default_overview_map_dummy()
     else:
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
+        _dike_traject = get_dike_traject(dike_traject_data)
 
         _order = (
             _dike_traject.reinforcement_order_dsn
@@ -294,7 +492,7 @@ def fill_dike_section_selection(dike_traject_data: dict) -> list[dict]:
 
     _option_list = []
     if dike_traject_data is not None:
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
+        _dike_traject = get_dike_traject(dike_traject_data)
 
         for section in _dike_traject.dike_sections:
             if section.in_analyse:
@@ -338,7 +536,7 @@ def make_graph_measure_results_comparison(
         return plot_default_scatter_dummy()
 
     else:
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
+        _dike_traject = get_dike_traject(dike_traject_data)
 
         _section = _dike_traject.get_section(selected_dike_section)
         _year_index = bisect_right(_section.years, selected_year - REFERENCE_YEAR) - 1
@@ -349,16 +547,23 @@ def make_graph_measure_results_comparison(
         _vr_config.input_database_name = vr_config["input_database_name"]
         _vr_config.T = vr_config["T"]
 
-        _final_step_number = dike_traject_data["final_step_number"]
+        _final_step_number = _dike_traject.final_step_number
+        _section_step_numbers = {
+            _run_id: get_cached_step_numbers_per_section(_vr_config, _run_id).get(
+                _section.name, []
+            )
+            for _run_id in [_dike_traject._run_id_vr, _dike_traject._run_id_dsn]
+        }
         _meas_results, _vr_steps, _dsn_steps = get_all_measure_results(
             _vr_config,
             _section.name,
             get_mechanism_name_ORM(selected_mechanism),
             _time,
-            run_id_vr=dike_traject_data["_run_id_vr"],
-            run_id_dsn=dike_traject_data["_run_id_dsn"],
+            run_id_vr=_dike_traject._run_id_vr,
+            run_id_dsn=_dike_traject._run_id_dsn,
             active_mechanisms=_section.active_mechanisms,
             final_step_number=_final_step_number,
+            section_step_numbers=_section_step_numbers,
         )
 
         _fig = plot_measure_results_graph(
@@ -458,7 +663,7 @@ def open_modal_measure_reliability_time(
             _vr_config, _clicked_measure_result_id, _mechanism_name
         )
 
-        _dike_traject = DikeTraject.deserialize(dike_traject_data)
+        _dike_traject = get_dike_traject(dike_traject_data)
         _years = _dike_traject.get_section(section_name).years
 
         _betas_ini = _dike_traject.get_section(section_name).initial_assessment[
@@ -47,6 +47,10 @@ SELECT_DIKE_SECTION_FOR_MEASURES_ID = "select_dike_section_id"
 GRAPH_MEASURE_COMPARISON_ID = "graph_measure_comparison_id"
 DIKE_TRAJECT_PF_COST_GRAPH_ID = "dike_traject_pf_cost_graph"
 SELECT_LENGTH_COST_SWITCH = "select_length_cost_switch"
+GRAPH_MAP_INITIAL_ASSESSMENT_ID = "graph_map_initial_assessment_id"
+STORE_MAP_INITIAL_ASSESSMENT_FRAMES_ID = "store_map_initial_assessment_frames_id"
+GRAPH_MAP_MEASURES_ID = "graph_map_measures_id"
+STORE_MAP_MEASURES_FRAMES_ID = "store_map_measures_frames_id"
 
 MEASURE_MODAL_ID = "measure_modal_id"
 CLOSE_MEASURE_MODAL_BUTTON_ID = "close-modal-measure"
@@ -110,3 +114,9 @@ RADIO_COMPARISON_PAGE_RESULT_TYPE = "radio_comparison_page_result_type"
 MEASURE_COMPARISON_MAP_ID = "measure_comparison_map_id"
 TABLE_COMPARISON_MEASURES = "table_comparison_measures"
 TABLE_ORDER_COMPARISON_MEASURES = "table_order_comparison_measures"
+UPLOAD_COMPARISON_CONFIGS_ID = "upload_comparison_configs_id"
+STORE_COMPARISON_CONFIGS_ID = "store_comparison_configs_id"
+DROPDOWN_COMPARISON_RUNS_ID = "dropdown_comparison_runs_id"
+IMPORT_COMPARISON_RUNS_BUTTON_ID = "import_comparison_runs_button_id"
+IMPORT_COMPARISON_RUNS_PROGRESS_ID = "import_comparison_runs_progress_id"
+TRAJECT_NOT_FOUND_TOAST_ID = "traject_not_found_toast_id"
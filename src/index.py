@@ -3,7 +3,7 @@ import logging
 import dash
 import dash_bootstrap_components as dbc
 import dash_mantine_components as dmc
-from dash import _dash_renderer, dcc
+from dash import _dash_renderer, dcc, html
 
 import src.callbacks.comparison_page.callback_import_run
 import src.callbacks.comparison_page.callback_tabs_output_switch
@@ -27,6 +27,7 @@ from src.component_ids import (
     STORED_IMPORTED_RUNS_DATA,
     STORED_PROJECT_OVERVIEW_DATA,
     STORED_RUNS_COMPARISONS_DATA,
+    TRAJECT_NOT_FOUND_TOAST_ID,
 )
 from src.layouts.layout_database_interaction.layout_modal_add_custom_measure import (
     modal_custom_measure,
@@ -53,6 +54,20 @@ app.layout = dmc.MantineProvider(
                 id=STORED_PROJECT_OVERVIEW_DATA, data=None, storage_type="session"
             ),
             nav_bar_layout_1,
+            dbc.Toast(
+                [
+                    html.P(
+                        "De gegevens van de geselecteerde run zijn niet meer beschikbaar, importeer de run opnieuw.",
+                        className="mb-0",
+                    )
+                ],
+                id=TRAJECT_NOT_FOUND_TOAST_ID,
+                header="Run niet gevonden",
+                icon="warning",
+                dismissable=True,
+                is_open=False,
+                style={"position": "fixed", "top": 70, "right": 10, "zIndex": 1050},
+            ),
             modal_optimize,  # keep this line to import the modal as closed to the app by default
             modal_custom_measure,
             modal_measure_reliability,
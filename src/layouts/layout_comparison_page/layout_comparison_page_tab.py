@@ -8,8 +8,13 @@ from dash.html import Br
 
 from src.component_ids import (
     CONTENT_TABS_COMPARISON_PAGE_ID,
+    DROPDOWN_COMPARISON_RUNS_ID,
     EDITABLE_COMPARISON_TABLE_ID,
+    IMPORT_COMPARISON_RUNS_BUTTON_ID,
+    IMPORT_COMPARISON_RUNS_PROGRESS_ID,
+    STORE_COMPARISON_CONFIGS_ID,
     TABS_SWITCH_VISUALIZATION_COMPARISON_PAGE,
+    UPLOAD_COMPARISON_CONFIGS_ID,
 )
 
 df_imported_run_table = pd.DataFrame(columns=["traject", "run_name", "active"], data=[])
@@ -73,11 +78,49 @@ left_side = [
         },
         # Allow multiple files to be uploaded
         multiple=False,
-        accept=".json",
+        accept=".json,.vrdt",
     ),
     Br(),
     dbc.Accordion(
         [
+            dbc.AccordionItem(
+                [
+                    dcc.Upload(
+                        id=UPLOAD_COMPARISON_CONFIGS_ID,
+                        children=html.Div(
+                            ["", html.A("Selecteer de config.json-bestanden")]
+                        ),
+                        style={
+                            "width": "100%",
+                            "height": "60px",
+                            "lineHeight": "60px",
+                            "borderWidth": "1px",
+                            "borderStyle": "dashed",
+                            "borderRadius": "5px",
+                            "textAlign": "center",
+                        },
+                        # one config.json per database
+                        multiple=True,
+                        accept=".json",
+                    ),
+                    dcc.Store(id=STORE_COMPARISON_CONFIGS_ID, data=None),
+                    Br(),
+                    dcc.Dropdown(
+                        id=DROPDOWN_COMPARISON_RUNS_ID,
+                        options=[],
+                        multi=True,
+                        placeholder="Selecteer berekeningen",
+                    ),
+                    Br(),
+                    dbc.Button(
+                        "Importeer berekeningen",
+                        id=IMPORT_COMPARISON_RUNS_BUTTON_ID,
+                        color="primary",
+                    ),
+                    html.Div(id=IMPORT_COMPARISON_RUNS_PROGRESS_ID),
+                ],
+                title="Importeer berekeningen uit databases",
+            ),
             dbc.AccordionItem(
                 [table_imported_dike_data],
                 title="Geimporteerde berekeningen",
@@ -170,7 +170,7 @@ left_side = [
         },
         # Allow multiple files to be uploaded
         multiple=False,
-        accept=".json",
+        accept=".json,.vrdt",
     ),
     # Add text in Dutch: "or" centered in the middle of the page
     html.P("of", style={"text-align": "center"}),
@@ -191,7 +191,7 @@ left_side = [
         },
         # Allow multiple files to be uploaded
         multiple=False,
-        accept=".json",
+        accept=".json,.vrdt",
     ),
     Br(),
     dbc.Accordion(
@@ -2,7 +2,11 @@ import dash_bootstrap_components as dbc
 from dash import dcc, html
 from dash.dash_table import DataTable
 
-from src.component_ids import GRAPH_MEASURE_COMPARISON_ID
+from src.component_ids import (
+    GRAPH_MEASURE_COMPARISON_ID,
+    STORE_MAP_INITIAL_ASSESSMENT_FRAMES_ID,
+    STORE_MAP_MEASURES_FRAMES_ID,
+)
 from src.layouts.layout_traject_page.layout_tabs.layout_tab_measures import (
     layout_radio_dike_section_selection,
 )
@@ -123,6 +127,7 @@ def layout_tab_two() -> html.Div:
                 id="dike_traject_reliability_map_initial",
                 style={"width": "130vh", "height": "90vh", "border": "2px solid black"},
             ),
+            dcc.Store(id=STORE_MAP_INITIAL_ASSESSMENT_FRAMES_ID),
         ]
     )
 
@@ -152,6 +157,7 @@ def layout_tab_three() -> html.Div:
                 id="dike_traject_reliability_map_measures",
                 style={"width": "130vh", "height": "90vh", "border": "2px solid black"},
             ),
+            dcc.Store(id=STORE_MAP_MEASURES_FRAMES_ID),
         ]
     )
 
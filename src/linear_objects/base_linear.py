@@ -1,5 +1,10 @@
+from typing import Optional
+
+import numpy as np
 from shapely import LineString
 
+from src.utils.gws_convertor import GWSRDConvertor
+
 
 class BaseLinearObject:
     coordinates_rd: list[tuple[float, float]]
@@ -9,8 +14,30 @@ class BaseLinearObject:
         self.coordinates_rd = coordinates_rd
         self.trajectory_rd = LineString(coordinates_rd)
 
-    def coordinates_wgs84(self):
-        pass
+    @property
+    def coordinates_rd(self) -> list[tuple[float, float]]:
+        return self._coordinates_rd
+
+    @coordinates_rd.setter
+    def coordinates_rd(self, coordinates_rd: list[tuple[float, float]]):
+        self._coordinates_rd = coordinates_rd
+        self._coordinates_wgs84: Optional[np.ndarray] = None
+
+    @property
+    def coordinates_wgs84(self) -> np.ndarray:
+        """
+        WGS84 coordinates of the object, computed once from the RD coordinates and cached until the RD coordinates
+        are replaced. The returned array is read-only.
+
+        :return: array of shape (number of points, 2) with the latitudes and longitudes
+        """
+        if self._coordinates_wgs84 is None:
+            _coordinates_wgs84 = GWSRDConvertor().coordinates_to_wgs(
+                self._coordinates_rd
+            )
+            _coordinates_wgs84.setflags(write=False)
+            self._coordinates_wgs84 = _coordinates_wgs84
+        return self._coordinates_wgs84
 
     def serialize(self):
         pass
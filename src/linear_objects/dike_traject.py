@@ -6,12 +6,17 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 from pandas import DataFrame
-from vrtool.common.enums import MechanismEnum
 
 from src.constants import REFERENCE_YEAR, Mechanism
 from src.linear_objects.base_linear import BaseLinearObject
 from src.linear_objects.dike_section import DikeSection
-from src.utils.utils import beta_to_pf, calculate_traject_probability, pf_to_beta
+from src.utils.traject_probability import (
+    TrajectProbabilityEngine,
+    calc_system_failure_probability,
+    get_traject_reliability_arrays,
+    is_min_beta_mechanism,
+)
+from src.utils.utils import beta_to_pf, pf_to_beta
 
 
 @dataclass
@@ -115,8 +120,7 @@ class DikeTraject(BaseLinearObject):
         :return:
         """
 
-        _beta_df = get_initial_assessment_df(self.dike_sections)
-        _traject_pf, _ = get_traject_prob(_beta_df)
+        _traject_engine = TrajectProbabilityEngine.from_sections(self.dike_sections)
         years = self.dike_sections[0].years
 
         if calc_type == "vr":
@@ -130,40 +134,13 @@ class DikeTraject(BaseLinearObject):
         else:
             raise ValueError("calc_type should be either 'vr' or 'dsn' ")
 
-        for section_name in _section_order:
-            section = self.get_section(section_name)
-
-            if not section.in_analyse:  # skip if the section is not reinforced
-                continue
-
-            if (calc_type == "doorsnede") and (
-                not section.is_reinforced_doorsnede
-            ):  # skip if the section is not reinforced
-                continue
-
-            if (calc_type == "veiligheidsrendement") and (
-                not section.is_reinforced_veiligheidsrendement
-            ):  # skip if the section is not reinforced
-                continue
-            _active_mechanisms = ["Overflow", "Piping", "StabilityInner"]
-            if section.revetment and "Revetment" in _beta_df and _beta_df["Revetment"]:
-                _active_mechanisms.append("Revetment")
-            # add a row to the dataframe with the initial assessment of the section
-            for mechanism in _active_mechanisms:
-                mask = (_beta_df["name"] == section.name) & (
-                    _beta_df["mechanism"] == mechanism
-                )
-                # replace the row in the dataframe with the betas of the section if both the name and mechanism match
-
-                for year, beta in zip(
-                    years, getattr(section, _section_measure)[mechanism]
-                ):
-                    _beta_df.loc[mask, year] = beta
-
-            _reinforced_traject_pf, _ = get_traject_prob(_beta_df)
-
-            _traject_pf = np.concatenate((_traject_pf, _reinforced_traject_pf), axis=0)
-        return np.array(_traject_pf)
+        _section_updates = get_reinforced_section_updates(
+            [self.get_section(section_name) for section_name in _section_order],
+            calc_type,
+            years,
+            section_measure=_section_measure,
+        )
+        return _traject_engine.replay(_section_updates)
 
     def get_section(self, name: str) -> DikeSection:
         """Get the section object by name"""
@@ -314,85 +291,22 @@ def get_traject_prob_fast(traject_reliability: dict):
         traject_reliability: dictionary with the reliability data for each mechanism
         Example: "Overflow": {"time": [2025, 2030, 2035], "beta": [0.1, 0.2, 0.3]}
 
-
+    Returns:
+        tuple with the sorted times and the list of the traject probability of failure for each time, all the
+        mechanisms combined (see `calc_system_failure_probability`)
     """
-
-    def convert_beta_to_pf_per_section(traject_reliability):
-        time = [t for section in traject_reliability.values() for t in section["time"]]
-        beta = [b for section in traject_reliability.values() for b in section["beta"]]
-        beta_per_time = {
-            t: [b for b, t_ in zip(beta, time) if t_ == t] for t in set(time)
-        }
-        pf_per_time = {
-            t: list(beta_to_pf(np.array(beta))) for t, beta in beta_per_time.items()
-        }
-        return pf_per_time
-
-    def compute_overflow(traject_reliability):
-        pf_per_time = convert_beta_to_pf_per_section(traject_reliability)
-        traject_pf_per_time = {t: max(pf) for t, pf in pf_per_time.items()}
-        return traject_pf_per_time
-
-    def compute_piping_stability(traject_reliability):
-        pf_per_time = convert_beta_to_pf_per_section(traject_reliability)
-        traject_pf_per_time = {
-            t: 1 - np.prod(np.subtract(1, pf)) for t, pf in pf_per_time.items()
-        }
-        return traject_pf_per_time
-
-    def compute_revetment(traject_reliability):
-        pf_per_time = convert_beta_to_pf_per_section(traject_reliability)
-        traject_pf_per_time = {t: max(pf) for t, pf in pf_per_time.items()}
-        return traject_pf_per_time
-
-    def compute_system_failure_probability(traject_reliability):
-        result = {}
-        for mechanism, data in traject_reliability.items():
-            if mechanism is MechanismEnum.OVERFLOW:
-                result[mechanism] = compute_overflow(data)
-            elif (
-                mechanism is MechanismEnum.PIPING
-                or mechanism is MechanismEnum.STABILITY_INNER
-            ):
-                result[mechanism] = compute_piping_stability(data)
-            elif mechanism is MechanismEnum.REVETMENT:
-                result[mechanism] = compute_revetment(data)
-            else:
-                raise ValueError(f"Mechanism {mechanism} not recognized.")
-        return result
-
-    _traject_probability = compute_system_failure_probability(traject_reliability)
-    _traject_probs = calculate_traject_probability(_traject_probability)
-    return _traject_probs
+    _betas, _is_present, _mechanisms, _times = get_traject_reliability_arrays(
+        [traject_reliability]
+    )
+    _, _, _traject_pf = calc_system_failure_probability(
+        _betas, _is_present, [is_min_beta_mechanism(m) for m in _mechanisms]
+    )
+    return tuple(_times), list(_traject_pf[0])
 
 
 def get_traject_prob(beta_df: DataFrame) -> tuple[np.array, dict]:
     """Determines the probability of failure for a traject based on the standardized beta input"""
-
-    beta_df = beta_df.reset_index().set_index("mechanism").drop(columns=["name"])
-    beta_df = beta_df.drop(columns=["Length", "index"])
-    beta_df = beta_df.astype(float)
-    mechanisms = ["Overflow", "Piping", "StabilityInner", "Revetment"]
-    traject_probs = dict((el, []) for el in mechanisms)
-    total_traject_prob = np.empty((1, beta_df.shape[1]))
-    # You need to loop over Revetment here even if it is not an active mechanism of the current section
-    for mechanism in mechanisms:
-
-        if mechanism in ["Overflow", "Revetment"]:
-            # check is mechanism is in the index
-            if not mechanism in beta_df.index:
-                continue
-            # take min beta in each column
-            traject_probs[mechanism] = beta_to_pf(beta_df.loc[mechanism].min().values)
-        else:
-            pf_df = beta_to_pf(beta_df.loc[mechanism].values)
-            pnonf_df = np.subtract(1, pf_df)
-            pnonf_traject = np.prod(pnonf_df, axis=0)
-            traject_probs[mechanism] = 1 - pnonf_traject
-            # convert to probability
-            # 1-prod(1-p)
-        total_traject_prob += traject_probs[mechanism]
-    return total_traject_prob, traject_probs
+    return TrajectProbabilityEngine.from_beta_df(beta_df).traject_probability()
 
 
 def get_initial_assessment_df(sections: list[DikeSection]) -> DataFrame:
@@ -454,24 +368,31 @@ def calc_traject_probability_array(
     :return:
     """
 
-    _beta_df = get_initial_assessment_df(all_dike_sections)
-    _traject_pf, _ = get_traject_prob(_beta_df)
-    years = all_dike_sections[0].years
-
-    # if calc_type == "vr":
-    #     _section_order = self.reinforcement_order_vr
-    #     _section_measure = "final_measure_veiligheidsrendement"
-    #
-    # elif calc_type == "dsn":
-    #     _section_order = self.reinforcement_order_dsn
-    #     _section_measure = "final_measure_doorsnede"
-    #
-    # else:
-    #     raise ValueError("calc_type should be either 'vr' or 'dsn' ")
+    _traject_engine = TrajectProbabilityEngine.from_sections(all_dike_sections)
+    _section_updates = get_reinforced_section_updates(
+        sections_to_reinforce, calc_type, all_dike_sections[0].years
+    )
+    return _traject_engine.replay(_section_updates)
 
-    for section in sections_to_reinforce:
-        # section = self.get_section(section_name)
 
+def get_reinforced_section_updates(
+    sections_to_reinforce: list[DikeSection],
+    calc_type: str,
+    years: list[int],
+    section_measure: str = "final_measure_veiligheidsrendement",
+) -> list[tuple[str, dict[str, list[float]]]]:
+    """
+    Return the updates of the betas of the reinforced sections, in the format of `TrajectProbabilityEngine.replay`.
+    The sections that are not in the analysis or not reinforced for the calculation type are skipped.
+
+    :param sections_to_reinforce: sections in the order they are reinforced
+    :param calc_type: one of "veiligheidsrendement" or "doorsnede"
+    :param years: years of the traject betas
+    :param section_measure: attribute of the sections with the betas after reinforcement
+    :return: list of tuples (section name, {mechanism: betas after reinforcement})
+    """
+    _section_updates = []
+    for section in sections_to_reinforce:
         if not section.in_analyse:  # skip if the section is not reinforced
             continue
 
@@ -484,22 +405,17 @@ def calc_traject_probability_array(
             not section.is_reinforced_veiligheidsrendement
         ):  # skip if the section is not reinforced
             continue
+        # Revetment is not updated, the section keeps its initial revetment assessment
         _active_mechanisms = ["Overflow", "Piping", "StabilityInner"]
-        if section.revetment and "Revetment" in _beta_df and _beta_df["Revetment"]:
-            _active_mechanisms.append("Revetment")
-        # add a row to the dataframe with the initial assessment of the section
-        for mechanism in _active_mechanisms:
-            mask = (_beta_df["name"] == section.name) & (
-                _beta_df["mechanism"] == mechanism
+        _section_updates.append(
+            (
+                section.name,
+                {
+                    mechanism: getattr(section, section_measure)[mechanism][
+                        : len(years)
+                    ]
+                    for mechanism in _active_mechanisms
+                },
             )
-            # replace the row in the dataframe with the betas of the section if both the name and mechanism match
-
-            for year, beta in zip(
-                years, getattr(section, "final_measure_veiligheidsrendement")[mechanism]
-            ):
-                _beta_df.loc[mask, year] = beta
-
-        _reinforced_traject_pf, _ = get_traject_prob(_beta_df)
-
-        _traject_pf = np.concatenate((_traject_pf, _reinforced_traject_pf), axis=0)
-    return np.array(_traject_pf)
+        )
+    return _section_updates
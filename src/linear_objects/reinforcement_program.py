@@ -1,3 +1,5 @@
+from typing import Optional
+
 import numpy as np
 
 from src.constants import REFERENCE_YEAR
@@ -6,14 +8,17 @@ from src.linear_objects.dike_traject import (
     DikeTraject,
     calc_traject_probability_array,
     get_initial_assessment_df,
+    get_reinforced_section_updates,
     get_traject_prob,
     get_traject_prob_fast,
 )
 from src.linear_objects.project import DikeProject
+from src.utils.traject_probability import TrajectProbabilityEngine
 from src.utils.utils import (
     beta_to_pf,
     get_traject_reliability,
     interpolate_beta_values,
+    interpolate_beta_values_per_segment,
     pf_to_beta,
 )
 
@@ -42,7 +47,37 @@ class DikeProgram:
         )
         self.trajects_pf_over_time = self.calc_trajects_failure_proba()
 
-    def calc_trajects_failure_proba(self):
+    @classmethod
+    def from_dike_trajects(
+        cls,
+        dike_trajects: dict[str, DikeTraject],
+        project_overview_data: list,
+        calc_failure_pro: bool = True,
+        traject_engines: Optional[dict[str, TrajectProbabilityEngine]] = None,
+    ) -> "DikeProgram":
+        """
+        Build the program from trajects that are already deserialized, e.g. to evaluate several programs on the same
+        imported runs. The trajects are shared and not modified by the program.
+
+        :param dike_trajects: deserialized trajects, see `deserialize_imported_runs`
+        :param project_overview_data: Overview of the projects with the selected sections
+        :param calc_failure_pro: True if the probability of failure of the projects should be calculated.
+        :param traject_engines: optional initial TrajectProbabilityEngine of the trajects (same keys as
+        dike_trajects), copied for the simulation of the program instead of being built from the sections.
+        """
+        _program = cls.__new__(cls)
+        _program.dike_trajects = dike_trajects
+        _program.projects = get_projects_from_dike_trajects(
+            dike_trajects, project_overview_data, calc_failure_pro
+        )
+        _program.trajects_pf_over_time = _program.calc_trajects_failure_proba(
+            traject_engines
+        )
+        return _program
+
+    def calc_trajects_failure_proba(
+        self, traject_engines: Optional[dict[str, TrajectProbabilityEngine]] = None
+    ):
         """
         Calculate the trajec probabilibty of failure for all the trajects in the program, reinforcing sections according
         to the projects in the program.
@@ -54,13 +89,20 @@ class DikeProgram:
         For a year is the end_year of a project, the year si duplicated in the years list and two betas are given for
         the same year: the beta before and after the reinforcement of the project.
 
+        :param traject_engines: optional initial TrajectProbabilityEngine of the trajects, with the same keys as
+        dike_trajects. The engines are copied and not modified.
         """
         # sort projects by ending year
         projects = sorted(self.projects, key=lambda x: x.end_year)
         traject_res = {}
-        for dike_traject in self.dike_trajects.values():
-            years_ini, betas_ini = self.calc_traject_failure_proba_from_program_old_df(
-                dike_traject, projects
+        for run_name, dike_traject in self.dike_trajects.items():
+            _traject_engine = (
+                traject_engines[run_name].copy()
+                if traject_engines is not None
+                else None
+            )
+            years_ini, betas_ini = self.calc_traject_failure_proba_incremental(
+                dike_traject, projects, _traject_engine
             )
             traject_res[dike_traject.name] = {"years": years_ini, "betas": betas_ini}
         return traject_res
@@ -122,6 +164,67 @@ class DikeProgram:
 
         return years_ini, betas_ini
 
+    @staticmethod
+    def calc_traject_failure_proba_incremental(
+        dike_traject: DikeTraject,
+        projects: list[DikeProject],
+        traject_engine: Optional[TrajectProbabilityEngine] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Simulate the program on the traject: the projects (sorted by end year) are applied one after the other on the
+        beta tensor of the traject, each reinforced section being applied once and the traject probability updated
+        incrementally (see `TrajectProbabilityEngine`). Same results as
+        `calc_traject_failure_proba_from_program_old_df`, which replays all the reinforced sections for every project.
+
+        :param dike_traject: DikeTraject to simulate
+        :param projects: projects of the program sorted by end year
+        :param traject_engine: optional engine with the initial assessment of the traject, modified by the simulation
+        :return: tuple of arrays with the years and the betas of the traject
+        """
+        _years = dike_traject.dike_sections[0].years
+        years_beta = np.array(_years) + REFERENCE_YEAR
+        _traject_engine = (
+            traject_engine
+            if traject_engine is not None
+            else TrajectProbabilityEngine.from_sections(dike_traject.dike_sections)
+        )
+
+        # Initialize years and betas
+        _years_output = [
+            np.linspace(2025, projects[0].end_year, projects[0].end_year - 2025 + 1)
+        ]
+        _traject_betas = [pf_to_beta(_traject_engine.traject_probability()[0][0])]
+
+        # loop over projects of the traject
+        for index, project in enumerate(projects):
+            year_start = projects[index].end_year
+            year_end = (
+                projects[index + 1].end_year if index < len(projects) - 1 else 2100
+            )
+            # get all the section of the project that are part of the traject
+            dike_section_project_list = [
+                section
+                for section in project.dike_sections
+                if section.parent_traject_name == dike_traject.name
+            ]
+            for section_name, betas in get_reinforced_section_updates(
+                dike_section_project_list, "veiligheidsrendement", _years
+            ):
+                _traject_engine.update_section(section_name, betas)
+
+            _years_output.append(
+                np.linspace(year_start, year_end, year_end - year_start + 1)
+            )
+            _traject_betas.append(
+                pf_to_beta(_traject_engine.traject_probability()[0][0])
+            )
+
+        years_ini = np.concatenate(_years_output)
+        betas_ini = interpolate_beta_values_per_segment(
+            _years_output, np.array(_traject_betas), years_beta
+        )
+        return years_ini, betas_ini
+
     @staticmethod
     def calc_traject_failure_proba_from_program_old_df(
         dike_traject: DikeTraject, projects: list[DikeProject]
@@ -182,16 +285,44 @@ def get_projects_from_saved_data(
     :param calc_failure_pro: bool: if True, calculate the probability of failure for the projects
     :return:
     """
-    projects = []
-
     # First populate the dike_trajects dict to avoid dezerializing the same data multiple times
-    dict_runs = {}
-    for run_name in imported_runs_data.keys():
-        dike_traject = DikeTraject.deserialize(imported_runs_data[run_name])
-        dict_runs[run_name] = dike_traject
+    dict_runs = deserialize_imported_runs(imported_runs_data)
+    projects = get_projects_from_dike_trajects(
+        dict_runs, project_overview_data, calc_failure_pro
+    )
+    return projects, dict_runs
+
+
+def deserialize_imported_runs(imported_runs_data: dict) -> dict[str, DikeTraject]:
+    """
+    Deserialize the trajects of all the imported runs.
 
+    :param imported_runs_data: stored data of all the imported runs as a dict with key format: "traject|run", for ex:
+    "7-2|Basisberekening"
+    :return: dict {run name: DikeTraject}
+    """
+    return {
+        run_name: DikeTraject.deserialize(run_data)
+        for run_name, run_data in imported_runs_data.items()
+    }
+
+
+def get_projects_from_dike_trajects(
+    dike_trajects: dict[str, DikeTraject],
+    project_overview_data: Optional[list[dict]],
+    calc_failure_pro: bool = True,
+) -> list[DikeProject]:
+    """
+    Assemble the projects of the project overview from the sections of the deserialized trajects.
+
+    :param dike_trajects: deserialized trajects as a dict {run name: DikeTraject}, see `deserialize_imported_runs`
+    :param project_overview_data: Overview of the projects with the selected sections
+    :param calc_failure_pro: bool: if True, calculate the probability of failure for the projects
+    :return: list of DikeProject
+    """
+    projects = []
     if project_overview_data is None:
-        return projects, dict_runs
+        return projects
 
     # assemble project data:
     for project_data in project_overview_data:
@@ -202,9 +333,9 @@ def get_projects_from_saved_data(
         )  # a project can be theoretically composed of sections from multiple trajects which all have their own flood damage
         for section_traject in project_data["sections"]:  # multi_select_value
             section_name, traject_name = section_traject.split("|")
-            for run_name in imported_runs_data.keys():
+            for run_name in dike_trajects.keys():
                 if traject_name in run_name:
-                    dike_traject = dict_runs[run_name]
+                    dike_traject = dike_trajects[run_name]
                     traject_damages.append(dike_traject.flood_damage)
                     break
 
@@ -232,7 +363,7 @@ def get_projects_from_saved_data(
             ),  # take the maximum flood damage of the trajects considered
         )
         projects.append(project)
-    return projects, dict_runs
+    return projects
 
 
 def calc_prob_failure_before_reinforcement(dike_sections: list[DikeSection]) -> float:
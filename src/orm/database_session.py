@@ -0,0 +1,122 @@
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from peewee import Model, SqliteDatabase
+from vrtool.orm.models.orm_base_model import OrmBaseModel
+from vrtool.orm.orm_controllers import open_database
+
+# Pragmas of the read connection, local to the connection (nothing is written to the database file): memory mapped
+# reads, 64 MB page cache, and no accidental writes.
+READ_PRAGMAS = {
+    "mmap_size": 256 * 2**20,
+    "cache_size": -64 * 2**10,  # negative values are in KiB
+    "query_only": 1,
+}
+
+# read-only database per resolved database path, each with its own connection per thread
+_read_databases: dict[Path, SqliteDatabase] = {}
+_read_databases_lock = threading.Lock()
+
+# peewee binds the ORM model classes to a database for all the threads, a session holds this lock as long as the
+# models are bound to its database
+_orm_models_lock = threading.RLock()
+
+
+def _get_orm_models() -> list[type[Model]]:
+    """Returns the ORM models of vrtool and of the dashboard, all the subclasses of `OrmBaseModel`."""
+    _models = []
+    _bases = [OrmBaseModel]
+    while _bases:
+        _subclasses = _bases.pop().__subclasses__()
+        _models.extend(_subclasses)
+        _bases.extend(_subclasses)
+    return _models
+
+
+def get_read_database(database_path: Path) -> SqliteDatabase:
+    """
+    Returns the read-only database of a database path. The database object is created once per path, it is separate
+    from the database of vrtool so the writers never share its connection or its parameters.
+
+    The database is opened read-only (`mode=ro` URI), with memory mapped I/O, a larger page cache and `query_only`.
+    Opening a database to read it leaves the file untouched.
+
+    :param database_path: path to the sqlite database
+    :return: the peewee database, not connected
+    """
+    _database_path = Path(database_path).resolve()
+    if not _database_path.exists():
+        raise ValueError(f"No file was found at {_database_path}")
+
+    with _read_databases_lock:
+        if _database_path not in _read_databases:
+            _read_databases[_database_path] = SqliteDatabase(
+                f"{_database_path.as_uri()}?mode=ro", uri=True, pragmas=READ_PRAGMAS
+            )
+        return _read_databases[_database_path]
+
+
+@contextmanager
+def database_reader_session(database_path: Path) -> Iterator[SqliteDatabase]:
+    """
+    Context manager for reading the database with the ORM models, which are bound to the read-only database of the
+    path (see `get_read_database`) for the duration of the block. The connection is opened once per database and
+    thread, and reused by the next sessions instead of reopening the database every time.
+
+    The sessions of other threads wait until the block ends, as the models can only be bound to one database at a
+    time. Writes must go through `database_writer_session`.
+
+    :param database_path: path to the sqlite database
+    :return: the peewee database the ORM models are bound to
+    """
+    _database = get_read_database(database_path)
+    with _orm_models_lock, _database.bind_ctx(_get_orm_models()):
+        _database.connect(reuse_if_open=True)
+        yield _database
+
+
+def get_database_version(database_path: Path) -> tuple[int, ...]:
+    """
+    Returns the modification time and size of the database file and of its write-ahead log, if any. In WAL mode, a
+    committed write only changes the `-wal` file until it is checkpointed into the database file, so the version of
+    both files is needed to notice the write.
+
+    :param database_path: path to the sqlite database
+    :return: tuple of (modification time in ns, size) of the database file and its `-wal` file
+    """
+    _database_path = Path(database_path)
+    _version = ()
+    for _path in [_database_path, Path(f"{_database_path}-wal")]:
+        if _path.exists():
+            _stat = _path.stat()
+            _version += (_stat.st_mtime_ns, _stat.st_size)
+    return _version
+
+
+def close_database_reader_sessions():
+    """Close the read connections of the current thread to all the databases."""
+    with _read_databases_lock:
+        _databases = list(_read_databases.values())
+    for _database in _databases:
+        if not _database.is_closed():
+            _database.close()
+
+
+@contextmanager
+def database_writer_session(database_path: Path) -> Iterator[SqliteDatabase]:
+    """
+    Context manager for writing to the database (e.g. vrtool optimization or custom measures). The database of vrtool
+    is opened without the read pragmas for the duration of the block, and the ORM models keep their vrtool binding:
+    the reader sessions of other threads wait until the block ends.
+
+    :param database_path: path to the sqlite database
+    """
+    with _orm_models_lock:
+        _database = open_database(Path(database_path).resolve())
+        try:
+            yield _database
+        finally:
+            if not _database.is_closed():
+                _database.close()
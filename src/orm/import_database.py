@@ -1,10 +1,10 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from pandas import DataFrame
 from peewee import JOIN
 from vrtool.defaults.vrtool_config import VrtoolConfig
-from vrtool.orm.orm_controllers import open_database
 
 from src.constants import (
     GreedyOPtimizationCriteria,
@@ -13,12 +13,17 @@ from src.constants import (
 )
 from src.linear_objects.dike_traject import DikeTraject
 from src.orm import models as orm_model
+from src.orm.database_session import database_reader_session, get_database_version
 from src.orm.importers.custom_measures_importer import CustomMeasureImporter
 from src.orm.importers.dike_traject_importer import DikeTrajectImporter
+from src.orm.importers.greedy_trajectory import GreedyTrajectory
 from src.orm.importers.measure_reliability_time_importer import (
     TrajectMeasureResultsTimeImporter,
 )
-from src.orm.importers.measures_importer import TrajectMeasureResultsImporter
+from src.orm.importers.measures_importer import (
+    TrajectMeasureResultsImporter,
+    get_step_numbers_per_section,
+)
 from src.orm.importers.optimization_run_importer import import_optimization_runs_name
 
 
@@ -26,13 +31,33 @@ def get_all_custom_measures(vr_config: VrtoolConfig):
     _path_dir = Path(vr_config.input_directory)
     _path_database = _path_dir.joinpath(vr_config.input_database_name)
 
-    open_database(_path_database)
-    _res = CustomMeasureImporter(
-        vr_config=vr_config,
-    ).import_orm(orm_model)
+    with database_reader_session(_path_database):
+        _res = CustomMeasureImporter(
+            vr_config=vr_config,
+        ).import_orm(orm_model)
+
     return _res
 
 
+def get_custom_measures(
+    vr_config: VrtoolConfig, after_id: Optional[int] = None
+) -> DataFrame:
+    """
+    Read the custom measures of the database in columnar form, see `CustomMeasureImporter.read_custom_measures`.
+
+    :param vr_config: vr config from the VRCore
+    :param after_id: if given, only the custom measures added after the CustomMeasureDetail with this id are read
+    :return: DataFrame with one row per CustomMeasureDetail, ordered by id
+    """
+    _path_dir = Path(vr_config.input_directory)
+    _path_database = _path_dir.joinpath(vr_config.input_database_name)
+
+    with database_reader_session(_path_database):
+        return CustomMeasureImporter(vr_config=vr_config).read_custom_measures(
+            after_id=after_id
+        )
+
+
 def get_all_measure_results(
     vr_config: VrtoolConfig,
     section_name: str,
@@ -42,6 +67,7 @@ def get_all_measure_results(
     run_id_dsn: int,
     active_mechanisms: Optional[list[str]] = None,
     final_step_number: Optional[int] = None,
+    section_step_numbers: Optional[dict[int, list[int]]] = None,
 ) -> tuple[DataFrame, dict, dict]:
     """
     Import and return all the single measures and the steps measures of the GreedyOptimization for a given selected
@@ -56,26 +82,46 @@ def get_all_measure_results(
     :param active_mechanisms: list of active mechanisms for the section
     :param final_step_number: number of the final step for which the measures must be imported. If None, all steps are
         imported.
+    :param section_step_numbers: step numbers of the section per run id (see `get_step_numbers_per_section`), the
+        index is read from the database for the runs which are not provided.
     :return:
     """
     _path_dir = Path(vr_config.input_directory)
     _path_database = _path_dir.joinpath(vr_config.input_database_name)
 
-    open_database(_path_database)
-    _meas_results, _vr_steps, _dsn_steps = TrajectMeasureResultsImporter(
-        vr_config=vr_config,
-        section_name=section_name,
-        mechanism=mechanism,
-        time=time,
-        run_id_vr=run_id_vr,
-        run_id_dsn=run_id_dsn,
-        active_mechanisms=active_mechanisms,
-        final_step_number=final_step_number,
-    ).import_orm(orm_model)
+    with database_reader_session(_path_database):
+        _meas_results, _vr_steps, _dsn_steps = TrajectMeasureResultsImporter(
+            vr_config=vr_config,
+            section_name=section_name,
+            mechanism=mechanism,
+            time=time,
+            run_id_vr=run_id_vr,
+            run_id_dsn=run_id_dsn,
+            active_mechanisms=active_mechanisms,
+            final_step_number=final_step_number,
+            section_step_numbers=section_step_numbers,
+        ).import_orm(orm_model)
 
     return _meas_results, _vr_steps, _dsn_steps
 
 
+def get_step_numbers_per_section_from_config(
+    vr_config: VrtoolConfig, run_id: int
+) -> dict[str, list[int]]:
+    """
+    Return the step numbers of an optimization run grouped by dike section.
+
+    :param vr_config: vr config from the VRCore
+    :param run_id: id of the optimization run
+    :return: dict {section name: sorted step numbers}
+    """
+    _path_dir = Path(vr_config.input_directory)
+    _path_database = _path_dir.joinpath(vr_config.input_database_name)
+
+    with database_reader_session(_path_database):
+        return get_step_numbers_per_section(run_id)
+
+
 def get_measure_reliability_over_time(
     vr_config: VrtoolConfig, measure_result_id: int, mechanism: str
 ) -> list[float]:
@@ -89,12 +135,13 @@ def get_measure_reliability_over_time(
     _path_dir = Path(vr_config.input_directory)
     _path_database = _path_dir.joinpath(vr_config.input_database_name)
 
-    open_database(_path_database)
-    _res = TrajectMeasureResultsTimeImporter(
-        vr_config=vr_config,
-        measure_result_id=measure_result_id,
-        mechanism=mechanism,
-    ).import_orm(orm_model)
+    with database_reader_session(_path_database):
+        _res = TrajectMeasureResultsTimeImporter(
+            vr_config=vr_config,
+            measure_result_id=measure_result_id,
+            mechanism=mechanism,
+        ).import_orm(orm_model)
+
     return _res
 
 
@@ -120,27 +167,52 @@ def get_dike_traject_from_config_ORM(
     _path_dir = Path(vr_config.input_directory)
     _path_database = _path_dir.joinpath(vr_config.input_database_name)
 
-    open_database(_path_database)
-    _dike_traject = DikeTrajectImporter(
-        vr_config=vr_config,
-        run_id_dsn=run_id_dsn,
-        run_id_vr=run_is_vr,
-        greedy_optimization_criteria=greedy_optimization_criteria,
-        greedy_criteria_year=greedy_criteria_year,
-        greedy_criteria_beta=greedy_criteria_beta,
-    ).import_orm(orm_model, _path_database)
+    with database_reader_session(_path_database):
+        _dike_traject = DikeTrajectImporter(
+            vr_config=vr_config,
+            run_id_dsn=run_id_dsn,
+            run_id_vr=run_is_vr,
+            greedy_optimization_criteria=greedy_optimization_criteria,
+            greedy_criteria_year=greedy_criteria_year,
+            greedy_criteria_beta=greedy_criteria_beta,
+        ).import_orm(orm_model, _path_database)
 
     return _dike_traject
 
 
+def get_dike_traject_and_greedy_trajectory_from_config_ORM(
+    vr_config: VrtoolConfig, run_id_dsn: int, run_is_vr: int
+) -> tuple[DikeTraject, GreedyTrajectory]:
+    """
+    Same as `get_dike_traject_from_config_ORM` for the economic optimal criterion, but also returns the full greedy
+    trajectory of the veiligheidsrendement run. Applying the trajectory to the DikeTraject gives the results for any
+    other greedy stop criterion without reading the database again.
+
+    :return: tuple with the DikeTraject object and the GreedyTrajectory
+    """
+    _path_dir = Path(vr_config.input_directory)
+    _path_database = _path_dir.joinpath(vr_config.input_database_name)
+
+    with database_reader_session(_path_database):
+        _importer = DikeTrajectImporter(
+            vr_config=vr_config,
+            run_id_dsn=run_id_dsn,
+            run_id_vr=run_is_vr,
+            greedy_optimization_criteria=GreedyOPtimizationCriteria.ECONOMIC_OPTIMAL.name,
+            bulk_import=True,
+        )
+        _dike_traject = _importer.import_orm(orm_model, _path_database)
+
+    return _dike_traject, _importer.greedy_trajectory
+
+
 def get_name_optimization_runs(vr_config: VrtoolConfig) -> list[str]:
     """Returns a list of the (unique) names of the optimization runs in the database"""
     _path_dir = Path(vr_config.input_directory)
     _path_database = _path_dir.joinpath(vr_config.input_database_name)
 
-    open_database(_path_database)
-
-    _names = import_optimization_runs_name(orm_model)
+    with database_reader_session(_path_database):
+        _names = import_optimization_runs_name(orm_model)
     # Define substrings to remove
     _substrings_to_remove = ["Veiligheidsrendement", "Doorsnede-eisen"]
 
@@ -172,28 +244,27 @@ def get_run_optimization_ids(vr_config, optimization_run_name: str) -> tuple[int
     _path_dir = Path(vr_config.input_directory)
     _path_database = _path_dir.joinpath(vr_config.input_database_name)
 
-    open_database(_path_database)
-
-    _vr_run_name = optimization_run_name + " Veiligheidsrendement"
-    _dsn_run_name = optimization_run_name + " Doorsnede-eisen"
+    with database_reader_session(_path_database):
+        _vr_run_name = optimization_run_name + " Veiligheidsrendement"
+        _dsn_run_name = optimization_run_name + " Doorsnede-eisen"
 
-    _run_id_vr = (
-        orm_model.OptimizationRun.select()
-        .where(
-            orm_model.OptimizationRun.name == _vr_run_name,
-        )[0]
-        .id
-    )
+        _run_id_vr = (
+            orm_model.OptimizationRun.select()
+            .where(
+                orm_model.OptimizationRun.name == _vr_run_name,
+            )[0]
+            .id
+        )
 
-    _run_id_dsn = (
-        orm_model.OptimizationRun.select()
-        .where(
-            orm_model.OptimizationRun.name == _dsn_run_name,
-        )[0]
-        .id
-    )
+        _run_id_dsn = (
+            orm_model.OptimizationRun.select()
+            .where(
+                orm_model.OptimizationRun.name == _dsn_run_name,
+            )[0]
+            .id
+        )
 
-    return _run_id_vr, _run_id_dsn
+        return _run_id_vr, _run_id_dsn
 
 
 def get_measure_result_ids_per_section(
@@ -210,41 +281,103 @@ def get_measure_result_ids_per_section(
     _path_dir = Path(vr_config.input_directory)
     _path_database = _path_dir.joinpath(vr_config.input_database_name)
 
-    open_database(_path_database)
+    with database_reader_session(_path_database):
+        _measure_type_name_orm = conversion_dict_measure_names[selected_measure_type]
 
-    _measure_type_name_orm = conversion_dict_measure_names[selected_measure_type]
+        _measure_type = orm_model.MeasureType.select().where(
+            orm_model.MeasureType.name == _measure_type_name_orm
+        )
 
-    _measure_type = orm_model.MeasureType.select().where(
-        orm_model.MeasureType.name == _measure_type_name_orm
-    )
+        if (
+            len(_measure_type) == 0
+        ):  # this checks if a measure type from the optimization table is indeed present in the ORM Table Measure.
+            # If not, len= 0 and return empty list
+            return []
+
+        _measure = orm_model.Measure.select().where(
+            orm_model.Measure.measure_type_id == _measure_type[0].id
+        )
 
-    if (
-        len(_measure_type) == 0
-    ):  # this checks if a measure type from the optimization table is indeed present in the ORM Table Measure.
-        # If not, len= 0 and return empty list
-        return []
+        _measure_results = (
+            orm_model.MeasureResult.select()
+            .join(orm_model.MeasurePerSection)
+            .join(
+                orm_model.SectionData,
+                JOIN.INNER,
+                on=(orm_model.SectionData.section_name == section_name),
+            )
+            .where(
+                orm_model.MeasurePerSection.measure_id.in_(
+                    [measure.id for measure in _measure]
+                ),
+                orm_model.MeasurePerSection.section_id == orm_model.SectionData.id,
+            )
+        )
+
+        return [measure_result.id for measure_result in _measure_results]
+
+
+def get_measure_result_ids_index(
+    vr_config: VrtoolConfig,
+) -> dict[tuple[str, str], list[int]]:
+    """Returns the measure result ids of all the sections and measure types of the database, read in one query.
+    The index is cached until the database changes (see `get_database_version`) or is cleared by
+    `clear_measure_result_ids_index`.
+
+    :param vr_config: VrtoolConfig object
 
-    _measure = orm_model.Measure.select().where(
-        orm_model.Measure.measure_type_id == _measure_type[0].id
+    :return: dict {(section name, measure type): list of measure result ids}, with the measure type as the name of
+        the `Measures` enum, e.g. GROUND_IMPROVEMENT. Same ids as `get_measure_result_ids_per_section`.
+    """
+    _path_dir = Path(vr_config.input_directory)
+    _path_database = _path_dir.joinpath(vr_config.input_database_name).resolve()
+    return _read_measure_result_ids_index(
+        _path_database, get_database_version(_path_database)
     )
 
-    _measure_results = (
-        orm_model.MeasureResult.select()
-        .join(orm_model.MeasurePerSection)
-        .join(
-            orm_model.SectionData,
-            JOIN.INNER,
-            on=(orm_model.SectionData.section_name == section_name),
-        )
-        .where(
-            orm_model.MeasurePerSection.measure_id.in_(
-                [measure.id for measure in _measure]
-            ),
-            orm_model.MeasurePerSection.section_id == orm_model.SectionData.id,
+
+def clear_measure_result_ids_index():
+    """Clear the cached index of `get_measure_result_ids_index`. To be called after writing to the database."""
+    _read_measure_result_ids_index.cache_clear()
+
+
+@lru_cache(maxsize=8)
+def _read_measure_result_ids_index(
+    database_path: Path, database_version: tuple[int, ...]
+) -> dict[tuple[str, str], list[int]]:
+    """The version of the database is part of the cache key only."""
+    with database_reader_session(database_path):
+        _measure_types = {
+            _orm_name: _measure_type
+            for _measure_type, _orm_name in conversion_dict_measure_names.items()
+        }
+        _measure_results = (
+            orm_model.MeasureResult.select(
+                orm_model.MeasureResult.id,
+                orm_model.SectionData.section_name,
+                orm_model.MeasureType.name,
+            )
+            .join(orm_model.MeasurePerSection)
+            .join(orm_model.SectionData)
+            .switch(orm_model.MeasurePerSection)
+            .join(orm_model.Measure)
+            .join(orm_model.MeasureType)
+            .order_by(orm_model.MeasureResult.id)
         )
-    )
 
-    return [measure_result.id for measure_result in _measure_results]
+        _index = {}
+        for (
+            _measure_result_id,
+            _section_name,
+            _measure_type_name,
+        ) in _measure_results.tuples():
+            if _measure_type_name not in _measure_types:
+                continue
+            _index.setdefault(
+                (_section_name, _measure_types[_measure_type_name]), []
+            ).append(_measure_result_id)
+
+    return _index
 
 
 def get_all_default_selected_measure(_vr_config: VrtoolConfig) -> list[tuple]:
@@ -257,12 +390,11 @@ def get_all_default_selected_measure(_vr_config: VrtoolConfig) -> list[tuple]:
     _path_dir = Path(_vr_config.input_directory)
     _path_database = _path_dir.joinpath(_vr_config.input_database_name)
 
-    open_database(_path_database)
-
-    _selected_optimization_measure = orm_model.OptimizationSelectedMeasure.select()
-    _meas_list = []
-    for meas in _selected_optimization_measure:
-        if meas.optimization_run_id == 1:
-            _meas_list.append((meas.measure_result_id, meas.investment_year))
+    with database_reader_session(_path_database):
+        _selected_optimization_measure = orm_model.OptimizationSelectedMeasure.select()
+        _meas_list = []
+        for meas in _selected_optimization_measure:
+            if meas.optimization_run_id == 1:
+                _meas_list.append((meas.measure_result_id, meas.investment_year))
 
     return _meas_list
@@ -1,3 +1,6 @@
+from typing import Optional
+
+import pandas as pd
 from vrtool.common.enums import CombinableTypeEnum
 from vrtool.defaults.vrtool_config import VrtoolConfig
 from vrtool.orm.io.importers.orm_importer_protocol import OrmImporterProtocol
@@ -11,6 +14,23 @@ from vrtool.orm.models import (
 
 from src.constants import Mechanism as MechanismEnum
 
+# names of the mechanisms in the database and in the dashboard
+CUSTOM_MEASURE_MECHANISMS = {
+    "Piping": MechanismEnum.PIPING.value,
+    "Overflow": MechanismEnum.OVERFLOW.value,
+    "StabilityInner": MechanismEnum.STABILITY.value,
+    "Revetment": MechanismEnum.REVETMENT.value,
+}
+CUSTOM_MEASURE_COLUMNS = [
+    "id",
+    "measure_name",
+    "section_name",
+    "mechanism",
+    "time",
+    "cost",
+    "beta",
+]
+
 
 class CustomMeasureImporter(OrmImporterProtocol):
 
@@ -27,52 +47,66 @@ class CustomMeasureImporter(OrmImporterProtocol):
         :param orm_model: ORM model
         :return: list of custom measures
         """
+        _custom_measures = self.read_custom_measures()
+        return _custom_measures[
+            ["beta", "cost", "time", "section_name", "mechanism", "measure_name"]
+        ].to_dict("records")
 
-        _res = []
-        _custom_measure_results = CustomMeasureDetail().select().join(Measure)
-        for cm_detail in _custom_measure_results:
-            _mechanism_per_section = (
-                MechanismPerSection()
-                .select()
-                .where(MechanismPerSection.id == cm_detail.mechanism_per_section_id)
-                .get()
-            )
-            _section = (
-                SectionData()
-                .select()
-                .where(SectionData.id == _mechanism_per_section.section_id)
-                .get()
-            )
-            _mechanism = (
-                Mechanism()
-                .select()
-                .where(Mechanism.id == _mechanism_per_section.mechanism_id)
-                .get()
+    def read_custom_measures(self, after_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Read the custom measures from the database in a single joined query:
+            CustomMeasureDetail ⋈ Measure ⋈ MechanismPerSection ⋈ SectionData ⋈ Mechanism
+
+        :param after_id: if given, only the CustomMeasureDetail rows with an id greater than after_id are read, e.g. the
+        rows added since a previous read (see `get_last_custom_measure_id`).
+        :return: DataFrame with one row per CustomMeasureDetail, ordered by id, with columns CUSTOM_MEASURE_COLUMNS
+        """
+        _query = (
+            CustomMeasureDetail.select(
+                CustomMeasureDetail.id,
+                Measure.name,
+                SectionData.section_name,
+                Mechanism.name,
+                CustomMeasureDetail.time,
+                CustomMeasureDetail.cost,
+                CustomMeasureDetail.beta,
             )
-            _measure = (
-                Measure().select().where(Measure.id == cm_detail.measure_id).get()
+            .join(Measure, on=(CustomMeasureDetail.measure_id == Measure.id))
+            .join(
+                MechanismPerSection,
+                on=(
+                    CustomMeasureDetail.mechanism_per_section_id
+                    == MechanismPerSection.id
+                ),
             )
+            .join(SectionData, on=(MechanismPerSection.section_id == SectionData.id))
+            .join(Mechanism, on=(MechanismPerSection.mechanism_id == Mechanism.id))
+            .order_by(CustomMeasureDetail.id)
+        )
+        if after_id is not None:
+            _query = _query.where(CustomMeasureDetail.id > after_id)
 
-            if _mechanism.name == "Piping":
-                meca = MechanismEnum.PIPING.value
-            elif _mechanism.name == "Overflow":
-                meca = MechanismEnum.OVERFLOW.value
-            elif _mechanism.name == "StabilityInner":
-                meca = MechanismEnum.STABILITY.value
-            elif _mechanism.name == "Revetment":
-                meca = MechanismEnum.REVETMENT.value
-            else:
-                raise ValueError(f"Mechanism {_mechanism.name} is not recognized")
-
-            _cm_data = dict(
-                beta=cm_detail.beta,
-                cost=cm_detail.cost,
-                time=cm_detail.time,
-                section_name=_section.section_name,
-                mechanism=meca,
-                measure_name=_measure.name,
-                # COMBINABLE_TYPE_TYPE=CombinableTypeEnum.FULL.name,
+        _custom_measures = pd.DataFrame(
+            list(_query.tuples()), columns=CUSTOM_MEASURE_COLUMNS
+        )
+        _unknown_mechanisms = set(_custom_measures["mechanism"]).difference(
+            CUSTOM_MEASURE_MECHANISMS
+        )
+        if _unknown_mechanisms:
+            raise ValueError(
+                f"Mechanism {', '.join(sorted(_unknown_mechanisms))} is not recognized"
             )
+        _custom_measures["mechanism"] = _custom_measures["mechanism"].map(
+            CUSTOM_MEASURE_MECHANISMS
+        )
+        return _custom_measures
+
 
-            _res.append(_cm_data)
-        return _res
+def get_last_custom_measure_id(custom_measures: pd.DataFrame) -> int:
+    """
+    Returns the highest CustomMeasureDetail id of custom measures read with `CustomMeasureImporter.read_custom_measures`,
+    0 if there are none.
+    """
+    if custom_measures.empty:
+        return 0
+    return int(custom_measures["id"].max())
@@ -10,6 +10,7 @@ from vrtool.orm.models import SectionData
 from src.linear_objects.dike_section import DikeSection
 from src.linear_objects.dike_traject import DikeTraject
 from src.orm.importers.dike_section_importer import DikeSectionImporter
+from src.orm.importers.greedy_trajectory import GreedyTrajectory
 from src.orm.importers.solution_importer import TrajectSolutionRunImporter
 from src.orm.models.dike_traject_info import DikeTrajectInfo
 from src.utils.utils import get_signal_value
@@ -24,6 +25,9 @@ class DikeTrajectImporter(OrmImporterProtocol):
     greedy_optimization_criteria: str
     greedy_criteria_year: Optional[int]
     greedy_criteria_beta: Optional[float]
+    bulk_import: bool
+    # set by import_orm for a bulk import
+    greedy_trajectory: Optional[GreedyTrajectory] = None
 
     def __init__(
         self,
@@ -33,6 +37,7 @@ class DikeTrajectImporter(OrmImporterProtocol):
         greedy_optimization_criteria: str,
         greedy_criteria_year: Optional[int] = None,
         greedy_criteria_beta: Optional[float] = None,
+        bulk_import: bool = True,
     ) -> None:
         """
 
@@ -40,6 +45,8 @@ class DikeTrajectImporter(OrmImporterProtocol):
         :param run_id_vr: run id in the database for which the veiligheidsrendement optimization results must be
          imported
         :param run_id_dsn: run id in the database for which the doorsnede eisen optimization results must be imported.
+        :param bulk_import: if True, the optimization runs are read in a fixed number of queries instead of querying
+         the database for every optimization step.
         """
         self.vr_config = vr_config
         self.path_dir = Path(vr_config.input_directory)
@@ -49,6 +56,7 @@ class DikeTrajectImporter(OrmImporterProtocol):
         self.greedy_optimization_criteria = greedy_optimization_criteria
         self.greedy_criteria_year = greedy_criteria_year
         self.greedy_criteria_beta = greedy_criteria_beta
+        self.bulk_import = bulk_import
 
     def _import_dike_section_list(
         self,
@@ -132,7 +140,9 @@ class DikeTrajectImporter(OrmImporterProtocol):
             greedy_criteria_year=self.greedy_criteria_year,
             assessment_years=self.vr_config.T,
             database_path=path_database,
+            bulk_import=self.bulk_import,
         )
         _solution_importer.import_orm()
+        self.greedy_trajectory = _solution_importer.greedy_trajectory
 
         return _dike_traject
@@ -0,0 +1,344 @@
+import copy
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from src.constants import REFERENCE_YEAR, GreedyOPtimizationCriteria
+from src.linear_objects.dike_traject import DikeTraject
+from src.utils.database_analytics import StepwiseAssessment
+from src.utils.traject_probability import (
+    calc_leave_one_out_failure_probability,
+    calc_system_failure_probability,
+    get_traject_reliability_arrays,
+    get_traject_reliability_sections,
+    is_min_beta_mechanism,
+)
+from src.utils.utils import pf_to_beta
+
+
+@dataclass
+class GreedyTrajectory:
+    """
+    Full solution of a GreedyOptimization (veiligheidsrendement) run, materialized once for all the optimization steps.
+    Combined measures sharing a step number form a single step of the trajectory.
+
+    A greedy stop criterion (economic optimal or target beta/year) only selects how many steps of the trajectory are
+    applied to the DikeTraject, see `apply`, which requires no database access.
+    """
+
+    step_numbers: list[int]
+    first_step_ids: list[int]  # id of the first OptimizationStep of every step number
+    section_names: list[str]  # name of the section reinforced at every step
+    step_measures: list[dict]  # final measure of the section after every step
+    step_lcc: list[float]  # incremental LCC of every step
+    # (1 + number of steps, year), the first row is the unreinforced traject
+    traject_pf: np.ndarray
+    assessment_time: list[int]
+    economic_optimal_final_step_id: int
+    # final_measure_veiligheidsrendement of the sections before any step
+    initial_measures: dict[str, dict]
+    # criteria independent inputs of `get_modified_vr_order`:
+    assessment_results: dict = field(default_factory=dict)
+    stepwise_assessment: Optional[StepwiseAssessment] = None
+    flood_damage: float = 0
+
+    def __post_init__(self):
+        # The stop step is the first step fulfilling the criterion. Running maxima turn these first crossings into
+        # binary searches.
+        self._running_max_step_ids = np.maximum.accumulate(
+            np.asarray(self.first_step_ids, dtype=float)
+        )
+        # missing betas never fulfill the criterion
+        _traject_beta = np.nan_to_num(
+            pf_to_beta(np.asarray(self.traject_pf[1:], dtype=float)), nan=-np.inf
+        )
+        self._running_max_traject_beta = np.maximum.accumulate(_traject_beta, axis=0)
+
+    def get_final_step_index(
+        self,
+        greedy_optimization_criteria: str,
+        greedy_criteria_year: Optional[int] = None,
+        greedy_criteria_beta: Optional[float] = None,
+    ) -> Optional[int]:
+        """
+        Returns the index of the step at which the greedy optimization stops, same criteria as
+        `TrajectSolutionRunImporter.continue_next_step`.
+
+        :return: index of the last applied step, None if the criterion is never met.
+        """
+        if len(self.step_numbers) == 0:
+            return None
+
+        if (
+            greedy_optimization_criteria
+            == GreedyOPtimizationCriteria.ECONOMIC_OPTIMAL.name
+        ):
+            # stop as soon as optimization_step_id + 1 > economic_optimal_final_step_id
+            _index = np.searchsorted(
+                self._running_max_step_ids,
+                self.economic_optimal_final_step_id - 1,
+                side="right",
+            )
+
+        elif greedy_optimization_criteria == GreedyOPtimizationCriteria.TARGET_PF.name:
+            _year_step_index = (
+                bisect_right(
+                    self.assessment_time, greedy_criteria_year - REFERENCE_YEAR
+                )
+                - 1
+            )
+            # stop as soon as the traject beta of the selected year exceeds the target beta
+            _index = np.searchsorted(
+                self._running_max_traject_beta[:, _year_step_index],
+                greedy_criteria_beta,
+                side="right",
+            )
+        else:
+            return None
+
+        if _index >= len(self.step_numbers):
+            return None
+        return int(_index)
+
+    def apply(
+        self,
+        dike_traject: DikeTraject,
+        greedy_optimization_criteria: str,
+        greedy_criteria_year: Optional[int] = None,
+        greedy_criteria_beta: Optional[float] = None,
+    ):
+        """
+        Set in place the veiligheidsrendement results of the DikeTraject for a greedy stop criterion: final measure
+        of the sections, greedy steps, reinforcement order, final step number and modified reinforcement order.
+        When the criterion is never met, all the steps are applied.
+
+        :param dike_traject: DikeTraject whose sections are the sections of the optimization run.
+        """
+        _final_step_index = self.get_final_step_index(
+            greedy_optimization_criteria, greedy_criteria_year, greedy_criteria_beta
+        )
+        _nb_steps = (
+            len(self.step_numbers)
+            if _final_step_index is None
+            else _final_step_index + 1
+        )
+
+        _final_measures = copy.deepcopy(self.initial_measures)
+        _greedy_steps = [{"pf": self.traject_pf[0].tolist(), "LCC": 0}]
+        for _index in range(_nb_steps):
+            _final_measures[self.section_names[_index]] = self.step_measures[_index]
+            _greedy_steps.append(
+                {
+                    "pf": self.traject_pf[_index + 1].tolist(),
+                    "LCC": self.step_lcc[_index],
+                }
+            )
+
+        for section in dike_traject.dike_sections:
+            if section.name in _final_measures:
+                section.final_measure_veiligheidsrendement = copy.deepcopy(
+                    _final_measures[section.name]
+                )
+
+        dike_traject.greedy_steps = _greedy_steps
+        dike_traject.reinforcement_order_vr = list(
+            dict.fromkeys(self.section_names[:_nb_steps])
+        )
+        dike_traject.final_step_number = (
+            self.step_numbers[_nb_steps - 1] if _nb_steps > 0 else None
+        )
+        if dike_traject.final_step_number is not None:
+            dike_traject.reinforcement_modified_order_vr = get_modified_vr_order(
+                dike_traject,
+                dike_traject.final_step_number,
+                self.assessment_results,
+                self.stepwise_assessment,
+                self.flood_damage,
+            )
+        dike_traject.greedy_stop_type_criteria = greedy_optimization_criteria
+        dike_traject.greedy_stop_criteria_year = greedy_criteria_year
+        dike_traject.greedy_stop_criteria_beta = greedy_criteria_beta
+
+
+VR_INDEX_DISCOUNT_RATE = 0.03
+RISK_NB_YEARS = 100  # number of years of the discounted risk
+
+
+def get_interpolation_weights(times: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """
+    Weights of the linear interpolation of values given at the times, extrapolated linearly outside of the times, as
+    `interp1d(kind="linear", fill_value="extrapolate")`.
+
+    :param times: sorted times of the values, at least 2
+    :param years: times at which the values are interpolated
+    :return: array (year, time), the interpolated values are weights @ values
+    """
+    _times = np.asarray(times, dtype=float)
+    _segments = np.clip(
+        np.searchsorted(_times, years, side="right") - 1, 0, len(_times) - 2
+    )
+    _lower, _upper = _times[_segments], _times[_segments + 1]
+    _upper_weights = (years - _lower) / (_upper - _lower)
+
+    _weights = np.zeros((len(years), len(_times)))
+    _weights[np.arange(len(years)), _segments] = 1 - _upper_weights
+    _weights[np.arange(len(years)), _segments + 1] = _upper_weights
+    return _weights
+
+
+def calc_total_risk_array(
+    mechanism_pf: np.ndarray,
+    is_mechanism_present: np.ndarray,
+    times: list,
+    damage: float,
+    discount_rate: float,
+) -> np.ndarray:
+    """
+    Discounted risk over RISK_NB_YEARS years of a batch of traject probabilities of failure per mechanism, see
+    `calc_system_failure_probability`. The traject pf of every mechanism is interpolated linearly over the years
+    between the times where it is present, the mechanisms are combined as 1 - prod(1 - pf).
+
+    :param mechanism_pf: array (..., mechanism, time) of traject pf per mechanism
+    :param is_mechanism_present: boolean array (..., mechanism, time), the absent values are not interpolated
+    :param times: times of the last axis
+    :param damage: flood damage of the traject
+    :param discount_rate: yearly discount rate of the damage
+    :return: array (...) of the total risk
+    """
+    _years = np.arange(RISK_NB_YEARS)
+    _discounted_damage = np.divide(damage, np.power(1 + discount_rate, _years))
+
+    _times = np.asarray(times, dtype=float)
+    _pf = np.asarray(mechanism_pf, dtype=float).reshape(-1, len(_times))
+    _is_present = np.asarray(is_mechanism_present, dtype=bool).reshape(-1, len(_times))
+    _interpolated_pf = np.zeros((len(_pf), RISK_NB_YEARS))
+    # the weights only depend on the times where the pf is present, usually the same for all the rows
+    for _pattern in np.unique(_is_present, axis=0):
+        if not _pattern.any():
+            continue  # mechanism without any section
+        _rows = np.all(_is_present == _pattern, axis=1)
+        _weights = get_interpolation_weights(_times[_pattern], _years)
+        _interpolated_pf[_rows] = _pf[_rows][:, _pattern] @ _weights.T
+
+    _interpolated_pf = _interpolated_pf.reshape(
+        np.shape(mechanism_pf)[:-1] + (RISK_NB_YEARS,)
+    )
+    _total_failure_probability = 1 - np.prod(1 - _interpolated_pf, axis=-2)
+    return _total_failure_probability @ _discounted_damage
+
+
+def calculate_total_risk(traject_reliability, damage, discount_rate):
+    """
+    Discounted risk of the traject probability of failure per mechanism {mechanism: {time: pf}}, see
+    `calc_total_risk_array`.
+    """
+    _mechanisms = list(traject_reliability.keys())
+    _times = sorted({t for _pf in traject_reliability.values() for t in _pf})
+    _time_index = {t: i for i, t in enumerate(_times)}
+    _pf = np.zeros((len(_mechanisms), len(_times)))
+    _is_present = np.zeros((len(_mechanisms), len(_times)), dtype=bool)
+    for _mechanism_index, mechanism in enumerate(_mechanisms):
+        for t, pf in traject_reliability[mechanism].items():
+            _pf[_mechanism_index, _time_index[t]] = pf
+            _is_present[_mechanism_index, _time_index[t]] = True
+    return float(calc_total_risk_array(_pf, _is_present, _times, damage, discount_rate))
+
+
+def get_modified_vr_order(
+    dike_traject: DikeTraject,
+    final_step: int,
+    assessment_results: dict,
+    stepwise_assessment: StepwiseAssessment,
+    damage: float,
+) -> dict:
+    """
+    Modified script from Stephan to obtain the reinforcement order based on the index.
+
+    The index of a reinforced section is the increase of the discounted risk of the traject when the section is put
+    back to its initial assessment, divided by the cost of its measure. The traject probabilities with each section
+    put back are computed at once, see `calc_leave_one_out_failure_probability`.
+
+    :param dike_traject: DikeTraject with the final measures of the sections for the final step
+    :param final_step: step number of the final step of the greedy optimization
+    :param assessment_results: initial assessment per mechanism and section
+    :param stepwise_assessment: assessment per mechanism and section for every step
+    :param damage: flood damage of the traject
+
+    :return: dict {section id: vr index} sorted by decreasing index
+    """
+    # Get section ids for which a measure is taken.
+    section_ids = []
+    for section_id, section in enumerate(dike_traject.dike_sections, 1):
+        if section.final_measure_veiligheidsrendement["name"] != "Geen maatregel":
+            section_ids.append(section_id)
+
+    _final_assessment = stepwise_assessment[final_step]
+    _betas, _is_present, _mechanisms, _times = get_traject_reliability_arrays(
+        [_final_assessment]
+    )
+    _betas, _is_present = _betas[0], _is_present[0]
+    _is_min_beta = [is_min_beta_mechanism(mechanism) for mechanism in _mechanisms]
+    _section_index = {
+        section: i
+        for i, section in enumerate(
+            get_traject_reliability_sections([_final_assessment])
+        )
+    }
+    _time_index = {t: i for i, t in enumerate(_times)}
+
+    # betas of the traject with each reinforced section put back to its initial assessment
+    _initial_betas, _initial_is_present = _betas.copy(), _is_present.copy()
+    for section in section_ids:
+        for mechanism in assessment_results.keys():
+            if (
+                _final_assessment[mechanism] == {}
+                or section not in _final_assessment[mechanism]
+            ):  # the section has no assessment data for the mechanism (for example a section with no revetment)
+                continue
+            _index = (_section_index[section], _mechanisms.index(mechanism))
+            _columns = [
+                _time_index[t]
+                for t, _ in zip(
+                    _final_assessment[mechanism][section]["time"],
+                    assessment_results[mechanism][section]["beta"],
+                )
+            ]
+            _initial_is_present[_index] = False
+            _initial_betas[_index + (_columns,)] = assessment_results[mechanism][
+                section
+            ]["beta"][: len(_columns)]
+            _initial_is_present[_index + (_columns,)] = True
+
+    _mechanism_pf, _is_mechanism_present, _ = calc_system_failure_probability(
+        _betas, _is_present, _is_min_beta
+    )
+    total_risk = calc_total_risk_array(
+        _mechanism_pf, _is_mechanism_present, _times, damage, VR_INDEX_DISCOUNT_RATE
+    )
+    _increased_mechanism_pf, _is_increased_mechanism_present = (
+        calc_leave_one_out_failure_probability(
+            _betas, _is_present, _initial_betas, _initial_is_present, _is_min_beta
+        )
+    )
+    _increased_risks = calc_total_risk_array(
+        _increased_mechanism_pf,
+        _is_increased_mechanism_present,
+        _times,
+        damage,
+        VR_INDEX_DISCOUNT_RATE,
+    )
+
+    vr_index = {}
+    for section in section_ids:
+        if section in _section_index:
+            delta_risk = _increased_risks[_section_index[section]] - total_risk
+        else:
+            delta_risk = 0.0
+        section_costs = dike_traject.dike_sections[
+            section - 1
+        ].final_measure_veiligheidsrendement["LCC"]
+        vr_index[section] = delta_risk / section_costs
+
+    return dict(sorted(vr_index.items(), key=lambda item: item[1], reverse=True))
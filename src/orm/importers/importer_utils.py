@@ -1,3 +1,5 @@
+from typing import Optional
+
 from vrtool.orm.models import (
     Measure,
     MeasurePerSection,
@@ -133,8 +135,25 @@ def _get_measure_cost(optimization_steps: OptimizationStep) -> float:
     return cost
 
 
+def _get_measure_result_parameters(measure_result_id: int) -> dict[str, float]:
+    """
+    Get the parameters of a measure result as a dict {parameter name: value}. When a parameter is stored several times
+    for the same measure result, the first stored value is kept.
+
+    :param measure_result_id: id of the MeasureResult
+    :return: dict with the parameter values
+    """
+    _parameters = {}
+    for _parameter in MeasureResultParameter.select().where(
+        MeasureResultParameter.measure_result_id == measure_result_id
+    ):
+        _parameters.setdefault(_parameter.name, _parameter.value)
+    return _parameters
+
+
 def _get_measure_parameters(optimization_steps: OptimizationStep) -> dict:
-    _params = {}
+    _parameters_per_step = []
+    _initial_parameters_per_step = []
 
     for optimum_step in optimization_steps:
 
@@ -145,78 +164,74 @@ def _get_measure_parameters(optimization_steps: OptimizationStep) -> dict:
         measure_result = MeasureResult.get(
             MeasureResult.id == optimum_selected_measure.measure_result_id
         )
-
-        params_dberm = MeasureResultParameter.select().where(
-            (MeasureResultParameter.measure_result_id == measure_result.id)
-            & (MeasureResultParameter.name == "DBERM")
+        _parameters = _get_measure_result_parameters(measure_result.id)
+        _parameters_per_step.append(_parameters)
+
+        if "BETA_TARGET" not in _parameters:
+            _initial_parameters_per_step.append(None)
+            continue
+
+        # get the measure result which has the same measure_per_section as the applied measure but with the
+        # lowest beta target (this is the initial revetment measure)
+        _ini_measure_result = (
+            MeasureResult.select()
+            .where(
+                MeasureResult.measure_per_section_id
+                == measure_result.measure_per_section_id
+            )
+            .order_by(MeasureResult.id.asc())
+            .first()
         )
-        params_dcrest = MeasureResultParameter.select().where(
-            (MeasureResultParameter.measure_result_id == measure_result.id)
-            & (MeasureResultParameter.name == "DCREST")
+        _initial_parameters_per_step.append(
+            _get_measure_result_parameters(_ini_measure_result.id)
         )
 
-        params_beta_target = MeasureResultParameter.select().where(
-            (MeasureResultParameter.measure_result_id == measure_result.id)
-            & (MeasureResultParameter.name == "BETA_TARGET")
-        )
-        params_transition_level = MeasureResultParameter.select().where(
-            (MeasureResultParameter.measure_result_id == measure_result.id)
-            & (MeasureResultParameter.name == "TRANSITION_LEVEL")
-        )
+    return _compose_measure_parameters(
+        _parameters_per_step, _initial_parameters_per_step
+    )
 
-        params_L_stab_screen = MeasureResultParameter.select().where(
-            (MeasureResultParameter.measure_result_id == measure_result.id)
-            & (MeasureResultParameter.name == "L_STAB_SCREEN")
-        )
 
-        if _params.get("dberm") is None and params_dberm.count() > 0:
-            _params["dberm"] = params_dberm[0].value
-        if _params.get("dcrest") is None and params_dcrest.count() > 0:
-            _params["dcrest"] = params_dcrest[0].value
-        if _params.get("beta_target") is None and params_beta_target.count() > 0:
-            _params["beta_target"] = params_beta_target[0].value
-        if (
-            _params.get("transition_level") is None
-            and params_transition_level.count() > 0
-        ):
-            _params["transition_level"] = params_transition_level[0].value
-        if _params.get("L_stab_screen") is None and params_L_stab_screen.count() > 0:
-            _params["L_stab_screen"] = params_L_stab_screen[0].value
+def _compose_measure_parameters(
+    parameters_per_step: list[dict[str, float]],
+    initial_parameters_per_step: list[Optional[dict[str, float]]],
+) -> dict:
+    """
+    Compose the measure parameters dict of a (combined) optimization step from the parameters of the measure result of
+    each step. For a single parameter, the first step providing it wins.
+
+    :param parameters_per_step: list of {parameter name: value} of the selected measure result of each step.
+    :param initial_parameters_per_step: list of {parameter name: value} of the initial measure result (lowest id of
+    the same MeasurePerSection) of each step. Only required for the steps with a BETA_TARGET parameter.
+    :return: dict with keys dberm, dcrest, beta_target, transition_level, L_stab_screen, pf_target_ratio and
+    diff_transition_level when available.
+    """
+    _params = {}
+
+    for _parameters, _ini_parameters in zip(
+        parameters_per_step, initial_parameters_per_step
+    ):
+        for _key, _name in [
+            ("dberm", "DBERM"),
+            ("dcrest", "DCREST"),
+            ("beta_target", "BETA_TARGET"),
+            ("transition_level", "TRANSITION_LEVEL"),
+            ("L_stab_screen", "L_STAB_SCREEN"),
+        ]:
+            if _params.get(_key) is None and _name in _parameters:
+                _params[_key] = _parameters[_name]
 
         _params["pf_target_ratio"] = None
         _params["diff_transition_level"] = None
 
         # get the ratio of beta target and diff transition level when relevant
-        if params_beta_target.count() > 0:
-            _measure_per_section_id = MeasurePerSection.get(
-                MeasurePerSection.id == measure_result.measure_per_section_id
-            ).id
-
-            # get the measure result which has the same measure_per_section as the applied measure but with the
-            # lowest beta target (this is the initial revetment measure)
-            _ini_measure_result = (
-                MeasureResult.select()
-                .where(MeasureResult.measure_per_section_id == _measure_per_section_id)
-                .order_by(MeasureResult.id.asc())
-            )
-
-            # Get the initial revetment parameters:
-            ini_beta_target = MeasureResultParameter.select().where(
-                (MeasureResultParameter.measure_result_id == _ini_measure_result)
-                & (MeasureResultParameter.name == "BETA_TARGET")
-            )
-            ini_transition_level = MeasureResultParameter.select().where(
-                (MeasureResultParameter.measure_result_id == _ini_measure_result)
-                & (MeasureResultParameter.name == "TRANSITION_LEVEL")
-            )
-
+        if "BETA_TARGET" in _parameters:
             _params["pf_target_ratio"] = round(
-                beta_to_pf(ini_beta_target[0].value)
+                beta_to_pf(_ini_parameters["BETA_TARGET"])
                 / beta_to_pf(_params["beta_target"]),
                 1,
             )
             _params["diff_transition_level"] = (
-                _params["transition_level"] - ini_transition_level[0].value
+                _params["transition_level"] - _ini_parameters["TRANSITION_LEVEL"]
             )
 
     return _params
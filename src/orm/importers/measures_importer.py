@@ -5,7 +5,7 @@ import numpy as np
 import pandas as pd
 from geopandas import GeoDataFrame
 from pandas import DataFrame
-from peewee import JOIN, DoesNotExist
+from peewee import JOIN, fn
 from vrtool.defaults.vrtool_config import VrtoolConfig
 from vrtool.orm.io.importers.optimization.optimization_step_importer import (
     OptimizationStepImporter,
@@ -31,7 +31,31 @@ from src.orm.importers.optimization_step_importer import (
     _get_section_lcc,
 )
 from src.orm.models import MeasureResult, OptimizationSelectedMeasure, OptimizationStep
-from src.orm.orm_controller_custom import get_optimization_steps_ordered
+
+
+def get_step_numbers_per_section(run_id: int) -> dict[str, list[int]]:
+    """
+    Returns in a single query the step numbers of an optimization run grouped by the dike section they reinforce.
+    Combined measures sharing a step number are counted once.
+
+    :param run_id: id of the OptimizationRun
+    :return: dict {section name: sorted step numbers}, empty for an unknown run
+    """
+    _steps = (
+        OptimizationStep.select(SectionData.section_name, OptimizationStep.step_number)
+        .join(OptimizationSelectedMeasure)
+        .join(MeasureResult)
+        .join(MeasurePerSection)
+        .join(SectionData)
+        .where(OptimizationSelectedMeasure.optimization_run == run_id)
+        .distinct()
+        .order_by(OptimizationStep.step_number)
+    )
+
+    _step_numbers_per_section = {}
+    for _section_name, _step_number in _steps.tuples():
+        _step_numbers_per_section.setdefault(_section_name, []).append(_step_number)
+    return _step_numbers_per_section
 
 
 class TrajectMeasureResultsImporter(OrmImporterProtocol):
@@ -46,6 +70,7 @@ class TrajectMeasureResultsImporter(OrmImporterProtocol):
         run_id_dsn: int,
         active_mechanisms: Optional[list[str]] = None,
         final_step_number: Optional[int] = None,
+        section_step_numbers: Optional[dict[int, list[int]]] = None,
     ) -> None:
         self.vr_config = vr_config
         self.section_name = section_name
@@ -56,6 +81,8 @@ class TrajectMeasureResultsImporter(OrmImporterProtocol):
         self.active_mechanisms = active_mechanisms  # used for section only
         self.assessment_time = vr_config.T
         self.final_step_number = final_step_number
+        # {run id: step numbers of the section}, see `get_step_numbers_per_section`
+        self.section_step_numbers = section_step_numbers or {}
 
     def import_orm(self, orm_model) -> tuple:
         """
@@ -73,57 +100,35 @@ class TrajectMeasureResultsImporter(OrmImporterProtocol):
 
     def import_steps(self, run_id: int) -> list[dict]:
         """
-        Import all the measure steps for the filtered Optimization run and for the filtered dike section.
+        Import all the measure steps for the filtered Optimization run and for the filtered dike section. Only the
+        steps of the section are read, the step numbers are taken from `section_step_numbers` when provided.
         :param run_id: run_id of the OptimizationRun
         :return:
         """
-
-        try:
-            _optimization_steps = get_optimization_steps_ordered(run_id)
-
-        except DoesNotExist:
-            return []
-
-        _previous_step_number = None
-        _iterated_step_number = []
+        if run_id in self.section_step_numbers:
+            _step_numbers = self.section_step_numbers[run_id]
+        else:
+            _step_numbers = get_step_numbers_per_section(run_id).get(
+                self.section_name, []
+            )
 
         _step_measures = []
-        for _optimization_step in _optimization_steps:
-            _step_number = _optimization_step.step_number
-
-            # For combined steps sharing the same step number, skip the step if it has already been processed
-            if _previous_step_number == _step_number:
-                continue
+        for _step_number in sorted(_step_numbers):
             if (
                 self.final_step_number is not None
                 and _step_number > self.final_step_number
             ):
                 break
 
-            section = (
-                SectionData.select()
-                .join(MeasurePerSection)
-                .join(MeasureResult)
-                .join(OptimizationSelectedMeasure)
-                .where(
-                    OptimizationSelectedMeasure.id
-                    == _optimization_step.optimization_selected_measure_id
-                )
-            ).get()
-
-            if section.section_name != self.section_name:
-                continue
-
-            # if _optimization_step.step_number not in _iterated_step_number:
-            _iterated_step_number.append(_optimization_step.step_number)
-
+            # Combined steps share the same step number and are imported as one measure
             _optimum_section_optimization_steps = (
                 OptimizationStep.select()
                 .join(OptimizationSelectedMeasure)
                 .where(
                     (OptimizationSelectedMeasure.optimization_run == run_id)
-                    & (OptimizationStep.step_number == _optimization_step.step_number)
+                    & (OptimizationStep.step_number == _step_number)
                 )
+                .order_by(OptimizationStep.id)
             )
 
             _measure = _get_measure(
@@ -131,123 +136,181 @@ class TrajectMeasureResultsImporter(OrmImporterProtocol):
                 self.active_mechanisms,
                 self.assessment_time,
             )
-            _measure["LCC"] = _get_section_lcc(_optimization_step)
+            _measure["LCC"] = _get_section_lcc(_optimum_section_optimization_steps[0])
             _measure["cost"] = _get_measure_cost(_optimum_section_optimization_steps)
             _measure["measure_results_ids"] = _get_measure_result_ids(
                 _optimum_section_optimization_steps
             )
             _step_measures.append(_measure)
-            _previous_step_number = _step_number
 
         return _step_measures
 
-    def import_measures(self) -> DataFrame:
+    def _get_section_measure_results(self):
+        """Subquery of the ids of all the MeasureResult of the considered dike section."""
+        return (
+            MeasureResult.select(MeasureResult.id)
+            .join(MeasurePerSection)
+            .join(SectionData)
+            .where(SectionData.section_name == self.section_name)
+        )
+
+    def _import_measure_betas(self, section_measure_results) -> DataFrame:
         """
-        Import all the (single) measures for the considered dike section.
-        :return:
+        Import in a single query the beta at the considered time of all the measure results of the section, together
+        with the measure name. For the mechanism "Section" the cost is read from the same MeasureResultSection row.
 
-        Return a DataFrame with columns: beta, LCC, name, dberm, dcrest.
+        :param section_measure_results: subquery of the ids of the measure results of the section
+        :return: DataFrame with columns measure_result_id, measure, beta (and cost for "Section")
         """
-        _measure_results = (
-            MeasureResult.select()
-            .join(MeasurePerSection)
-            .join(
-                SectionData,
-                JOIN.INNER,
-                on=(SectionData.section_name == self.section_name),
-            )
-            .where(
-                #     MeasurePerSection.measure_id.in_([measure.id for measure in _measure]),
-                MeasurePerSection.section_id
-                == SectionData.id
+        if self.mechanism == "Section":
+            _query = (
+                MeasureResultSection.select(
+                    MeasureResultSection.measure_result.alias("measure_result_id"),
+                    Measure.name.alias("measure"),
+                    MeasureResultSection.beta,
+                    MeasureResultSection.cost,
+                )
+                .join(MeasureResult)
+                .join(MeasurePerSection)
+                .join(Measure)
+                .where(
+                    MeasureResultSection.measure_result.in_(section_measure_results),
+                    MeasureResultSection.time == self.time,
+                )
+                .order_by(MeasureResultSection.measure_result, MeasureResultSection.id)
             )
-        )
-        list_results = []
-
-        for measure_result in _measure_results:
-            # select only the first occurence of the measure result section
-            if self.mechanism == "Section":
-                _measure_result = (
-                    MeasureResultSection()
-                    .select()
-                    .where(
-                        MeasureResultSection.measure_result == measure_result.id,
-                        MeasureResultSection.time == self.time,
-                    )
-                    .get()
+        else:
+            _query = (
+                MeasureResultMechanism.select(
+                    MeasureResultMechanism.measure_result.alias("measure_result_id"),
+                    Measure.name.alias("measure"),
+                    MeasureResultMechanism.beta,
                 )
-                _beta, _cost = _measure_result.beta, _measure_result.cost
-            else:
-
-                _measure_result = (
-                    MeasureResultMechanism()
-                    .select()
-                    .join(
-                        MechanismPerSection,
-                        JOIN.INNER,
-                        on=(
-                            MeasureResultMechanism.mechanism_per_section
-                            == MechanismPerSection.id
-                        ),
-                    )
-                    .join(
-                        ORM_Mechanism,
-                        JOIN.INNER,
-                        on=(MechanismPerSection.mechanism_id == ORM_Mechanism.id),
-                    )
-                    .where(
-                        MeasureResultMechanism.measure_result == measure_result.id,
-                        MeasureResultMechanism.time == self.time,
-                        ORM_Mechanism.name == self.mechanism,
-                    )
-                    .get()
+                .join(MeasureResult)
+                .join(MeasurePerSection)
+                .join(Measure)
+                .switch(MeasureResultMechanism)
+                .join(
+                    MechanismPerSection,
+                    JOIN.INNER,
+                    on=(
+                        MeasureResultMechanism.mechanism_per_section
+                        == MechanismPerSection.id
+                    ),
                 )
-
-                _beta = _measure_result.beta
-                _cost = (
-                    MeasureResultSection()
-                    .select()
-                    .where(MeasureResultSection.measure_result == measure_result.id)
-                    .get()
-                    .cost
+                .join(
+                    ORM_Mechanism,
+                    JOIN.INNER,
+                    on=(MechanismPerSection.mechanism_id == ORM_Mechanism.id),
                 )
+                .where(
+                    MeasureResultMechanism.measure_result.in_(section_measure_results),
+                    MeasureResultMechanism.time == self.time,
+                    ORM_Mechanism.name == self.mechanism,
+                )
+                .order_by(
+                    MeasureResultMechanism.measure_result, MeasureResultMechanism.id
+                )
+            )
 
-                # raise NotImplementedError("Mechanism not implemented")
+        _betas = pd.DataFrame(list(_query.dicts()))
+        if _betas.empty:
+            return _betas
+        # only the first row of a measure result is kept, as with a `.get()`
+        return _betas.drop_duplicates("measure_result_id", keep="first")
 
-            # Get measure name/ measure type
-            measure = (
-                Measure.select()
-                .join(MeasurePerSection)
-                .join(MeasureResult)
-                .where(Measure.id == measure_result.measure_per_section.measure_id)
-                .get()
-            )
+    @staticmethod
+    def _import_measure_costs(section_measure_results) -> DataFrame:
+        """
+        Import in a single query the cost of all the measure results of the section. The cost of a measure result is
+        the cost of its first MeasureResultSection.
 
-            params_dberm = MeasureResultParameter.select().where(
-                (MeasureResultParameter.measure_result_id == measure_result.id)
-                & (MeasureResultParameter.name == "DBERM")
+        :param section_measure_results: subquery of the ids of the measure results of the section
+        :return: DataFrame with columns measure_result_id, cost
+        """
+        _query = (
+            MeasureResultSection.select(
+                MeasureResultSection.measure_result.alias("measure_result_id"),
+                MeasureResultSection.cost,
             )
-            params_dcrest = MeasureResultParameter.select().where(
-                (MeasureResultParameter.measure_result_id == measure_result.id)
-                & (MeasureResultParameter.name == "DCREST")
+            .where(
+                MeasureResultSection.id.in_(
+                    MeasureResultSection.select(fn.MIN(MeasureResultSection.id))
+                    .where(
+                        MeasureResultSection.measure_result.in_(section_measure_results)
+                    )
+                    .group_by(MeasureResultSection.measure_result)
+                )
             )
+            .dicts()
+        )
+        return pd.DataFrame(list(_query), columns=["measure_result_id", "cost"])
+
+    @staticmethod
+    def _import_measure_parameters(section_measure_results) -> DataFrame:
+        """
+        Import in a single query the DBERM and DCREST parameters of all the measure results of the section, pivoted to
+        one row per measure result. When a parameter is stored several times, the first stored value is kept.
 
-            dberm = params_dberm[0].value if params_dberm.count() > 0 else None
-            dcrest = params_dcrest[0].value if params_dcrest.count() > 0 else None
-
-            list_results.append(
-                {
-                    "LCC": _cost,
-                    "beta": _beta,
-                    "measure": measure.name,
-                    "dberm": dberm,
-                    "dcrest": dcrest,
-                    "measure_result_id": measure_result.id,
-                    "cost": _cost,
-                }
+        :param section_measure_results: subquery of the ids of the measure results of the section
+        :return: DataFrame indexed by measure_result_id with columns dberm, dcrest
+        """
+        _query = (
+            MeasureResultParameter.select(
+                MeasureResultParameter.measure_result.alias("measure_result_id"),
+                MeasureResultParameter.name,
+                MeasureResultParameter.value,
             )
+            .where(
+                MeasureResultParameter.measure_result.in_(section_measure_results),
+                MeasureResultParameter.name.in_(["DBERM", "DCREST"]),
+            )
+            .order_by(MeasureResultParameter.id)
+            .dicts()
+        )
+        _parameters = pd.DataFrame(
+            list(_query), columns=["measure_result_id", "name", "value"]
+        )
+        return (
+            _parameters.drop_duplicates(["measure_result_id", "name"], keep="first")
+            .pivot(index="measure_result_id", columns="name", values="value")
+            .rename(columns={"DBERM": "dberm", "DCREST": "dcrest"})
+            .reindex(columns=["dberm", "dcrest"])
+        )
 
-            # transform list into a dataframe:
-            df = pd.DataFrame(list_results)
+    def import_measures(self) -> DataFrame:
+        """
+        Import all the (single) measures for the considered dike section. The betas, costs, names and parameters of
+        all the measure results are fetched at once per table instead of per measure result.
+        :return:
+
+        Return a DataFrame with columns: beta, LCC, name, dberm, dcrest.
+        """
+        _columns = [
+            "LCC",
+            "beta",
+            "measure",
+            "dberm",
+            "dcrest",
+            "measure_result_id",
+            "cost",
+        ]
+        _section_measure_results = self._get_section_measure_results()
+
+        df = self._import_measure_betas(_section_measure_results)
+        if df.empty:
+            return pd.DataFrame(columns=_columns)
+
+        if "cost" not in df.columns:
+            df = df.merge(
+                self._import_measure_costs(_section_measure_results),
+                on="measure_result_id",
+                how="left",
+            )
+        df = df.join(
+            self._import_measure_parameters(_section_measure_results),
+            on="measure_result_id",
+        )
+        df["LCC"] = df["cost"]
 
-        return df
+        return df[_columns].reset_index(drop=True)
@@ -1,4 +1,4 @@
-from typing import Iterator
+from typing import Any, Callable, Iterator
 
 import numpy as np
 from peewee import JOIN
@@ -20,9 +20,9 @@ from vrtool.orm.models import (
     OptimizationType,
     StandardMeasure,
 )
-from vrtool.probabilistic_tools.probabilistic_functions import beta_to_pf, pf_to_beta
 
 from src.orm import models as orm
+from src.utils.reliability import beta_to_pf, pf_to_beta
 from src.utils.utils import CombinFunctions
 
 
@@ -151,6 +151,38 @@ def _get_final_measure_combined_betas(
     :param optimization_steps:
     :return:
     """
+    _steps_with_type = [
+        (
+            optimization_step,
+            _get_mesure_type_from_optimization_step(optimization_step).name,
+        )
+        for optimization_step in optimization_steps
+    ]
+
+    return _combine_final_measure_betas(
+        _steps_with_type,
+        lambda optimization_step, mechanism: np.array(
+            [row.beta for row in _get_mechanism_beta(optimization_step, mechanism)]
+        ),
+        active_mechanisms,
+    )
+
+
+def _combine_final_measure_betas(
+    steps_with_type: list[tuple[Any, str]],
+    get_mechanism_betas: Callable[[Any, str], np.ndarray],
+    active_mechanisms: list[str],
+) -> dict:
+    """
+    Combine the mechanism betas of the optimization steps of a Combinable+Partial measure set and compute the section
+    betas. The database access is delegated to `get_mechanism_betas` so that the same combination rules are applied
+    whether the betas are queried per step or read from a bulk import.
+
+    :param steps_with_type: list of tuples (step, measure type name) for each optimization step of the combined measure.
+    :param get_mechanism_betas: callable returning the array of betas of a step for a given mechanism name.
+    :param active_mechanisms: mechanisms for which the betas are combined.
+    :return: dictionary with the betas per mechanism and the key "Section".
+    """
     _final_measure = {}
     _dict_probabilities = {}
 
@@ -162,40 +194,32 @@ def _get_final_measure_combined_betas(
         diaphram_wall_step,
         stability_screen_step,
     ) = (None, None, None, None, None)
-    for optimization_step in optimization_steps:
-        _measure_type = _get_mesure_type_from_optimization_step(optimization_step)
-        if _measure_type.name in [
+    for optimization_step, _measure_type_name in steps_with_type:
+        if _measure_type_name in [
             "Soil reinforcement",
             "Soil reinforcement with stability screen",
         ]:
             soil_reinforcement_step = optimization_step
-        elif _measure_type.name in ["Vertical Geotextile"]:
+        elif _measure_type_name in ["Vertical Geotextile"]:
             vzg_step = optimization_step
-        elif _measure_type.name in ["Revetment"]:
+        elif _measure_type_name in ["Revetment"]:
             revetment_step = optimization_step
-        elif _measure_type.name in ["Diaphragm Wall"]:
+        elif _measure_type_name in ["Diaphragm Wall"]:
             diaphram_wall_step = optimization_step
-        elif _measure_type.name in ["Stability Screen"]:
+        elif _measure_type_name in ["Stability Screen"]:
             stability_screen_step = optimization_step
 
     # Assign the mechanism betas according to the right optimization step(s):
     for mechanism in active_mechanisms:
 
         if mechanism == "Stability Screen" and stability_screen_step is not None:
-            _betas = np.array(
-                [
-                    row.beta
-                    for row in _get_mechanism_beta(stability_screen_step, mechanism)
-                ]
-            )
+            _betas = get_mechanism_betas(stability_screen_step, mechanism)
             _final_measure[mechanism] = _betas
             _dict_probabilities[mechanism] = beta_to_pf(_betas)
             continue
 
         if diaphram_wall_step is not None and mechanism != "Revetment":
-            _betas = np.array(
-                [row.beta for row in _get_mechanism_beta(diaphram_wall_step, mechanism)]
-            )
+            _betas = get_mechanism_betas(diaphram_wall_step, mechanism)
             _final_measure[mechanism] = _betas
             _dict_probabilities[mechanism] = beta_to_pf(_betas)
             continue
@@ -206,17 +230,13 @@ def _get_final_measure_combined_betas(
             and vzg_step is None
             and soil_reinforcement_step is None
         ):
-            _betas = np.array(
-                [row.beta for row in _get_mechanism_beta(revetment_step, mechanism)]
-            )
+            _betas = get_mechanism_betas(revetment_step, mechanism)
             _final_measure[mechanism] = _betas
             _dict_probabilities[mechanism] = beta_to_pf(_betas)
             continue
 
         if mechanism == "Revetment" and revetment_step is not None:
-            _betas_revetment = np.array(
-                [row.beta for row in _get_mechanism_beta(revetment_step, mechanism)]
-            )
+            _betas_revetment = get_mechanism_betas(revetment_step, mechanism)
             _final_measure[mechanism] = _betas_revetment
             _dict_probabilities[mechanism] = beta_to_pf(_betas_revetment)
             continue  # don't need to go further
@@ -227,26 +247,16 @@ def _get_final_measure_combined_betas(
             and soil_reinforcement_step is not None
         ):
             # Previously the combination was performed here but has been shifted to VRCore
-            _betas = np.array(
-                [
-                    row.beta
-                    for row in _get_mechanism_beta(soil_reinforcement_step, mechanism)
-                ]
-            )
+            _betas = get_mechanism_betas(soil_reinforcement_step, mechanism)
             _final_measure[mechanism] = _betas
             _dict_probabilities[mechanism] = beta_to_pf(_betas)
             continue
 
         if vzg_step is not None and soil_reinforcement_step is not None:
-            _betas_soil_reinforcement = np.array(
-                [
-                    row.beta
-                    for row in _get_mechanism_beta(soil_reinforcement_step, mechanism)
-                ]
-            )
-            _betas_vzg = np.array(
-                [row.beta for row in _get_mechanism_beta(vzg_step, mechanism)]
+            _betas_soil_reinforcement = get_mechanism_betas(
+                soil_reinforcement_step, mechanism
             )
+            _betas_vzg = get_mechanism_betas(vzg_step, mechanism)
 
             _beta_combined_solutions = np.maximum(_betas_soil_reinforcement, _betas_vzg)
             _final_measure[mechanism] = _beta_combined_solutions
@@ -255,20 +265,13 @@ def _get_final_measure_combined_betas(
             continue
 
         if vzg_step is not None and soil_reinforcement_step is None:
-            _betas = np.array(
-                [row.beta for row in _get_mechanism_beta(vzg_step, mechanism)]
-            )
+            _betas = get_mechanism_betas(vzg_step, mechanism)
             _final_measure[mechanism] = _betas
             _dict_probabilities[mechanism] = beta_to_pf(_betas)
             continue
 
         if soil_reinforcement_step is not None and vzg_step is None:
-            _betas = np.array(
-                [
-                    row.beta
-                    for row in _get_mechanism_beta(soil_reinforcement_step, mechanism)
-                ]
-            )
+            _betas = get_mechanism_betas(soil_reinforcement_step, mechanism)
             _final_measure[mechanism] = _betas
             _dict_probabilities[mechanism] = beta_to_pf(_betas)
             continue
@@ -281,7 +284,7 @@ def _get_final_measure_combined_betas(
 
     # Add section betas as well: You need to redo product of betas here:
 
-    _final_measure["Section"] = [pf_to_beta(pf_section) for pf_section in section]
+    _final_measure["Section"] = list(pf_to_beta(section))
 
     return _final_measure
 
@@ -0,0 +1,299 @@
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+from peewee import fn
+from vrtool.orm.models import (
+    Measure,
+    MeasurePerSection,
+    MeasureResult,
+    MeasureResultParameter,
+    MeasureType,
+    Mechanism,
+    MechanismPerSection,
+    OptimizationSelectedMeasure,
+    OptimizationStep,
+    OptimizationStepResultMechanism,
+    OptimizationStepResultSection,
+    SectionData,
+)
+
+
+class SolutionRunBulkReader:
+    """
+    Read all the database rows required to import the solution of one OptimizationRun in a fixed number of joined
+    queries, independently of the number of optimization steps:
+
+        1. OptimizationStep ⋈ OptimizationSelectedMeasure ⋈ MeasureResult ⋈ MeasurePerSection ⋈ SectionData ⋈ Measure
+           ⋈ MeasureType
+        2. OptimizationStepResultMechanism ⋈ MechanismPerSection ⋈ Mechanism
+        3. OptimizationStepResultSection
+        4. first MeasureResult of each MeasurePerSection of the run (initial revetment measure)
+        5. MeasureResultParameter of both the selected and the initial measure results
+
+    The rows are kept as columnar pandas frames and indexed once, so that the steps can be processed in memory.
+    """
+
+    run_id: int
+    steps: pd.DataFrame
+    step_mechanism_betas: pd.DataFrame
+    step_section_results: pd.DataFrame
+    measure_result_parameters: pd.DataFrame
+
+    def __init__(self, run_id: int):
+        self.run_id = run_id
+        self.steps = self._read_steps()
+        self.step_mechanism_betas = self._read_step_mechanism_betas()
+        self.step_section_results = self._read_step_section_results()
+        self._initial_measure_result_ids = self._read_initial_measure_result_ids()
+        self.measure_result_parameters = self._read_measure_result_parameters()
+        self._build_indexes()
+
+    def _selected_measure_results_query(self):
+        return OptimizationSelectedMeasure.select(
+            OptimizationSelectedMeasure.measure_result_id
+        ).where(OptimizationSelectedMeasure.optimization_run_id == self.run_id)
+
+    def _read_steps(self) -> pd.DataFrame:
+        _query = (
+            OptimizationStep.select(
+                OptimizationStep.id,
+                OptimizationStep.step_number,
+                OptimizationStep.total_lcc,
+                OptimizationStep.total_risk,
+                OptimizationSelectedMeasure.investment_year,
+                OptimizationSelectedMeasure.measure_result_id,
+                MeasureResult.measure_per_section_id,
+                SectionData.section_name,
+                Measure.name,
+                MeasureType.name,
+            )
+            .join(
+                OptimizationSelectedMeasure,
+                on=(
+                    OptimizationStep.optimization_selected_measure_id
+                    == OptimizationSelectedMeasure.id
+                ),
+            )
+            .join(
+                MeasureResult,
+                on=(OptimizationSelectedMeasure.measure_result_id == MeasureResult.id),
+            )
+            .join(
+                MeasurePerSection,
+                on=(MeasureResult.measure_per_section_id == MeasurePerSection.id),
+            )
+            .join(SectionData, on=(MeasurePerSection.section_id == SectionData.id))
+            .join(Measure, on=(MeasurePerSection.measure_id == Measure.id))
+            .join(MeasureType, on=(Measure.measure_type_id == MeasureType.id))
+            .where(OptimizationSelectedMeasure.optimization_run_id == self.run_id)
+            .order_by(OptimizationStep.step_number, OptimizationStep.id)
+        )
+        return pd.DataFrame(
+            list(_query.tuples()),
+            columns=[
+                "optimization_step_id",
+                "step_number",
+                "total_lcc",
+                "total_risk",
+                "investment_year",
+                "measure_result_id",
+                "measure_per_section_id",
+                "section_name",
+                "measure_name",
+                "measure_type_name",
+            ],
+        )
+
+    def _read_step_mechanism_betas(self) -> pd.DataFrame:
+        _query = (
+            OptimizationStepResultMechanism.select(
+                OptimizationStepResultMechanism.optimization_step_id,
+                Mechanism.name,
+                OptimizationStepResultMechanism.time,
+                OptimizationStepResultMechanism.beta,
+            )
+            .join(
+                MechanismPerSection,
+                on=(
+                    OptimizationStepResultMechanism.mechanism_per_section_id
+                    == MechanismPerSection.id
+                ),
+            )
+            .join(Mechanism, on=(MechanismPerSection.mechanism_id == Mechanism.id))
+            .join(
+                OptimizationStep,
+                on=(
+                    OptimizationStepResultMechanism.optimization_step_id
+                    == OptimizationStep.id
+                ),
+            )
+            .join(
+                OptimizationSelectedMeasure,
+                on=(
+                    OptimizationStep.optimization_selected_measure_id
+                    == OptimizationSelectedMeasure.id
+                ),
+            )
+            .where(OptimizationSelectedMeasure.optimization_run_id == self.run_id)
+            .order_by(OptimizationStepResultMechanism.id)
+        )
+        return pd.DataFrame(
+            list(_query.tuples()),
+            columns=["optimization_step_id", "mechanism", "time", "beta"],
+        )
+
+    def _read_step_section_results(self) -> pd.DataFrame:
+        _query = (
+            OptimizationStepResultSection.select(
+                OptimizationStepResultSection.optimization_step_id,
+                OptimizationStepResultSection.time,
+                OptimizationStepResultSection.beta,
+                OptimizationStepResultSection.lcc,
+            )
+            .join(
+                OptimizationStep,
+                on=(
+                    OptimizationStepResultSection.optimization_step_id
+                    == OptimizationStep.id
+                ),
+            )
+            .join(
+                OptimizationSelectedMeasure,
+                on=(
+                    OptimizationStep.optimization_selected_measure_id
+                    == OptimizationSelectedMeasure.id
+                ),
+            )
+            .where(OptimizationSelectedMeasure.optimization_run_id == self.run_id)
+            .order_by(OptimizationStepResultSection.id)
+        )
+        return pd.DataFrame(
+            list(_query.tuples()),
+            columns=["optimization_step_id", "time", "beta", "lcc"],
+        )
+
+    def _initial_measure_results_query(self, *fields):
+        """First (lowest id) MeasureResult of every MeasurePerSection used in the run."""
+        _measure_per_sections = MeasureResult.select(
+            MeasureResult.measure_per_section_id
+        ).where(MeasureResult.id.in_(self._selected_measure_results_query()))
+        return (
+            MeasureResult.select(*fields, fn.MIN(MeasureResult.id))
+            .where(MeasureResult.measure_per_section_id.in_(_measure_per_sections))
+            .group_by(MeasureResult.measure_per_section_id)
+        )
+
+    def _read_initial_measure_result_ids(self) -> dict[int, int]:
+        _query = self._initial_measure_results_query(
+            MeasureResult.measure_per_section_id
+        )
+        return {
+            _measure_per_section_id: _measure_result_id
+            for _measure_per_section_id, _measure_result_id in _query.tuples()
+        }
+
+    def _read_measure_result_parameters(self) -> pd.DataFrame:
+        _query = (
+            MeasureResultParameter.select(
+                MeasureResultParameter.measure_result_id,
+                MeasureResultParameter.name,
+                MeasureResultParameter.value,
+            )
+            .where(
+                MeasureResultParameter.measure_result_id.in_(
+                    self._selected_measure_results_query()
+                )
+                | MeasureResultParameter.measure_result_id.in_(
+                    self._initial_measure_results_query()
+                )
+            )
+            .order_by(MeasureResultParameter.id)
+        )
+        return pd.DataFrame(
+            list(_query.tuples()), columns=["measure_result_id", "name", "value"]
+        )
+
+    def _build_indexes(self):
+        self._mechanism_betas = {
+            (int(_step_id), _mechanism): (
+                _group["time"].to_numpy(),
+                _group["beta"].to_numpy(dtype=float),
+            )
+            for (_step_id, _mechanism), _group in self.step_mechanism_betas.groupby(
+                ["optimization_step_id", "mechanism"], sort=False
+            )
+        }
+        self._section_betas = {
+            int(_step_id): (
+                _group["time"].to_numpy(),
+                _group["beta"].to_numpy(dtype=float),
+            )
+            for _step_id, _group in self.step_section_results.groupby(
+                "optimization_step_id", sort=False
+            )
+        }
+        self._section_lcc = {
+            int(_step_id): float(_lcc)
+            for _step_id, _lcc in self.step_section_results.groupby(
+                "optimization_step_id", sort=False
+            )["lcc"]
+            .first()
+            .items()
+        }
+        self._parameters = {}
+        for (
+            _measure_result_id,
+            _name,
+            _value,
+        ) in self.measure_result_parameters.itertuples(index=False):
+            self._parameters.setdefault(int(_measure_result_id), {}).setdefault(
+                _name, float(_value)
+            )
+
+    def iter_step_groups(self) -> Iterator[tuple[int, pd.DataFrame]]:
+        """Iterate over the optimization steps grouped by step number (combined measures share a step number)."""
+        for _step_number, _group in self.steps.groupby("step_number", sort=True):
+            yield int(_step_number), _group
+
+    def get_mechanism_betas(
+        self, optimization_step_id: int, mechanism: str
+    ) -> np.ndarray:
+        """Return all the betas of a mechanism for an optimization step, in database order."""
+        return self._mechanism_betas.get(
+            (optimization_step_id, mechanism), (np.array([]), np.array([]))
+        )[1]
+
+    def get_mechanism_betas_at(
+        self, optimization_step_id: int, mechanism: str, assessment_time: list[int]
+    ) -> list[float]:
+        """Return the betas of a mechanism for an optimization step, restricted to the assessment time."""
+        _times, _betas = self._mechanism_betas.get(
+            (optimization_step_id, mechanism), (np.array([]), np.array([]))
+        )
+        return _betas[np.isin(_times, assessment_time)].tolist()
+
+    def get_section_betas_at(
+        self, optimization_step_id: int, assessment_time: list[int]
+    ) -> list[float]:
+        """Return the section betas for an optimization step, restricted to the assessment time."""
+        _times, _betas = self._section_betas.get(
+            optimization_step_id, (np.array([]), np.array([]))
+        )
+        return _betas[np.isin(_times, assessment_time)].tolist()
+
+    def get_section_lcc(self, optimization_step_id: int) -> float:
+        """Return the (accumulated) lcc of the section for an optimization step."""
+        return self._section_lcc[optimization_step_id]
+
+    def get_measure_result_parameters(self, measure_result_id: int) -> dict[str, float]:
+        """Return the parameters {name: value} of a measure result, the first stored value wins."""
+        return self._parameters.get(measure_result_id, {})
+
+    def get_initial_measure_result_parameters(
+        self, measure_per_section_id: int
+    ) -> dict[str, float]:
+        """Return the parameters of the first measure result of a MeasurePerSection."""
+        return self.get_measure_result_parameters(
+            self._initial_measure_result_ids[measure_per_section_id]
+        )
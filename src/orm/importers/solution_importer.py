@@ -6,11 +6,7 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 from peewee import DoesNotExist
-from scipy.interpolate import interp1d
 from vrtool.common.enums import MechanismEnum
-from vrtool.orm.io.importers.optimization.optimization_step_importer import (
-    OptimizationStepImporter,
-)
 from vrtool.orm.io.importers.orm_importer_protocol import OrmImporterProtocol
 from vrtool.orm.models import (
     DikeTrajectInfo,
@@ -20,16 +16,17 @@ from vrtool.orm.models import (
     OptimizationStep,
     SectionData,
 )
-from vrtool.orm.orm_controllers import open_database
 
 from src.constants import REFERENCE_YEAR, GreedyOPtimizationCriteria
 from src.linear_objects.dike_section import DikeSection
-from src.linear_objects.dike_traject import (
-    DikeTraject,
-    get_initial_assessment_df,
-    get_traject_prob,
+from src.linear_objects.dike_traject import DikeTraject
+from src.orm.database_session import database_reader_session
+from src.orm.importers.greedy_trajectory import (
+    GreedyTrajectory,
+    get_modified_vr_order,
 )
 from src.orm.importers.importer_utils import (
+    _compose_measure_parameters,
     _get_combined_measure_investment_year,
     _get_combined_measure_name,
     _get_combined_measure_type,
@@ -39,18 +36,19 @@ from src.orm.importers.importer_utils import (
     _get_single_measure_type,
 )
 from src.orm.importers.optimization_step_importer import (
+    _combine_final_measure_betas,
     _get_final_measure_betas,
     _get_section_lcc,
 )
+from src.orm.importers.solution_bulk_reader import SolutionRunBulkReader
 from src.orm.orm_controller_custom import get_optimization_steps_ordered
 from src.utils.database_analytics import (
     assessment_for_each_step,
-    calculate_traject_probability,
-    calculate_traject_probability_for_steps,
     get_measures_per_step_number,
     get_minimal_tc_step,
     get_reliability_for_each_step,
 )
+from src.utils.traject_probability import TrajectProbabilityEngine
 from src.utils.utils import pf_to_beta
 from src.utils.vrutils import (
     get_measures_for_run_id,
@@ -70,6 +68,9 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
     final_step: int  # this is the step number of the last optimization step (either from the economic optimal or
     # the target beta/year, this needs to be returned to DikeTraject object)
     database_path: Optional[Path] = None
+    bulk_import: bool  # read the optimization runs in a fixed number of queries instead of querying step per step
+    # all the greedy steps, only set for a bulk import
+    greedy_trajectory: Optional[GreedyTrajectory] = None
 
     def __init__(
         self,
@@ -81,6 +82,7 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
         greedy_criteria_beta: Optional[float] = None,
         assessment_years: list[int] = None,
         database_path: Optional[Path] = None,
+        bulk_import: bool = True,
     ):
         self.dike_traject = dike_traject
         self.dike_section_mapping = {
@@ -94,6 +96,7 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
         self.greedy_criteria_beta = greedy_criteria_beta
         self.set_economic_optimal_final_step_id()
         self.database_path = database_path
+        self.bulk_import = bulk_import
 
     def import_orm(self):
         """Import the final measures for both Veiligheidsrendement and Doorsnede"""
@@ -101,6 +104,18 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
         # self.final_step = self.set_minimal_tc_step_number()
         self.lists_of_measures = self.get_lists_of_measures()
 
+        if self.bulk_import:
+            self.get_final_measure_dsn_bulk()
+            self.greedy_trajectory = self.get_greedy_trajectory()
+            self.greedy_trajectory.apply(
+                self.dike_traject,
+                self.greedy_optimization_criteria,
+                self.greedy_criteria_year,
+                self.greedy_criteria_beta,
+            )
+            self.final_step = self.dike_traject.final_step_number
+            return
+
         # Old
         self.get_final_measure_vr()
         self.get_final_measure_dsn()
@@ -125,13 +140,10 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
             return
 
         for _optimization_step in _optimization_steps:
-            _as_df = OptimizationStepImporter.import_optimization_step_results_df(
-                _optimization_step
-            )
             _cost = _optimization_step.total_lcc + _optimization_step.total_risk
-            _results.append((_optimization_step, _as_df, _cost))
+            _results.append((_optimization_step, _cost))
 
-        _step_id, _, _ = min(_results, key=lambda results_tuple: results_tuple[2])
+        _step_id, _ = min(_results, key=lambda results_tuple: results_tuple[1])
         self.__setattr__("economic_optimal_final_step_id", _step_id.id)
 
     def get_final_measure_dsn(self):
@@ -220,8 +232,10 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
 
         # 0. Initialize vars
         _previous_step_number = None
-        _beta_df = get_initial_assessment_df(list(self.dike_section_mapping.values()))
-        _traject_pf, _ = get_traject_prob(_beta_df)
+        _traject_engine = TrajectProbabilityEngine.from_sections(
+            list(self.dike_section_mapping.values())
+        )
+        _traject_pf, _ = _traject_engine.traject_probability()
         _greedy_steps_res = [{"pf": _traject_pf[0].tolist(), "LCC": 0}]
         _ordered_reinforced_sections = []
 
@@ -271,8 +285,7 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
             # 4. Calculate the traject probability of failure for the current step
             self._add_greedy_step(
                 dike_section,
-                _optimization_step,
-                _beta_df,
+                _traject_engine,
                 _greedy_steps_res,
                 _step_measure,
                 _recorded__previous_section_LCC,
@@ -284,7 +297,7 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
             )
 
             status_step = self.continue_next_step(
-                _optimization_step, _greedy_steps_res[-1]["pf"]
+                _optimization_step.id, _greedy_steps_res[-1]["pf"]
             )
             _previous_step_number = _step_number
             _recorded__previous_section_LCC[dike_section.name] = _step_measure["LCC"]
@@ -297,8 +310,117 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
         self.dike_traject.greedy_steps = _greedy_steps_res
         self.dike_traject.reinforcement_order_vr = _ordered_reinforced_sections
 
+    def get_final_measure_dsn_bulk(self):
+        """
+        Same as `get_final_measure_dsn` but all the database rows of the run are read at once with a
+        `SolutionRunBulkReader` instead of querying the database for every optimization step.
+        """
+        _reader = SolutionRunBulkReader(self.run_id_dsn)
+
+        _ordered_reinforced_sections = []
+        for _, _step_rows in _reader.iter_step_groups():
+            _first_step = _step_rows.iloc[0]
+
+            # find corresponding section in dike_section
+            dike_section: DikeSection = self.dike_section_mapping[
+                _first_step.section_name
+            ]
+
+            _step_measure = self._get_measure_bulk(
+                _reader,
+                _step_rows,
+                active_mechanisms=dike_section.active_mechanisms,
+                assessment_time=self.assessment_time,
+            )
+            _step_measure["LCC"] = dike_section.final_measure_doorsnede["LCC"] = (
+                _reader.get_section_lcc(int(_first_step.optimization_step_id))
+            )
+            dike_section.final_measure_doorsnede = _step_measure
+
+            if dike_section.name not in _ordered_reinforced_sections:
+                _ordered_reinforced_sections.append(dike_section.name)
+
+        self.dike_traject.reinforcement_order_dsn = _ordered_reinforced_sections
+
+    def get_greedy_trajectory(self) -> GreedyTrajectory:
+        """
+        Same as `get_final_measure_vr` but all the database rows of the run are read at once with a
+        `SolutionRunBulkReader`, and all the steps are processed regardless of the greedy stop criterion. The
+        DikeTraject is not modified, the returned trajectory must be applied to it for a given stop criterion.
+        """
+        _reader = SolutionRunBulkReader(self.run_id_vr)
+
+        # 0. Initialize vars
+        _traject_engine = TrajectProbabilityEngine.from_sections(
+            list(self.dike_section_mapping.values())
+        )
+        _traject_pf, _ = _traject_engine.traject_probability()
+        _greedy_steps_res = [{"pf": _traject_pf[0].tolist(), "LCC": 0}]
+        _step_numbers, _first_step_ids, _section_names, _step_measures = [], [], [], []
+
+        _recorded__previous_section_LCC = {}
+
+        # 1. Combined steps share the same step number and are processed together
+        for _step_number, _step_rows in _reader.iter_step_groups():
+            _first_step = _step_rows.iloc[0]
+            _first_step_id = int(_first_step.optimization_step_id)
+
+            # find corresponding section in dike_section
+            dike_section: DikeSection = self.dike_section_mapping[
+                _first_step.section_name
+            ]
+
+            # 2. Get all information into a dict based on the optimum optimization steps.
+            _step_measure = self._get_measure_bulk(
+                _reader,
+                _step_rows,
+                active_mechanisms=dike_section.active_mechanisms,
+                assessment_time=self.assessment_time,
+            )
+            _step_measure["LCC"] = _reader.get_section_lcc(_first_step_id)
+
+            # 3. Calculate the traject probability of failure for the current step
+            self._add_greedy_step(
+                dike_section,
+                _traject_engine,
+                _greedy_steps_res,
+                _step_measure,
+                _recorded__previous_section_LCC,
+            )
+
+            _step_numbers.append(_step_number)
+            _first_step_ids.append(_first_step_id)
+            _section_names.append(dike_section.name)
+            _step_measures.append(_step_measure)
+            _recorded__previous_section_LCC[dike_section.name] = _step_measure["LCC"]
+
+        _steps = _reader.steps
+        if len(_steps) > 0:
+            _total_cost = (_steps["total_lcc"] + _steps["total_risk"]).to_numpy()
+            _economic_optimal_final_step_id = int(
+                _steps["optimization_step_id"].iloc[int(np.argmin(_total_cost))]
+            )
+        else:
+            _economic_optimal_final_step_id = None
+
+        return GreedyTrajectory(
+            step_numbers=_step_numbers,
+            first_step_ids=_first_step_ids,
+            section_names=_section_names,
+            step_measures=_step_measures,
+            step_lcc=[_step["LCC"] for _step in _greedy_steps_res[1:]],
+            traject_pf=np.array([_step["pf"] for _step in _greedy_steps_res]),
+            assessment_time=self.assessment_time,
+            economic_optimal_final_step_id=_economic_optimal_final_step_id,
+            initial_measures={
+                name: copy.deepcopy(section.final_measure_veiligheidsrendement)
+                for name, section in self.dike_section_mapping.items()
+            },
+            **self.get_modified_vr_order_inputs(),
+        )
+
     def continue_next_step(
-        self, optimization_step: OptimizationStep, traject_pf: list[float]
+        self, optimization_step_id: int, traject_pf: list[float]
     ) -> bool:
         """
         This function determines whether the next OptimizationStep should be imported/processed or not.
@@ -307,7 +429,7 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
             - If criteria is determined for a tuple beta/year. the loop stops when the traject faalkans reaches the
             specified reliability beta for a specified year.
 
-        :param optimization_step: optimization step to be iterated from the osm table
+        :param optimization_step_id: id of the optimization step to be iterated from the osm table
         :param traject_pf: list of the traject faalkans for all years computed for the current optimization step
 
         :return: True if the next optimization step should be processed. False otherwise.
@@ -318,7 +440,7 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
             self.greedy_optimization_criteria
             == GreedyOPtimizationCriteria.ECONOMIC_OPTIMAL.name
         ):
-            if optimization_step.id + 1 > self.economic_optimal_final_step_id:
+            if optimization_step_id + 1 > self.economic_optimal_final_step_id:
                 return False
             return True
 
@@ -342,8 +464,7 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
     def _add_greedy_step(
         self,
         dike_section: DikeSection,
-        optimization_step: OptimizationStep,
-        _beta_df: pd.DataFrame,
+        traject_engine: TrajectProbabilityEngine,
         greedy_steps_res: list[dict],
         step_measure: dict,
         recorded__previous_section_LCC: dict[str, float],
@@ -352,30 +473,29 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
         Add the results of the step to the list greedy_steps_list
 
         :param dike_section:
-        :param optimization_step: optimization step to be iterated from the osm table
-        :param _beta_df: dataframe with beta of all mechanism and all sections. The dataframe is modified in place here!
+        :param traject_engine: engine with the beta of all mechanism and all sections. The engine is updated in place here!
         :param greedy_steps_res: result list to be appended. Element have the following structure:
         :param step_measure: current state of the measure dictionary. it contains the beta for the considered
-        mechanisms
+        mechanisms and the (accumulated) LCC of the section
         :param recorded__previous_section_LCC: dictionary that stores the previous LCC of the section. This is needed
         because the LCC stored in the database is the accumulated LCC for the measure of the section. To retrieve the
         incremental increase from the step, it is required to keep the LCC of the previous step of the same section.
         {"LCC": xxx, "pf": [X,Y,Z]}
 
         """
-        for mechanism in dike_section.active_mechanisms:
-            mask = (_beta_df["name"] == dike_section.name) & (
-                _beta_df["mechanism"] == mechanism
-            )
-
-            for year, beta in zip(dike_section.years, step_measure[mechanism]):
-                _beta_df.loc[mask, year] = beta
+        traject_engine.update_section(
+            dike_section.name,
+            {
+                mechanism: step_measure[mechanism][: len(dike_section.years)]
+                for mechanism in dike_section.active_mechanisms
+            },
+        )
 
         # Calculate traject faalkans
-        _reinforced_traject_pf, _ = get_traject_prob(_beta_df)
+        _reinforced_traject_pf, _ = traject_engine.traject_probability()
 
         # Get step LCC:
-        LCC = _get_section_lcc(optimization_step) - recorded__previous_section_LCC.get(
+        LCC = step_measure["LCC"] - recorded__previous_section_LCC.get(
             dike_section.name, 0
         )
         greedy_steps_res.append({"pf": _reinforced_traject_pf[0].tolist(), "LCC": LCC})
@@ -440,6 +560,69 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
         _final_measure.update(_get_measure_parameters(optimization_steps))
         return _final_measure
 
+    @staticmethod
+    def _get_measure_bulk(
+        reader: SolutionRunBulkReader,
+        step_rows: pd.DataFrame,
+        active_mechanisms: list,
+        assessment_time: list[int],
+    ) -> dict:
+        """
+        Same as `_get_measure` but the information is taken from the rows read by a `SolutionRunBulkReader`.
+
+        :param reader: bulk reader of the optimization run
+        :param step_rows: rows of `reader.steps` sharing the same step number
+        :return: dictionary with the followings keys: "name", "LCC", "Piping", "StabilityInner", "Overflow", "Revetment"
+        , "Section"
+        """
+        _step_ids = [int(_step_id) for _step_id in step_rows["optimization_step_id"]]
+        _measure_names = step_rows["measure_name"].tolist()
+        _measure_types = step_rows["measure_type_name"].tolist()
+        _investment_years = [int(_year) for _year in step_rows["investment_year"]]
+
+        if len(_step_ids) == 1:
+            _final_measure = {
+                mechanism: reader.get_mechanism_betas_at(
+                    _step_ids[0], mechanism, assessment_time
+                )
+                for mechanism in active_mechanisms
+            }
+            _final_measure["Section"] = reader.get_section_betas_at(
+                _step_ids[0], assessment_time
+            )
+            _final_measure["name"] = _measure_names[0]
+            _final_measure["investment_year"] = _investment_years
+            _final_measure["type"] = _measure_types
+
+        elif len(_step_ids) in [2, 3]:
+            _final_measure = _combine_final_measure_betas(
+                list(zip(_step_ids, _measure_types)),
+                reader.get_mechanism_betas,
+                active_mechanisms,
+            )
+            _final_measure["name"] = " + ".join(_measure_names)
+            _final_measure["investment_year"] = _investment_years
+            _final_measure["type"] = _measure_types
+
+        else:
+            raise ValueError(f"Unexpected number of optimum steps: {len(_step_ids)}")
+
+        _final_measure.update(
+            _compose_measure_parameters(
+                [
+                    reader.get_measure_result_parameters(int(_measure_result_id))
+                    for _measure_result_id in step_rows["measure_result_id"]
+                ],
+                [
+                    reader.get_initial_measure_result_parameters(
+                        int(_measure_per_section_id)
+                    )
+                    for _measure_per_section_id in step_rows["measure_per_section_id"]
+                ],
+            )
+        )
+        return _final_measure
+
     def get_import_db_attr(self, database_path: Path):
 
         pass
@@ -478,13 +661,12 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
         }
         return assess_res_dict
 
-    def get_modified_vr_order(self):
+    def get_modified_vr_order_inputs(self) -> dict:
         """
-        Modified script from Stephan to obtain the reinforcement order based on the index.
-        Returns:
+        Returns the inputs of `get_modified_vr_order` which do not depend on the greedy stop criterion.
 
+        :return: dict with keys "assessment_results", "stepwise_assessment" and "flood_damage"
         """
-
         measures_per_step = self.get_measures_per_steps()
         assessment_results = self.get_assessment_results()
         reliability_per_step = get_reliability_for_each_step(
@@ -493,18 +675,11 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
         stepwise_assessment = assessment_for_each_step(
             copy.deepcopy(assessment_results), reliability_per_step
         )
-        traject_prob = calculate_traject_probability_for_steps(stepwise_assessment)
 
-        # Get section ids for which a measure is taken.
-        section_ids = []
-        for section_id, section in enumerate(self.dike_traject.dike_sections, 1):
-            if section.final_measure_veiligheidsrendement["name"] != "Geen maatregel":
-                section_ids.append(section_id)
-
-        final_traject_probability_per_mechanism = traject_prob[self.final_step]
-        final_section_probability_per_mechanism = stepwise_assessment[self.final_step]
-
-        with open_database(self.database_path) as db:
+        with (
+            database_reader_session(self.database_path) as _database,
+            _database.atomic(),
+        ):
             damage = (
                 DikeTrajectInfo.select(DikeTrajectInfo.flood_damage)
                 .where(DikeTrajectInfo.id == 1)
@@ -512,87 +687,23 @@ class TrajectSolutionRunImporter(OrmImporterProtocol):
                 .flood_damage
             )
 
-        discount_rate = 0.03
-
-        def calculate_total_risk(traject_reliability, damage, discount_rate):
-            n_years = 100
-            damage_per_year = np.divide(
-                damage, np.power(1 + discount_rate, np.arange(0, n_years))
-            )
-            damage_per_year = damage_per_year.reshape(1, n_years)
-            total_non_failure_probability = np.ones([1, n_years])
-            traject_reliability_interp = {}
-            for key in traject_reliability.keys():
-                if len(traject_reliability[key]) == 0:
-                    continue
-                times, betas = zip(*traject_reliability[key].items())
-                time_beta_interpolation = interp1d(
-                    times, betas, kind="linear", fill_value="extrapolate"
-                )
-                traject_reliability_interp[key] = time_beta_interpolation(
-                    list(range(0, 100))
-                )
-                traject_reliability_interp[key] = np.array(
-                    traject_reliability_interp[key]
-                ).reshape(1, 100)
-            for key in traject_reliability_interp.keys():
-                total_non_failure_probability = np.multiply(
-                    total_non_failure_probability, 1 - traject_reliability_interp[key]
-                )
-            total_failure_probability = 1 - total_non_failure_probability
-            expected_risk_per_year = np.multiply(
-                damage_per_year, total_failure_probability
-            )
-            total_risk = np.sum(expected_risk_per_year)
-            return total_risk
-
-        total_risk = calculate_total_risk(
-            final_traject_probability_per_mechanism, damage, discount_rate
+        return dict(
+            assessment_results=assessment_results,
+            stepwise_assessment=stepwise_assessment,
+            flood_damage=damage,
         )
 
-        vr_index = {}
-        for section in section_ids:
-            final_section_probability_per_mechanism_temp = copy.deepcopy(
-                final_section_probability_per_mechanism
-            )
-
-            for mechanism in assessment_results.keys():
-                if (
-                    final_section_probability_per_mechanism_temp[mechanism] == {}
-                ):  # is traject has no revetment,
-                    continue
-
-                if (
-                    section
-                    in final_section_probability_per_mechanism_temp[mechanism].keys()
-                ):  # if not, this mean that the section has no assessment data for the mechanism (for example a section with no revetment)
-                    final_section_probability_per_mechanism_temp[mechanism][section][
-                        "beta"
-                    ] = assessment_results[mechanism][section]["beta"]
-
-            # recalculate final traject probability
-            final_traject_probability_per_mechanism_temp = (
-                calculate_traject_probability(
-                    final_section_probability_per_mechanism_temp
-                )
-            )
+    def get_modified_vr_order(self):
+        """
+        Modified script from Stephan to obtain the reinforcement order based on the index.
+        Returns:
 
-            # calculate_total_risk
-            risk_increased = calculate_total_risk(
-                final_traject_probability_per_mechanism_temp, damage, discount_rate
-            )
-            delta_risk = risk_increased - total_risk
-
-            if section in section_ids:
-                section_costs = self.dike_traject.dike_sections[
-                    section - 1
-                ].final_measure_veiligheidsrendement["LCC"]
-                vr_index[section] = delta_risk / section_costs
-            else:
-                vr_index[section] = 0
-
-        sorted_vr_index = dict(
-            sorted(vr_index.items(), key=lambda item: item[1], reverse=True)
+        """
+        _inputs = self.get_modified_vr_order_inputs()
+        self.dike_traject.reinforcement_modified_order_vr = get_modified_vr_order(
+            self.dike_traject,
+            self.final_step,
+            _inputs["assessment_results"],
+            _inputs["stepwise_assessment"],
+            _inputs["flood_damage"],
         )
-
-        self.dike_traject.reinforcement_modified_order_vr = sorted_vr_index
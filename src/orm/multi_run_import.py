@@ -0,0 +1,79 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Optional
+
+from src.orm.import_database import get_name_optimization_runs, get_run_optimization_ids
+from src.orm.traject_cache import get_cached_dike_traject_data
+from src.utils.utils import get_vr_config_from_dict
+
+BASE_RUN_NAME = "Basisberekening"  # default runs of the database, veiligheidsrendement run 1 and doorsnede run 2
+
+
+def import_run_data(vr_config_data: dict, run_name: str) -> dict:
+    """
+    Import the serialized DikeTraject of an optimization run, through the traject cache (see
+    `get_cached_dike_traject_data`), the database is only read when the run is not in the cache yet.
+
+    :param vr_config_data: content of the config.json file of the database
+    :param run_name: name of the optimization run, without the "Veiligheidsrendement" or "Doorsnede-eisen" suffix
+    :return: serialized DikeTraject, with the run name
+    """
+    _vr_config = get_vr_config_from_dict(vr_config_data)
+
+    if run_name == BASE_RUN_NAME:
+        _run_id_vr, _run_id_dsn = 1, 2
+    elif run_name in get_name_optimization_runs(_vr_config):
+        _run_id_vr, _run_id_dsn = get_run_optimization_ids(_vr_config, run_name)
+    else:
+        raise ValueError("Name of the Optimization run is not correct.")
+
+    _dike_traject_data = get_cached_dike_traject_data(
+        _vr_config, run_id_dsn=_run_id_dsn, run_is_vr=_run_id_vr
+    )
+    _dike_traject_data["run_name"] = run_name
+    return _dike_traject_data
+
+
+def import_runs(
+    run_selections: list[tuple[dict, str]],
+    max_workers: Optional[int] = None,
+    set_progress: Optional[Callable[[int, int], None]] = None,
+) -> dict[str, dict]:
+    """
+    Import several optimization runs, from the same or different databases, concurrently on a process pool. Every
+    worker reads the databases through its own read connection (see `database_reader_session`).
+
+    The workers are spawned rather than forked, so they do not inherit the open connections of the current process.
+
+    :param run_selections: list of tuples (content of the config.json file of the database, name of the run)
+    :param max_workers: number of worker processes, defaults to the number of CPUs. With 1 worker or a single run, the
+    runs are imported in the current process.
+    :param set_progress: optional function called with (number of imported runs, number of runs) after each run
+    :return: dict {"traject|run": serialized DikeTraject}, in the order of run_selections
+    """
+    _max_workers = min(max_workers or os.cpu_count() or 1, len(run_selections))
+    _runs_data: list[Optional[dict]] = [None] * len(run_selections)
+
+    if _max_workers <= 1:
+        for _index, (_vr_config_data, _run_name) in enumerate(run_selections):
+            _runs_data[_index] = import_run_data(_vr_config_data, _run_name)
+            if set_progress is not None:
+                set_progress(_index + 1, len(run_selections))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=_max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as _executor:
+            _futures = {
+                _executor.submit(import_run_data, _vr_config_data, _run_name): _index
+                for _index, (_vr_config_data, _run_name) in enumerate(run_selections)
+            }
+            for _nb_imported, _future in enumerate(as_completed(_futures), 1):
+                _runs_data[_futures[_future]] = _future.result()
+                if set_progress is not None:
+                    set_progress(_nb_imported, len(run_selections))
+
+    return {
+        f"{_run_data['name']}|{_run_data['run_name']}": _run_data
+        for _run_data in _runs_data
+    }
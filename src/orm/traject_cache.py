@@ -0,0 +1,195 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+import diskcache
+from vrtool.defaults.vrtool_config import VrtoolConfig
+
+from src.constants import GreedyOPtimizationCriteria
+from src.linear_objects.dike_traject import DikeTraject
+from src.orm.database_session import get_database_version
+from src.orm.import_database import (
+    clear_measure_result_ids_index,
+    get_dike_traject_and_greedy_trajectory_from_config_ORM,
+    get_step_numbers_per_section_from_config,
+)
+from src.orm.importers.greedy_trajectory import GreedyTrajectory
+
+TRAJECT_CACHE_DIRECTORY = Path("./cache/dike_traject")
+TRAJECT_CACHE_SIZE_LIMIT = 2**30  # 1 GB, least recently used trajects are evicted first
+
+_traject_cache: Optional[diskcache.Cache] = None
+
+
+def get_traject_cache() -> diskcache.Cache:
+    """Returns the on-disk cache of the imported DikeTraject objects, the cache is created on first use."""
+    global _traject_cache
+    if _traject_cache is None:
+        _traject_cache = diskcache.Cache(
+            str(TRAJECT_CACHE_DIRECTORY),
+            size_limit=TRAJECT_CACHE_SIZE_LIMIT,
+            eviction_policy="least-recently-used",
+            tag_index=True,
+        )
+    return _traject_cache
+
+
+def _get_database_path(vr_config: VrtoolConfig) -> Path:
+    return Path(vr_config.input_directory).joinpath(vr_config.input_database_name)
+
+
+def _get_database_tag(vr_config: VrtoolConfig) -> str:
+    """All the cached trajects of a database share the same tag, so they can be evicted at once."""
+    return str(_get_database_path(vr_config).resolve())
+
+
+def _get_database_state(vr_config: VrtoolConfig) -> dict:
+    """
+    The database path and version (see `get_database_version`): the cached content is stale as soon as one of them
+    changes.
+    """
+    return {
+        "database": _get_database_tag(vr_config),
+        "version": get_database_version(_get_database_path(vr_config)),
+    }
+
+
+def _hash_key_content(key_content: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(key_content, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def get_traject_cache_key(
+    vr_config: VrtoolConfig,
+    run_id_dsn: int,
+    run_is_vr: int,
+    greedy_optimization_criteria: str,
+    greedy_criteria_year: Optional[int],
+    greedy_criteria_beta: Optional[float],
+) -> str:
+    """
+    Returns the key of an imported DikeTraject in the cache. The key changes as soon as the database or its write-ahead
+    log is written (modification time and size), or when any of the import arguments changes.
+
+    :return: sha256 hex digest of the import arguments
+    """
+    _key_content = {
+        **_get_database_state(vr_config),
+        "traject": vr_config.traject,
+        "T": list(vr_config.T),
+        "excluded_mechanisms": sorted(
+            getattr(mechanism, "name", str(mechanism))
+            for mechanism in vr_config.excluded_mechanisms
+        ),
+        "run_id_dsn": run_id_dsn,
+        "run_id_vr": run_is_vr,
+        "greedy_optimization_criteria": greedy_optimization_criteria,
+        "greedy_criteria_year": greedy_criteria_year,
+        "greedy_criteria_beta": greedy_criteria_beta,
+    }
+    return _hash_key_content(_key_content)
+
+
+def get_cached_greedy_solution(
+    vr_config: VrtoolConfig, run_id_dsn: int, run_is_vr: int
+) -> tuple[dict, GreedyTrajectory]:
+    """
+    Returns the serialized DikeTraject of the runs together with the full greedy trajectory of the veiligheidsrendement
+    run. Both do not depend on the greedy stop criterion and are only imported from the database when they are not
+    in the cache yet.
+
+    :return: tuple with the serialized DikeTraject and the GreedyTrajectory
+    """
+    _cache = get_traject_cache()
+    _key = get_traject_cache_key(vr_config, run_id_dsn, run_is_vr, None, None, None)
+    _greedy_solution = _cache.get(_key)
+    if _greedy_solution is None:
+        _dike_traject, _greedy_trajectory = (
+            get_dike_traject_and_greedy_trajectory_from_config_ORM(
+                vr_config, run_id_dsn=run_id_dsn, run_is_vr=run_is_vr
+            )
+        )
+        _greedy_solution = (_dike_traject.serialize(), _greedy_trajectory)
+        _cache.set(_key, _greedy_solution, tag=_get_database_tag(vr_config))
+    return _greedy_solution
+
+
+def get_cached_dike_traject_data(
+    vr_config: VrtoolConfig,
+    run_id_dsn: int,
+    run_is_vr: int,
+    greedy_optimization_criteria: str = GreedyOPtimizationCriteria.ECONOMIC_OPTIMAL.name,
+    greedy_criteria_year: Optional[int] = None,
+    greedy_criteria_beta: Optional[float] = None,
+) -> dict:
+    """
+    Returns the serialized DikeTraject (see `DikeTraject.serialize`) for the provided runs and greedy criteria. The
+    traject is obtained by applying the greedy criteria to the cached greedy solution of the runs (see
+    `get_cached_greedy_solution`), the database is only read when the runs are not in the cache yet.
+
+    :param vr_config: VrtoolConfig object
+    :param run_id_dsn: run id in the database for which the doorsnede eisen optimization results must be imported.
+    :param run_is_vr: run id in the database for which the veiligheidsrendement optimization results must be
+        imported
+
+    :return: serialized DikeTraject, the returned dict can be modified by the caller.
+    """
+    _cache = get_traject_cache()
+    _key = get_traject_cache_key(
+        vr_config,
+        run_id_dsn,
+        run_is_vr,
+        greedy_optimization_criteria,
+        greedy_criteria_year,
+        greedy_criteria_beta,
+    )
+    _dike_traject_data = _cache.get(_key)
+    if _dike_traject_data is None:
+        _base_data, _greedy_trajectory = get_cached_greedy_solution(
+            vr_config, run_id_dsn, run_is_vr
+        )
+        _dike_traject = DikeTraject.deserialize(_base_data)
+        _greedy_trajectory.apply(
+            _dike_traject,
+            greedy_optimization_criteria,
+            greedy_criteria_year,
+            greedy_criteria_beta,
+        )
+        _dike_traject_data = _dike_traject.serialize()
+        _cache.set(_key, _dike_traject_data, tag=_get_database_tag(vr_config))
+    return _dike_traject_data
+
+
+def get_cached_step_numbers_per_section(
+    vr_config: VrtoolConfig, run_id: int
+) -> dict[str, list[int]]:
+    """
+    Returns the step numbers of an optimization run grouped by dike section. The index is built once per run and
+    database state, so that the measures of a section can be imported without walking all the steps of the run.
+
+    :param vr_config: VrtoolConfig object
+    :param run_id: id of the optimization run
+    :return: dict {section name: sorted step numbers}
+    """
+    _cache = get_traject_cache()
+    _key = _hash_key_content(
+        {**_get_database_state(vr_config), "step_index_run_id": run_id}
+    )
+    _step_numbers_per_section = _cache.get(_key)
+    if _step_numbers_per_section is None:
+        _step_numbers_per_section = get_step_numbers_per_section_from_config(
+            vr_config, run_id
+        )
+        _cache.set(_key, _step_numbers_per_section, tag=_get_database_tag(vr_config))
+    return _step_numbers_per_section
+
+
+def invalidate_traject_cache(vr_config: VrtoolConfig):
+    """
+    Evict all the cached trajects of the database of the config, and clear the in-process index of its measure results
+    (see `get_measure_result_ids_index`). To be called after writing to the database.
+    """
+    get_traject_cache().evict(_get_database_tag(vr_config))
+    clear_measure_result_ids_index()
@@ -0,0 +1,68 @@
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from plotly.graph_objs import Figure
+
+from src.constants import REFERENCE_YEAR
+from src.linear_objects.dike_traject import DikeTraject
+from src.utils.traject_store import get_traject_token
+
+MAP_FIGURE_CACHE_SIZE = 256  # number of serialized map figures kept in memory
+
+_map_figures: OrderedDict[tuple, dict] = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_year_indices(dike_traject: DikeTraject, selected_year: float) -> tuple:
+    """
+    Returns the index of the selected year in the assessment years of the sections, as used by the maps
+    (`bisect_right(section.years, selected_year - REFERENCE_YEAR) - 1`). All the years of the slider between two
+    assessment years give the same indices, and therefore the same map.
+
+    :param dike_traject: DikeTraject displayed on the map
+    :param selected_year: year selected with the slider
+    :return: tuple with one year index per distinct list of assessment years of the sections
+    """
+    _distinct_years = dict.fromkeys(
+        tuple(section.years) for section in dike_traject.dike_sections
+    )
+    return tuple(
+        bisect_right(_years, selected_year - REFERENCE_YEAR) - 1
+        for _years in _distinct_years
+    )
+
+
+def get_cached_map_figure(
+    stored_data: dict, figure_key: tuple[Hashable, ...], plot: Callable[[], Figure]
+) -> dict:
+    """
+    Returns the serialized map figure of the traject of "stored-data" for the provided figure key, the figure is only
+    plotted the first time. The key must contain all the selections the figure depends on, e.g. the year indices (see
+    `get_year_indices`), result type, mechanism, calculation type and sub result type.
+
+    Trajects without a token (full serialized traject in "stored-data") are not cached.
+
+    :param stored_data: content of "stored-data"
+    :param figure_key: selections of the figure
+    :param plot: function plotting the figure
+    :return: figure as dict, must not be modified
+    """
+    _token = get_traject_token(stored_data)
+    if _token is None:
+        return plot().to_dict()
+
+    _key = (_token, *figure_key)
+    with _lock:
+        if _key in _map_figures:
+            _map_figures.move_to_end(_key)
+            return _map_figures[_key]
+
+    _figure = plot().to_dict()
+
+    with _lock:
+        _map_figures[_key] = _figure
+        while len(_map_figures) > MAP_FIGURE_CACHE_SIZE:
+            _map_figures.popitem(last=False)
+    return _figure
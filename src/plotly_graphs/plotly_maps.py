@@ -1,5 +1,5 @@
 from bisect import bisect_right
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 import numpy as np
 import plotly.colors
@@ -49,6 +49,7 @@ def plot_overview_map(dike_traject: DikeTraject) -> go.Figure:
     :return:
     """
     fig = go.Figure()
+    _section_traces = SectionTraceBatch()
 
     for index, section in enumerate(dike_traject.dike_sections):
 
@@ -63,13 +64,13 @@ def plot_overview_map(dike_traject: DikeTraject) -> go.Figure:
         else:
             _color = "rgb(253, 216, 53)" if index % 2 == 0 else "rgb(0, 172, 193)"
 
-        add_section_trace(
-            fig,
+        _section_traces.add_section(
             section,
             name=dike_traject.name,
             color=_color,
             hovertemplate=_hovertemplate,
         )
+    _section_traces.add_to_figure(fig)
 
     # Update layout of the figure and add token for mapbox
     _middle_point = get_middle_point(dike_traject.dike_sections)
@@ -95,81 +96,29 @@ def plot_dike_traject_reliability_initial_assessment_map(
     :return:
     """
     fig = go.Figure()
+    _section_traces = SectionTraceBatch()
 
     for section in dike_traject.dike_sections:
-        _coordinates_wgs = [
-            GWSRDConvertor().to_wgs(pt[0], pt[1]) for pt in section.coordinates_rd
-        ]  # convert in GWS coordinates:
-
         # if a section is not in analyse, skip it, and it turns blank on the map.
         if not section.in_analyse:
             continue
 
-        _initial_results = section.initial_assessment
-
-        if _initial_results is not None:
-            # TODO: Refactor this when moving to database format and handling mechanism types
-            if mechanism_type == Mechanism.REVETMENT.name and not section.revetment:
-                _color = "grey"
-                _hovertemplate = (
-                    f"Vaknaam {section.name}<br>"
-                    f"Beta: NO DATA<br>" + "<extra></extra>"
-                )
-            else:
-                if not _initial_results["Revetment"]:
-                    raise ValueError(
-                        "Geen bekleding gegevens voor beoordeling, please check Database"
-                    )
-                _year_index = (
-                    bisect_right(section.years, selected_year - REFERENCE_YEAR) - 1
-                )
-                _beta = get_beta(_initial_results, _year_index, mechanism_type)
-                _beta_dict = {
-                    meca: beta[_year_index]
-                    for meca, beta in _initial_results.items()
-                    if meca != "Section" and len(beta) > 0
-                }
-                _color = get_reliability_color(_beta, dike_traject.lower_bound_value)
-
-                if result_type == ResultType.RELIABILITY.name:
-                    _hover_res = f"Beta sectie: {_beta:.2e}<br>"
-                elif result_type == ResultType.PROBABILITY.name:
-                    _hover_res = f"Pf sectie: {beta_to_pf(_beta):.2e}<br>"
-                elif result_type == ResultType.INTERPRETATION_CLASS.name:
-                    _color, _class = get_color_class_WBI(_beta)
-                    _hover_res = f"WBI klass: {_class}<br>"
-                    # _color = get_interpretation_class_color(_beta, dike_traject.signalering_value,
-                    #                                         dike_traject.lower_bound_value)
-                else:
-                    raise ValueError("Unrecognized result type")
-
-                _hovertemplate = (
-                    f"Vaknaam {section.name}<br>" + _hover_res + "<extra></extra>"
-                )
-
-                if mechanism_type == Mechanism.SECTION.name:
-                    _mechanism = min(
-                        _beta_dict, key=_beta_dict.get
-                    )  # mechanism with lowest beta
-                    _hovertemplate = (
-                        _hovertemplate[:-15]
-                        + f"Laagste beta: {_mechanism}<br>"
-                        + "<extra></extra>"
-                    )  # :-15 to remove <extra></extra> from string
-
-        else:
-            _color = "grey"
-            _hovertemplate = (
-                f"Vaknaam {section.name}<br>" f"Beta: NO DATA<br>" + "<extra></extra>"
-            )
+        _year_index = bisect_right(section.years, selected_year - REFERENCE_YEAR) - 1
+        _color, _hovertemplate = get_initial_assessment_color_hover(
+            section,
+            _year_index,
+            result_type,
+            mechanism_type,
+            dike_traject.lower_bound_value,
+        )
 
-        add_section_trace(
-            fig,
+        _section_traces.add_section(
             section,
             name=dike_traject.name,
             color=_color,
             hovertemplate=_hovertemplate,
         )
+    _section_traces.add_to_figure(fig)
     add_colorscale_bar(
         fig,
         result_type,
@@ -186,6 +135,89 @@ def plot_dike_traject_reliability_initial_assessment_map(
     return fig
 
 
+def get_initial_assessment_color_hover(
+    section: DikeSection,
+    year_index: int,
+    result_type: str,
+    mechanism_type: str,
+    lower_bound_value: float,
+    beta_center: Optional[float] = None,
+    pf_per_year: Optional[np.ndarray] = None,
+) -> tuple[str, str]:
+    """
+    Return the color and hovertemplate of a section on the map of the initial assessment.
+
+    :param section: DikeSection in the analysis
+    :param year_index: index of the displayed year in section.years
+    :param result_type: one of "Reliability" or "Probability" or "InterpretationClass"
+    :param mechanism_type: one of "PIPING", "STABILITY", "OVERFLOW", "REVETMENT" or "SECTION"
+    :param lower_bound_value: ondergrens of the traject, center of the color scale
+    :param beta_center: beta of lower_bound_value, computed when not given
+    :param pf_per_year: pf of the displayed beta per year index (see `get_pf_per_year`), computed when not given
+    :return: tuple (color, hovertemplate)
+    """
+    _initial_results = section.initial_assessment
+
+    if _initial_results is not None:
+        # TODO: Refactor this when moving to database format and handling mechanism types
+        if mechanism_type == Mechanism.REVETMENT.name and not section.revetment:
+            _color = "grey"
+            _hovertemplate = (
+                f"Vaknaam {section.name}<br>" f"Beta: NO DATA<br>" + "<extra></extra>"
+            )
+        else:
+            if not _initial_results["Revetment"]:
+                raise ValueError(
+                    "Geen bekleding gegevens voor beoordeling, please check Database"
+                )
+            _beta = get_beta(_initial_results, year_index, mechanism_type)
+            _beta_dict = {
+                meca: beta[year_index]
+                for meca, beta in _initial_results.items()
+                if meca != "Section" and len(beta) > 0
+            }
+            _color = get_reliability_color(_beta, lower_bound_value, beta_center)
+
+            if result_type == ResultType.RELIABILITY.name:
+                _hover_res = f"Beta sectie: {_beta:.2e}<br>"
+            elif result_type == ResultType.PROBABILITY.name:
+                _pf = (
+                    beta_to_pf(_beta)
+                    if pf_per_year is None
+                    else pf_per_year[year_index]
+                )
+                _hover_res = f"Pf sectie: {_pf:.2e}<br>"
+            elif result_type == ResultType.INTERPRETATION_CLASS.name:
+                _color, _class = get_color_class_WBI(_beta)
+                _hover_res = f"WBI klass: {_class}<br>"
+                # _color = get_interpretation_class_color(_beta, dike_traject.signalering_value,
+                #                                         lower_bound_value)
+            else:
+                raise ValueError("Unrecognized result type")
+
+            _hovertemplate = (
+                f"Vaknaam {section.name}<br>" + _hover_res + "<extra></extra>"
+            )
+
+            if mechanism_type == Mechanism.SECTION.name:
+                _mechanism = min(
+                    _beta_dict, key=_beta_dict.get
+                )  # mechanism with lowest beta
+                _hovertemplate = (
+                    _hovertemplate[:-15]
+                    + f"Laagste beta: {_mechanism}<br>"
+                    + "<extra></extra>"
+                )  # :-15 to remove <extra></extra> from string
+
+    else:
+        _color = "grey"
+        _hovertemplate = (
+            f"Vaknaam {section.name}<br>" f"Beta: NO DATA<br>" + "<extra></extra>"
+        )
+
+    return _color, _hovertemplate
+
+
 def plot_dike_traject_reliability_measures_assessment_map(
     dike_traject: DikeTraject,
     selected_year: float,
@@ -216,139 +248,340 @@ def plot_dike_traject_reliability_measures_assessment_map(
             dike_traject, sub_result_type, calc_type, selected_year
         )
 
+    _section_traces = SectionTraceBatch()
     for section in dike_traject.dike_sections:
 
         # if a section is not in analyse, skip it, and it turns blank on the map.
         if not section.in_analyse:
             continue
 
-        _initial_results = section.initial_assessment
+        _year_index = bisect_right(section.years, selected_year - REFERENCE_YEAR) - 1
+        _color, _hovertemplate = get_measures_assessment_color_hover(
+            section,
+            _year_index,
+            result_type,
+            calc_type,
+            colorbar_result_type,
+            mechanism_type,
+            sub_result_type,
+            dike_traject.lower_bound_value,
+        )
 
-        _measure_results = (
-            section.final_measure_veiligheidsrendement
-            if calc_type == CalcType.VEILIGHEIDSRENDEMENT.name
-            else section.final_measure_doorsnede
+        _section_traces.add_section(
+            section,
+            name=dike_traject.name,
+            color=_color,
+            hovertemplate=_hovertemplate,
         )
+    _section_traces.add_to_figure(fig)
 
-        if _measure_results is not None:
+    add_colorscale_bar(
+        fig,
+        result_type,
+        colorbar_result_type,
+        sub_result_type,
+        dike_traject.lower_bound_value,
+    )
+
+    # Update layout of the figure and add token for mapbox
+    _middle_point = get_middle_point(dike_traject.dike_sections)
+    update_layout_map_box(fig, _middle_point)
+
+    return fig
+
+
+def get_measures_assessment_color_hover(
+    section: DikeSection,
+    year_index: int,
+    result_type: str,
+    calc_type: str,
+    colorbar_result_type: str,
+    mechanism_type: str,
+    sub_result_type: str,
+    lower_bound_value: float,
+    beta_center: Optional[float] = None,
+    pf_per_year: Optional[dict[str, Optional[np.ndarray]]] = None,
+) -> tuple[str, str]:
+    """
+    Return the color and hovertemplate of a section on the map of the reliability or cost after measures.
+
+    :param section: DikeSection in the analysis
+    :param year_index: index of the displayed year in section.years
+    :param result_type: one of "RELIABILITY" or "PROBABILITY"
+    :param calc_type: one of "VEILIGHEIDSRENDEMENT" or "DOORSNEDE"
+    :param colorbar_result_type: one of "RELIABILITY" or "COST"
+    :param mechanism_type: one of "PIPING", "STABILITY", "OVERFLOW", "REVETMENT" or "SECTION"
+    :param sub_result_type: one of "ABSOLUTE" or "DIFFERENCE" or "RATIO"
+    :param lower_bound_value: ondergrens of the traject, center of the color scale
+    :param beta_center: beta of lower_bound_value, computed when not given
+    :param pf_per_year: per calc type, pf of the displayed beta per year index (see `get_pf_per_year`), computed
+        when not given
+    :return: tuple (color, hovertemplate)
+    """
+    _measure_results = (
+        section.final_measure_veiligheidsrendement
+        if calc_type == CalcType.VEILIGHEIDSRENDEMENT.name
+        else section.final_measure_doorsnede
+    )
+
+    if _measure_results is not None:
+
+        # TODO: Refactor this when moving to database format and handling mechanism types
+        if mechanism_type == Mechanism.REVETMENT.name and not section.revetment:
+            _color = "grey"
+            _hovertemplate = (
+                f"Vaknaam {section.name}<br>" f"Beta: NO DATA<br>" + "<extra></extra>"
+            )
+        else:
+            if not _measure_results["Revetment"]:
+                raise ValueError(
+                    "Geen bekleding gegevens voor versterkingsmaatregelen, please check Database"
+                )
+
+            _beta_section = get_beta(_measure_results, year_index, mechanism_type)
+            _pf_section = (
+                None if pf_per_year is None else pf_per_year[calc_type][year_index]
+            )
+            if _beta_section is None:
+                _color, _hovertemplate = get_no_data_info(section)
+
+            elif (
+                colorbar_result_type == ColorBarResultType.RELIABILITY.name
+                and sub_result_type == SubResultType.ABSOLUTE.name
+                and result_type != ResultType.INTERPRETATION_CLASS.name
+            ):
+                _color, _hovertemplate = get_color_hover_absolute_reliability(
+                    section,
+                    _beta_section,
+                    _measure_results,
+                    lower_bound_value,
+                    beta_center,
+                    _pf_section,
+                )
+
+            elif (
+                colorbar_result_type == ColorBarResultType.RELIABILITY.name
+                and sub_result_type == SubResultType.RATIO.name
+            ):
+                _color, _hovertemplate = get_color_hover_prob_ratio(
+                    section, year_index, mechanism_type, pf_per_year
+                )
 
-            # TODO: Refactor this when moving to database format and handling mechanism types
-            if mechanism_type == Mechanism.REVETMENT.name and not section.revetment:
-                _color = "grey"
+            elif (
+                colorbar_result_type == ColorBarResultType.COST.name
+                and sub_result_type == SubResultType.ABSOLUTE.name
+            ):
+                _color, _hovertemplate = get_color_hover_absolute_cost(
+                    section, _beta_section, _measure_results, _pf_section
+                )
+
+            elif (
+                colorbar_result_type == ColorBarResultType.COST.name
+                and sub_result_type == SubResultType.DIFFERENCE.name
+            ):
+                _color, _hovertemplate = get_color_hover_difference_cost(section)
+
+            elif (
+                colorbar_result_type == ColorBarResultType.RELIABILITY.name
+                and result_type == ResultType.INTERPRETATION_CLASS.name
+                and sub_result_type == SubResultType.ABSOLUTE.name
+            ):
+                _color, _class = get_color_class_WBI(_beta_section)
                 _hovertemplate = (
                     f"Vaknaam {section.name}<br>"
-                    f"Beta: NO DATA<br>" + "<extra></extra>"
+                    f"WBI klasse: {_class}<br>" + "<extra></extra>"
                 )
+
             else:
-                if not _measure_results["Revetment"]:
-                    raise ValueError(
-                        "Geen bekleding gegevens voor versterkingsmaatregelen, please check Database"
-                    )
+                raise ValueError(
+                    "Wrong combination of settings? or not implemented yet"
+                )
 
-                _year_index = (
-                    bisect_right(section.years, selected_year - REFERENCE_YEAR) - 1
+            if (
+                mechanism_type == Mechanism.SECTION.name
+                and sub_result_type == SubResultType.ABSOLUTE.name
+            ):
+                _beta_dict = {
+                    key: value[year_index]
+                    for key, value in _measure_results.items()
+                    if key in ["StabilityInner", "Piping", "Overflow", "Revetment"]
+                    and len(value) > 0
+                }
+                _mechanism = min(
+                    _beta_dict, key=_beta_dict.get
+                )  # mechanism with lowest beta
+                _hovertemplate = (
+                    _hovertemplate[:-15]
+                    + f"Laagste beta: {_mechanism}<br>"
+                    + "<extra></extra>"
                 )
-                _beta_section = get_beta(_measure_results, _year_index, mechanism_type)
-                if _beta_section is None:
-                    _color, _hovertemplate = get_no_data_info(section)
-
-                elif (
-                    colorbar_result_type == ColorBarResultType.RELIABILITY.name
-                    and sub_result_type == SubResultType.ABSOLUTE.name
-                    and result_type != ResultType.INTERPRETATION_CLASS.name
-                ):
-                    _color, _hovertemplate = get_color_hover_absolute_reliability(
-                        section,
-                        _beta_section,
-                        _measure_results,
-                        dike_traject.lower_bound_value,
-                    )
 
-                elif (
-                    colorbar_result_type == ColorBarResultType.RELIABILITY.name
-                    and sub_result_type == SubResultType.RATIO.name
-                ):
-                    _color, _hovertemplate = get_color_hover_prob_ratio(
-                        section, _year_index, mechanism_type
-                    )
+    # If no results are available for the dijkvak, return blank data.
+    else:
+        _color = "grey"
+        _hovertemplate = (
+            f"Vaknaam {section.name}<br>" f"Beta: NO DATA<br>" + "<extra></extra>"
+        )
 
-                elif (
-                    colorbar_result_type == ColorBarResultType.COST.name
-                    and sub_result_type == SubResultType.ABSOLUTE.name
-                ):
-                    _color, _hovertemplate = get_color_hover_absolute_cost(
-                        section, _beta_section, _measure_results
-                    )
+    return _color, _hovertemplate
 
-                elif (
-                    colorbar_result_type == ColorBarResultType.COST.name
-                    and sub_result_type == SubResultType.DIFFERENCE.name
-                ):
-                    _color, _hovertemplate = get_color_hover_difference_cost(section)
-
-                elif (
-                    colorbar_result_type == ColorBarResultType.RELIABILITY.name
-                    and result_type == ResultType.INTERPRETATION_CLASS.name
-                    and sub_result_type == SubResultType.ABSOLUTE.name
-                ):
-                    _color, _class = get_color_class_WBI(_beta_section)
-                    _hovertemplate = (
-                        f"Vaknaam {section.name}<br>"
-                        f"WBI klasse: {_class}<br>" + "<extra></extra>"
-                    )
 
-                else:
-                    raise ValueError(
-                        "Wrong combination of settings? or not implemented yet"
-                    )
+def get_section_map_frames(
+    dike_traject: DikeTraject,
+    get_color_hover: Callable[[DikeSection, int], tuple[str, str]],
+) -> dict:
+    """
+    Return the geometry of the sections in the analysis together with their color and hovertemplate for every
+    assessment year. This is the input of the clientside recoloring of a map when the year slider moves (see
+    assets/clientside_maps.js), the geometry is sent to the browser once and no figure is rebuilt server-side.
+
+    :param dike_traject: DikeTraject displayed on the map
+    :param get_color_hover: function returning (color, hovertemplate) of a section for a year index
+    :return: dict with the traject name and, per section, the WGS84 coordinates, the assessment years (absolute) and
+        the colors and hovertemplates per year index.
+    """
+    _sections = []
+    for section in dike_traject.dike_sections:
+        if not section.in_analyse:
+            continue
 
-                if (
-                    mechanism_type == Mechanism.SECTION.name
-                    and sub_result_type == SubResultType.ABSOLUTE.name
-                ):
-                    _beta_dict = {
-                        key: value[_year_index]
-                        for key, value in _measure_results.items()
-                        if key in ["StabilityInner", "Piping", "Overflow", "Revetment"]
-                        and len(value) > 0
-                    }
-                    _mechanism = min(
-                        _beta_dict, key=_beta_dict.get
-                    )  # mechanism with lowest beta
-                    _hovertemplate = (
-                        _hovertemplate[:-15]
-                        + f"Laagste beta: {_mechanism}<br>"
-                        + "<extra></extra>"
-                    )
+        # a section without assessment years is displayed with the year index -1, as in the maps
+        _year_indices = range(len(section.years)) if len(section.years) > 0 else [-1]
+        _colors, _hovertemplates = zip(
+            *[get_color_hover(section, _year_index) for _year_index in _year_indices]
+        )
+        _coordinates_wgs = section.coordinates_wgs84
+        _sections.append(
+            {
+                "lat": _coordinates_wgs[:, 0].tolist(),
+                "lon": _coordinates_wgs[:, 1].tolist(),
+                "years": [REFERENCE_YEAR + _year for _year in section.years],
+                "colors": list(_colors),
+                "hovertemplates": list(_hovertemplates),
+            }
+        )
+    return {"name": dike_traject.name, "sections": _sections}
 
-        # If no results are available for the dijkvak, return blank data.
-        else:
-            _color = "grey"
-            _hovertemplate = (
-                f"Vaknaam {section.name}<br>" f"Beta: NO DATA<br>" + "<extra></extra>"
-            )
 
-        add_section_trace(
-            fig,
-            section,
-            name=dike_traject.name,
-            color=_color,
-            hovertemplate=_hovertemplate,
+def get_pf_per_year(
+    results_per_section: list[Optional[dict]], mechanism_type: str
+) -> list[Optional[np.ndarray]]:
+    """
+    Return the probability of failure of a mechanism for all the years of every section. The betas of all the
+    sections are converted in one call, instead of one call per section and year when the frames are built.
+
+    :param results_per_section: per section, the dict of results with the betas per year (e.g.
+        section.initial_assessment) or None
+    :param mechanism_type: one of "PIPING", "STABILITY", "OVERFLOW", "REVETMENT" or "SECTION"
+    :return: per section, array of pf per year index (NaN for a missing beta), None for a section without results
+        for the mechanism
+    """
+    _betas_per_section = []
+    for _results in results_per_section:
+        try:
+            _betas = (
+                None
+                if _results is None
+                else get_beta(_results, slice(None), mechanism_type)
+            )
+        except KeyError:
+            # no results for the mechanism, e.g. a section without revetment
+            _betas = None
+        _betas_per_section.append(
+            None if _betas is None else np.asarray(_betas, dtype=float)
         )
 
-    add_colorscale_bar(
-        fig,
-        result_type,
-        colorbar_result_type,
-        sub_result_type,
-        dike_traject.lower_bound_value,
+    _all_betas = [_betas for _betas in _betas_per_section if _betas is not None]
+    if not _all_betas:
+        return _betas_per_section
+
+    _pf = beta_to_pf(np.concatenate(_all_betas))
+    _pf_per_section = iter(
+        np.split(_pf, np.cumsum([len(_betas) for _betas in _all_betas])[:-1])
     )
+    return [
+        None if _betas is None else next(_pf_per_section)
+        for _betas in _betas_per_section
+    ]
 
-    # Update layout of the figure and add token for mapbox
-    _middle_point = get_middle_point(dike_traject.dike_sections)
-    update_layout_map_box(fig, _middle_point)
 
-    return fig
+def get_initial_assessment_map_frames(
+    dike_traject: DikeTraject, result_type: str, mechanism_type: str
+) -> dict:
+    """
+    Return the frames of the map of the initial assessment for all the assessment years, see
+    `get_section_map_frames`.
+    """
+    _sections = dike_traject.dike_sections
+    _pf_per_year = get_pf_per_year(
+        [section.initial_assessment for section in _sections], mechanism_type
+    )
+    _pf_per_section = dict(zip([section.name for section in _sections], _pf_per_year))
+    _beta_center = pf_to_beta(dike_traject.lower_bound_value)
+
+    return get_section_map_frames(
+        dike_traject,
+        lambda section, year_index: get_initial_assessment_color_hover(
+            section,
+            year_index,
+            result_type,
+            mechanism_type,
+            dike_traject.lower_bound_value,
+            _beta_center,
+            _pf_per_section[section.name],
+        ),
+    )
+
+
+def get_measures_assessment_map_frames(
+    dike_traject: DikeTraject,
+    result_type: str,
+    calc_type: str,
+    colorbar_result_type: str,
+    mechanism_type: str,
+    sub_result_type: str,
+) -> Optional[dict]:
+    """
+    Return the frames of the map after measures for all the assessment years, see `get_section_map_frames`.
+
+    :return: None for the map of the measures, which depends on the investment years and is plotted server-side.
+    """
+    if colorbar_result_type == ColorBarResultType.MEASURE.name:
+        return None
+
+    # the betas of both calculation types are converted at once, the ratio map needs both
+    _sections = dike_traject.dike_sections
+    _pf_per_year = get_pf_per_year(
+        [section.final_measure_veiligheidsrendement for section in _sections]
+        + [section.final_measure_doorsnede for section in _sections],
+        mechanism_type,
+    )
+    _pf_per_section = {
+        section.name: {
+            CalcType.VEILIGHEIDSRENDEMENT.name: _pf_vr,
+            CalcType.DOORSNEDE_EISEN.name: _pf_dsn,
+        }
+        for section, _pf_vr, _pf_dsn in zip(
+            _sections, _pf_per_year[: len(_sections)], _pf_per_year[len(_sections) :]
+        )
+    }
+    _beta_center = pf_to_beta(dike_traject.lower_bound_value)
+
+    return get_section_map_frames(
+        dike_traject,
+        lambda section, year_index: get_measures_assessment_color_hover(
+            section,
+            year_index,
+            result_type,
+            calc_type,
+            colorbar_result_type,
+            mechanism_type,
+            sub_result_type,
+            dike_traject.lower_bound_value,
+            _beta_center,
+            _pf_per_section[section.name],
+        ),
+    )
 
 
 def plot_dike_traject_urgency(
@@ -391,6 +624,7 @@ def plot_dike_traject_urgency(
 
     cum_length = 0  # cumulative length of the sections
     added_to_legend = {}
+    _section_traces = SectionTraceBatch()
 
     for section_name in _ordered_sections:
         section = dike_traject.get_section(section_name)
@@ -415,8 +649,7 @@ def plot_dike_traject_urgency(
 
         showlegend = _group not in added_to_legend
 
-        add_section_trace(
-            fig,
+        _section_traces.add_section(
             section,
             name=_group,
             color=_color,
@@ -427,6 +660,7 @@ def plot_dike_traject_urgency(
 
         cum_length += section.length
         added_to_legend[_group] = True
+    _section_traces.add_to_figure(fig)
 
     # Update layout of the figure and add token for mapbox
     _middle_point = get_middle_point(dike_traject.dike_sections)
@@ -586,8 +820,8 @@ def add_measure_type_trace(
                 legendgrouptitle_text=None if legendgroup is None else legendgroup,
                 legendgrouptitle=dict(font=dict(weight="bold")),
                 mode="lines",
-                lat=[x[0] for x in _coordinates_wgs],
-                lon=[x[1] for x in _coordinates_wgs],
+                lat=_coordinates_wgs[:, 0],
+                lon=_coordinates_wgs[:, 1],
                 fillcolor=_color,
                 line={"width": 1, "color": _color},
                 fill="toself",
@@ -604,16 +838,14 @@ def add_measure_type_trace(
         in measure_results["type"]
     ):
         _color = "red"
-        _coordinates_wgs = [
-            GWSRDConvertor().to_wgs(pt[0], pt[1]) for pt in section.coordinates_rd
-        ]  # convert in GWS coordinates:
+        _coordinates_wgs = section.coordinates_wgs84  # convert in GWS coordinates:
         fig.add_trace(
             go.Scattermap(
                 name="Verticale pipingoplossing",
                 legendgroup="VZG" if legendgroup is None else legendgroup,
                 mode="lines",
-                lat=[x[0] for x in _coordinates_wgs],
-                lon=[x[1] for x in _coordinates_wgs],
+                lat=_coordinates_wgs[:, 0],
+                lon=_coordinates_wgs[:, 1],
                 line={"color": _color, "width": 4},
                 opacity=opacity,
                 showlegend=legend_display.get("VZG"),
@@ -634,16 +866,14 @@ def add_measure_type_trace(
         in measure_results["type"]
     ):
         _color = "blue"
-        _coordinates_wgs = [
-            GWSRDConvertor().to_wgs(pt[0], pt[1]) for pt in section.coordinates_rd
-        ]  # convert in GWS coordinates:
+        _coordinates_wgs = section.coordinates_wgs84  # convert in GWS coordinates:
         fig.add_trace(
             go.Scattermap(
                 name="Stabiliteitsscherm",
                 legendgroup="screen" if legendgroup is None else legendgroup,
                 mode="lines",
-                lat=[x[0] for x in _coordinates_wgs],
-                lon=[x[1] for x in _coordinates_wgs],
+                lat=_coordinates_wgs[:, 0],
+                lon=_coordinates_wgs[:, 1],
                 line={"color": _color, "width": 4},
                 opacity=opacity,
                 showlegend=legend_display.get("screen"),
@@ -669,8 +899,8 @@ def add_measure_type_trace(
                 name="Zelfkerende constructie",
                 legendgroup="diaphram wall" if legendgroup is None else legendgroup,
                 mode="lines",
-                lat=[x[0] for x in _coordinates_wgs],
-                lon=[x[1] for x in _coordinates_wgs],
+                lat=_coordinates_wgs[:, 0],
+                lon=_coordinates_wgs[:, 1],
                 fillcolor=f"rgba(0, 0, 0, {opacity})",
                 line={"width": 1, "color": "black"},
                 fill="toself",
@@ -697,8 +927,8 @@ def add_measure_type_trace(
                 name="Damwandconstructie",
                 legendgroup="sheetpile" if legendgroup is None else legendgroup,
                 mode="lines",
-                lat=[x[0] for x in _coordinates_wgs],
-                lon=[x[1] for x in _coordinates_wgs],
+                lat=_coordinates_wgs[:, 0],
+                lon=_coordinates_wgs[:, 1],
                 fillcolor=f"rgb(128, 128, 128, {opacity})",
                 line={"width": 1, "color": "grey"},
                 fill="toself",
@@ -719,9 +949,9 @@ def add_measure_type_trace(
         _ls = LineString(section.coordinates_rd)
         _offset_ls = _ls.parallel_offset(20, "left")
 
-        _coordinates_wgs = [
-            GWSRDConvertor().to_wgs(pt[0], pt[1]) for pt in _offset_ls.coords
-        ]  # convert in GWS coordinates:
+        _coordinates_wgs = GWSRDConvertor().coordinates_to_wgs(
+            _offset_ls.coords
+        )  # convert in GWS coordinates:
         if (
             "Grondversterking" in measure_results["name"]
             and measure_results["dcrest"] == 0
@@ -744,8 +974,8 @@ def add_measure_type_trace(
                 name="Aanpassing bekleding",
                 legendgroup="revetment" if legendgroup is None else legendgroup,
                 mode="lines",
-                lat=[x[0] for x in _coordinates_wgs],
-                lon=[x[1] for x in _coordinates_wgs],
+                lat=_coordinates_wgs[:, 0],
+                lon=_coordinates_wgs[:, 1],
                 fillcolor=f"rgb(128, 128, 128, {opacity})",
                 line={"width": 4, "color": "black"},
                 # fill="toself",
@@ -775,8 +1005,8 @@ def add_measure_type_trace(
                 name="Custom",
                 legendgroup="custom" if legendgroup is None else legendgroup,
                 mode="lines",
-                lat=[x[0] for x in _coordinates_wgs],
-                lon=[x[1] for x in _coordinates_wgs],
+                lat=_coordinates_wgs[:, 0],
+                lon=_coordinates_wgs[:, 1],
                 fillcolor=f"rgb(128, 128, 128, {opacity})",
                 line={"width": 1, "color": "grey"},
                 fill="toself",
@@ -798,10 +1028,9 @@ def add_measure_crest_heightening_trace(
         if measure_results["dcrest"] > 0:
             _trajectory_buffer = section.trajectory_rd.buffer(60, cap_style=2)
 
-            _coordinates_wgs = [
-                GWSRDConvertor().to_wgs(pt[0], pt[1])
-                for pt in _trajectory_buffer.exterior.coords
-            ]  # convert in GWS coordinates:
+            _coordinates_wgs = GWSRDConvertor().coordinates_to_wgs(
+                _trajectory_buffer.exterior.coords
+            )  # convert in GWS coordinates:
 
             _color = get_crest_heightening_color(measure_results["dcrest"])
 
@@ -810,8 +1039,8 @@ def add_measure_crest_heightening_trace(
                     name=measure_results["name"],
                     legendgroup=measure_results["name"],
                     mode="lines",
-                    lat=[x[0] for x in _coordinates_wgs],
-                    lon=[x[1] for x in _coordinates_wgs],
+                    lat=_coordinates_wgs[:, 0],
+                    lon=_coordinates_wgs[:, 1],
                     fillcolor=_color,
                     line={"width": 1, "color": _color},
                     fill="toself",
@@ -843,8 +1072,8 @@ def add_measure_berm_widening_trace(
                     name=measure_results["name"],
                     legendgroup=measure_results["name"],
                     mode="lines",
-                    lat=[x[0] for x in _coordinates_wgs],
-                    lon=[x[1] for x in _coordinates_wgs],
+                    lat=_coordinates_wgs[:, 0],
+                    lon=_coordinates_wgs[:, 1],
                     fillcolor=_color,
                     line={"width": 1, "color": _color},
                     fill="toself",
@@ -897,6 +1126,87 @@ def add_measure_investment_year_trace(
     )
 
 
+class SectionTraceBatch:
+    """
+    Collect the traces of many dike sections and add them to a figure as one Scattermap trace per style (name, color,
+    legend group, opacity, width and mode), instead of one trace per section. The coordinates of the sections are
+    separated by NaN so that the lines are not connected, and the hover text of every section is passed per vertex
+    via customdata. The size of the figure then scales with the number of styles instead of the number of sections.
+    """
+
+    _EXTRA = "<extra></extra>"
+
+    def __init__(self):
+        self._traces: dict[tuple, dict] = {}
+
+    def add_section(
+        self,
+        section: DikeSection,
+        name: str,
+        color: str,
+        hovertemplate: str,
+        showlegend: bool = False,
+        legendgroup: Optional[str] = None,
+        opacity: float = 1,
+        width: int = 10,
+        mode: str = "lines",
+    ):
+        """
+        Add a section to the batch, same arguments as `add_section_trace`. The hovertemplate of a section must be
+        plain text: plotly variables such as %{lat} are not supported.
+        """
+        _hide_trace_name = hovertemplate.endswith(self._EXTRA)
+        if _hide_trace_name:
+            hovertemplate = hovertemplate[: -len(self._EXTRA)]
+
+        _key = (name, color, legendgroup, opacity, width, mode, _hide_trace_name)
+        _trace = self._traces.setdefault(
+            _key, {"coordinates": [], "hovertexts": [], "showlegend": False}
+        )
+        _trace["coordinates"].append(section.coordinates_wgs84)
+        _trace["hovertexts"].append(hovertemplate)
+        # the legend entry is shown once for all the sections of the trace
+        _trace["showlegend"] = _trace["showlegend"] or showlegend
+
+    def add_to_figure(self, fig: go.Figure):
+        """Add one trace per style to the figure, in the order in which the styles were first added."""
+        _separator = np.full((1, 2), np.nan)
+        for (
+            name,
+            color,
+            legendgroup,
+            opacity,
+            width,
+            mode,
+            _hide_trace_name,
+        ), _trace in self._traces.items():
+            _coordinates = []
+            _customdata = []
+            for _coordinates_wgs, _hovertext in zip(
+                _trace["coordinates"], _trace["hovertexts"]
+            ):
+                _coordinates.extend([_coordinates_wgs, _separator])
+                _customdata.extend([_hovertext] * len(_coordinates_wgs) + [None])
+            _coordinates = np.concatenate(_coordinates[:-1])
+
+            fig.add_trace(
+                go.Scattermap(
+                    mode=mode,
+                    lat=_coordinates[:, 0],
+                    lon=_coordinates[:, 1],
+                    customdata=_customdata[:-1],
+                    marker={"size": 10, "color": color},
+                    line={"width": width, "color": color},
+                    name=name,
+                    opacity=opacity,
+                    legendgroup=legendgroup,
+                    hovertemplate="%{customdata}"
+                    + (self._EXTRA if _hide_trace_name else ""),
+                    showlegend=_trace["showlegend"],
+                )
+            )
+
+
 def add_section_trace(
     fig: go.Figure,
     section: DikeSection,
@@ -911,15 +1221,13 @@ def add_section_trace(
     """
     Add a trace of a section to the figure which the given specifications for color and hover, etc...
     """
-    _coordinates_wgs = [
-        GWSRDConvertor().to_wgs(pt[0], pt[1]) for pt in section.coordinates_rd
-    ]  # convert in GWS coordinates:
+    _coordinates_wgs = section.coordinates_wgs84  # convert in GWS coordinates:
 
     fig.add_trace(
         go.Scattermap(
             mode="lines",
-            lat=[x[0] for x in _coordinates_wgs],
-            lon=[x[1] for x in _coordinates_wgs],
+            lat=_coordinates_wgs[:, 0],
+            lon=_coordinates_wgs[:, 1],
             marker={"size": 10, "color": color},
             line={"width": width, "color": color},
             name=name,
@@ -995,6 +1303,7 @@ def dike_traject_pf_cost_helping_map_simple(
     :return:
     """
     fig = go.Figure()
+    _section_traces = SectionTraceBatch()
 
     for section in dike_traject.dike_sections:
 
@@ -1016,14 +1325,14 @@ def dike_traject_pf_cost_helping_map_simple(
             _opacity = 1
         _hovertemplate = f"Vaknaam {section.name}<br>" + "<extra></extra>"
 
-        add_section_trace(
-            fig,
+        _section_traces.add_section(
             section,
             name=dike_traject.name,
             color=_color,
             hovertemplate=_hovertemplate,
             opacity=_opacity,
         )
+    _section_traces.add_to_figure(fig)
 
     # Update layout of the figure and add token for mapbox
     _middle_point = get_middle_point(dike_traject.dike_sections)
@@ -1415,14 +1724,18 @@ def get_color_plotly(
     return rgb_tuple
 
 
-def get_reliability_color(reliability_value: float, center_pf: float) -> str:
+def get_reliability_color(
+    reliability_value: float, center_pf: float, beta_center: Optional[float] = None
+) -> str:
     """
     Return the color of the reliability value Beta on a colorscale from 2 (scarlet) to 5 (green), as a rgb string.
     :param reliability_value:
     :param center_pf: probability for which the color scale is centered
+    :param beta_center: beta of center_pf, computed when not given
     :return:
     """
-    beta_center = pf_to_beta(center_pf)
+    if beta_center is None:
+        beta_center = pf_to_beta(center_pf)
     cmin = beta_center - 1.5  # corresponds to pf=1/100
     cmax = beta_center + 1.5  # corresponds to pf=1/100000
     return get_color(reliability_value, plt.cm.RdYlGn, cmin, cmax)
@@ -1483,7 +1796,10 @@ def get_veiligheidsrendemeent_index_color(vr_index: int) -> str:
 
 
 def get_color_hover_prob_ratio(
-    section: DikeSection, year_index: int, mechanism_type: str
+    section: DikeSection,
+    year_index: int,
+    mechanism_type: str,
+    pf_per_year: Optional[dict[str, Optional[np.ndarray]]] = None,
 ) -> Tuple[str, str]:
     if (
         section.final_measure_veiligheidsrendement is None
@@ -1498,13 +1814,18 @@ def get_color_hover_prob_ratio(
         _beta_dsn = get_beta(
             section.final_measure_doorsnede, year_index, mechanism_type
         )
-        _ratio_pf = beta_to_pf(_beta_vr) / beta_to_pf(_beta_dsn)
+        if pf_per_year is None:
+            _pf_vr, _pf_dsn = beta_to_pf(_beta_vr), beta_to_pf(_beta_dsn)
+        else:
+            _pf_vr = pf_per_year[CalcType.VEILIGHEIDSRENDEMENT.name][year_index]
+            _pf_dsn = pf_per_year[CalcType.DOORSNEDE_EISEN.name][year_index]
+        _ratio_pf = _pf_vr / _pf_dsn
         _color = get_probability_ratio_color(_ratio_pf)
 
         _hovertemplate = (
             f"Vaknaam {section.name}<br>"
-            f"Pf Veiligheidsrendement: {beta_to_pf(_beta_vr):.2e}<br>"
-            f"Pf Doorsnede: {beta_to_pf(_beta_dsn):.2e}<br>"
+            f"Pf Veiligheidsrendement: {_pf_vr:.2e}<br>"
+            f"Pf Doorsnede: {_pf_dsn:.2e}<br>"
             f"Ratio Pf vr/dsn: {round(_ratio_pf, 1)}<br>"
             f"<extra></extra>"
         )
@@ -1517,15 +1838,19 @@ def get_color_hover_absolute_reliability(
     beta_section: float,
     measure_results: dict,
     pf_lower_bound: float,
+    beta_center: Optional[float] = None,
+    pf_section: Optional[float] = None,
 ) -> Tuple[str, str]:
-    _color = get_reliability_color(beta_section, pf_lower_bound)
+    _color = get_reliability_color(beta_section, pf_lower_bound, beta_center)
+    if pf_section is None:
+        pf_section = beta_to_pf(beta_section)
 
     _hovertemplate = (
         f"Vaknaam {section.name}<br>"
         f'Maatregel: {measure_results["name"]}<br>'
         f'LCC: {to_million_euros(measure_results["LCC"])} M€<br>'
         f"Beta sectie: {beta_section:.2}<br>"
-        f"Pf sectie: {beta_to_pf(beta_section):.2e}<br>"
+        f"Pf sectie: {pf_section:.2e}<br>"
         f"<extra></extra>"
     )
 
@@ -1533,8 +1858,13 @@ def get_color_hover_absolute_reliability(
 
 
 def get_color_hover_absolute_cost(
-    section: DikeSection, beta_section: float, measure_results: dict
+    section: DikeSection,
+    beta_section: float,
+    measure_results: dict,
+    pf_section: Optional[float] = None,
 ) -> Tuple[str, str]:
+    if pf_section is None:
+        pf_section = beta_to_pf(beta_section)
     _cost_per_kilometer = to_million_euros(
         measure_results["LCC"] / (section.length / 1e3)
     )
@@ -1546,7 +1876,7 @@ def get_color_hover_absolute_cost(
         f'Kosten sectie: {to_million_euros(measure_results["LCC"])} M€<br>'
         f"Kosten per kilometers: {_cost_per_kilometer} M€/km<br>"
         f"Beta sectie: {beta_section:.2}<br>"
-        f"Pf sectie: {beta_to_pf(beta_section):.2e}<br>"
+        f"Pf sectie: {pf_section:.2e}<br>"
         f"<extra></extra>"
     )
 
@@ -13,8 +13,8 @@ from src.constants import (
 from src.linear_objects.dike_traject import DikeTraject
 from src.linear_objects.project import DikeProject
 from src.plotly_graphs.plotly_maps import (
+    SectionTraceBatch,
     add_colorscale_bar,
-    add_section_trace,
     get_average_point,
     get_middle_point,
     get_reliability_color,
@@ -23,7 +23,6 @@ from src.plotly_graphs.plotly_maps import (
     plot_default_overview_map_dummy,
     update_layout_map_box,
 )
-from src.utils.gws_convertor import GWSRDConvertor
 from src.utils.utils import beta_to_pf, get_beta
 
 
@@ -43,6 +42,8 @@ def plot_project_overview_map(
     if len(projects) == 0:
         return plot_default_overview_map_dummy()
     projects = sorted(projects, key=lambda x: x.end_year)
+    _section_traces = SectionTraceBatch()
+    _labels = []
 
     for i, project in enumerate(projects):
         _color = PROJECTS_COLOR_SEQUENCE[i]
@@ -54,34 +55,17 @@ def plot_project_overview_map(
                 + f"Vaknaam {section.name}<br>"
                 + f"Lengte: {section.length}m <extra></extra>"
             )
-            _coordinates_wgs = [
-                GWSRDConvertor().to_wgs(pt[0], pt[1]) for pt in section.coordinates_rd
-            ]  # convert in GWS coordinates:
-
-            fig.add_trace(
-                go.Scattermap(
-                    mode="lines+text",
-                    lat=[x[0] for x in _coordinates_wgs],
-                    lon=[x[1] for x in _coordinates_wgs],
-                    marker={"size": 10, "color": _color},
-                    line={"width": 10, "color": _color},
-                    name=project.name,
-                    legendgroup=project.name,
-                    hovertemplate=_hovertemplate,
-                    showlegend=True if index == 0 else False,
-                )
+            _section_traces.add_section(
+                section,
+                name=project.name,
+                color=_color,
+                hovertemplate=_hovertemplate,
+                showlegend=True if index == 0 else False,
+                legendgroup=project.name,
+                mode="lines+text",
             )
             if index == int(len(project.dike_sections) / 2):
-                fig.add_trace(
-                    go.Scattermap(
-                        mode="text",
-                        lat=[[x[0] for x in _coordinates_wgs][0]],
-                        lon=[[x[1] for x in _coordinates_wgs][0]],
-                        showlegend=False,
-                        text=project.name,
-                        textfont=dict(size=15),
-                    )
-                )
+                _labels.append((project.name, section.coordinates_wgs84[0]))
 
         _middle_point = get_average_point(sections)
         update_layout_map_box(fig, _middle_point, zoom=10)
@@ -97,25 +81,30 @@ def plot_project_overview_map(
                     + f"Vaknaam {section.name}<br>"
                     + f"Lengte: {section.length}m <extra></extra>"
                 )
-                _coordinates_wgs = [
-                    GWSRDConvertor().to_wgs(pt[0], pt[1])
-                    for pt in section.coordinates_rd
-                ]  # convert in GWS coordinates:
-
-                fig.add_trace(
-                    go.Scattermap(
-                        mode="lines",
-                        lat=[x[0] for x in _coordinates_wgs],
-                        lon=[x[1] for x in _coordinates_wgs],
-                        marker={"size": 10, "color": _color},
-                        line={"width": 4, "color": _color},
-                        name=traject.name,
-                        legendgroup=traject.name,
-                        hovertemplate=_hovertemplate,
-                        opacity=0.9,
-                        showlegend=True if index == 0 else False,
-                    )
+                _section_traces.add_section(
+                    section,
+                    name=traject.name,
+                    color=_color,
+                    hovertemplate=_hovertemplate,
+                    showlegend=True if index == 0 else False,
+                    legendgroup=traject.name,
+                    opacity=0.9,
+                    width=4,
                 )
+    _section_traces.add_to_figure(fig)
+
+    # the project names are drawn on top of the sections
+    for _project_name, _label_point in _labels:
+        fig.add_trace(
+            go.Scattermap(
+                mode="text",
+                lat=[_label_point[0]],
+                lon=[_label_point[1]],
+                showlegend=False,
+                text=_project_name,
+                textfont=dict(size=15),
+            )
+        )
     place_legend_right_top_corner(fig)
     return fig
 
@@ -131,12 +120,10 @@ def plot_comparison_runs_overview_map_assessment(
 ) -> go.Figure:
     fig = go.Figure()
     sections = []  # add section to a list to find the middle point for all trajects
+    _section_traces = SectionTraceBatch()
     for dike_traject in trajects:
         for section in dike_traject.dike_sections:
             sections.append(section)
-            _coordinates_wgs = [
-                GWSRDConvertor().to_wgs(pt[0], pt[1]) for pt in section.coordinates_rd
-            ]  # convert in GWS coordinates:
 
             # if a section is not in analyse, skip it, and it turns blank on the map.
             if not section.in_analyse:
@@ -176,13 +163,13 @@ def plot_comparison_runs_overview_map_assessment(
                     f"Beta: NO DATA<br>" + "<extra></extra>"
                 )
 
-            add_section_trace(
-                fig,
+            _section_traces.add_section(
                 section,
                 name=dike_traject.name,
                 color=_color,
                 hovertemplate=_hovertemplate,
             )
+    _section_traces.add_to_figure(fig)
 
     # Add colorscale bar, /!\ This will be centered around the lower bound value of the LAST dike traject
     add_colorscale_bar(
@@ -212,6 +199,7 @@ def plot_comparison_runs_overview_map_simple(
     """
     fig = go.Figure()
     sections = []
+    _section_traces = SectionTraceBatch()
 
     if trajects is not None:
         for traject in trajects:
@@ -228,25 +216,17 @@ def plot_comparison_runs_overview_map_simple(
                     + f"Vaknaam {section.name}<br>"
                     + f"Lengte: {section.length}m <extra></extra>"
                 )
-                _coordinates_wgs = [
-                    GWSRDConvertor().to_wgs(pt[0], pt[1])
-                    for pt in section.coordinates_rd
-                ]  # convert in GWS coordinates:
-
-                fig.add_trace(
-                    go.Scattermap(
-                        mode="lines",
-                        lat=[x[0] for x in _coordinates_wgs],
-                        lon=[x[1] for x in _coordinates_wgs],
-                        marker={"size": 10, "color": _color},
-                        line={"width": 4, "color": _color},
-                        name=traject.name,
-                        legendgroup=traject.name,
-                        hovertemplate=_hovertemplate,
-                        opacity=0.9,
-                        showlegend=True if index == 0 else False,
-                    )
+                _section_traces.add_section(
+                    section,
+                    name=traject.name,
+                    color=_color,
+                    hovertemplate=_hovertemplate,
+                    showlegend=True if index == 0 else False,
+                    legendgroup=traject.name,
+                    opacity=0.9,
+                    width=4,
                 )
+    _section_traces.add_to_figure(fig)
 
     _middle_point = get_average_point(sections)
     update_layout_map_box(fig, _middle_point, zoom=10)
@@ -260,6 +240,7 @@ def plot_order_reinforcement_index_map(trajects: list[DikeTraject]) -> go.Figure
 
     sections = []
     colorscale = px.colors.diverging.Geyser
+    _section_traces = SectionTraceBatch()
     for traject in trajects:
 
         if traject.reinforcement_modified_order_vr is None:
@@ -267,9 +248,6 @@ def plot_order_reinforcement_index_map(trajects: list[DikeTraject]) -> go.Figure
 
         for section_id, section in enumerate(traject.dike_sections, 1):
             sections.append(section)
-            _coordinates_wgs = [
-                GWSRDConvertor().to_wgs(pt[0], pt[1]) for pt in section.coordinates_rd
-            ]  # convert in GWS coordinates:
 
             # if a section is not in analyse, skip it, and it turns blank on the map.
 
@@ -290,20 +268,15 @@ def plot_order_reinforcement_index_map(trajects: list[DikeTraject]) -> go.Figure
                 )
                 _hovertemplate += f"Veiligheidsrendement index: {traject.reinforcement_modified_order_vr[str(section_id)]:.0f}"
 
-            fig.add_trace(
-                go.Scattermap(
-                    mode="lines",
-                    lat=[x[0] for x in _coordinates_wgs],
-                    lon=[x[1] for x in _coordinates_wgs],
-                    marker={"size": 10, "color": _color},
-                    line={"width": 10, "color": _color},
-                    name=traject.name,
-                    legendgroup=traject.name,
-                    hovertemplate=_hovertemplate,
-                    opacity=0.9,
-                    showlegend=False,
-                )
+            _section_traces.add_section(
+                section,
+                name=traject.name,
+                color=_color,
+                hovertemplate=_hovertemplate,
+                legendgroup=traject.name,
+                opacity=0.9,
             )
+    _section_traces.add_to_figure(fig)
 
     _middle_point = get_average_point(sections)
     update_layout_map_box(fig, _middle_point, zoom=10)
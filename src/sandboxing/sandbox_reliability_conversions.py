@@ -0,0 +1,34 @@
+import time
+
+import numpy as np
+from scipy.stats import norm
+
+from src.utils.reliability import beta_to_pf, pf_to_beta
+
+# micro-benchmark of the beta <-> pf conversions, on a (section x year) matrix of betas
+_nb_sections, _nb_years = 300, 60
+_betas = np.random.default_rng(0).uniform(2.0, 8.0, (_nb_sections, _nb_years))
+_pfs = beta_to_pf(_betas)
+
+
+def _time(function, repeat: int = 5) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - t0) / repeat
+
+
+_timings = {
+    "norm.ppf per element": _time(
+        lambda: [[-norm.ppf(pf) for pf in _row] for _row in _pfs], repeat=1
+    ),
+    "pf_to_beta per element": _time(
+        lambda: [[pf_to_beta(pf) for pf in _row] for _row in _pfs]
+    ),
+    "norm.ppf matrix": _time(lambda: -norm.ppf(_pfs)),
+    "pf_to_beta matrix": _time(lambda: pf_to_beta(_pfs)),
+    "norm.cdf matrix": _time(lambda: norm.cdf(-_betas)),
+    "beta_to_pf matrix": _time(lambda: beta_to_pf(_betas)),
+}
+for _name, _timing in _timings.items():
+    print(f"{_name:<25}{_timing * 1e3:10.3f} ms")
@@ -1,10 +1,19 @@
-import copy
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterator
 
 import numpy as np
 from vrtool.common.enums import MechanismEnum
 from vrtool.orm.models import *
-from vrtool.orm.orm_controllers import open_database
-from vrtool.probabilistic_tools.probabilistic_functions import beta_to_pf, pf_to_beta
+
+from src.orm.database_session import database_reader_session
+from src.utils.traject_probability import (
+    calc_traject_probability_per_mechanism,
+    get_traject_probability_per_mechanism,
+)
+
+# number of rows of the database read at once, see `read_query_columns`
+RELIABILITY_CHUNK_SIZE = 2**16
 
 
 def get_minimal_tc_step(steps):
@@ -59,6 +68,97 @@ def get_measures_per_step_number(list_of_measures):
     return result
 
 
+def read_query_columns(
+    query, dtypes: list, chunk_size: int = RELIABILITY_CHUNK_SIZE
+) -> tuple[np.ndarray, ...]:
+    """
+    Read the rows of a query column by column into typed NumPy arrays. The rows are fetched from the database cursor in
+    chunks of chunk_size rows, without caching them in the query, so that at most one chunk of rows is held as Python
+    objects at a time.
+
+    :param query: peewee query selecting one column per dtype
+    :param dtypes: dtype of every selected column
+    :param chunk_size: number of rows converted at once
+    :return: tuple with one 1D array per selected column
+    """
+    _dtype = np.dtype([(f"f{i}", dtype) for i, dtype in enumerate(dtypes)])
+    _rows = query.tuples().iterator()
+    _chunks = []
+    while _chunk := list(islice(_rows, chunk_size)):
+        _chunks.append(np.array(_chunk, dtype=_dtype))
+    _columns = np.concatenate(_chunks) if _chunks else np.empty(0, dtype=_dtype)
+    return tuple(_columns[name] for name in _dtype.names)
+
+
+def group_reliability_per_step(
+    step_numbers: np.ndarray,
+    section_ids: np.ndarray,
+    mechanisms: np.ndarray,
+    times: np.ndarray,
+    betas: np.ndarray,
+    mechanism_enums: dict,
+) -> dict:
+    """
+    Group the OptimizationStepResultMechanism rows, given as columns, per step and mechanism. The steps and the
+    mechanisms of a step are in the order of their first row, the betas and times in the order of the rows. Only the
+    first row of a step, mechanism and time is kept.
+
+    :param step_numbers: step number of every row
+    :param section_ids: section id of every row
+    :param mechanisms: mechanism id of every row
+    :param times: time of every row
+    :param betas: beta of every row
+    :param mechanism_enums: dict {mechanism id: MechanismEnum}
+    :return: dict with stepnumber as key, and reliability and section_id as values. Reliability itself is a dict with
+    mechanism as key and lists of beta, time as values.
+    """
+    if len(step_numbers) == 0:
+        return {}
+
+    # first row of every step, mechanism and time
+    _, _first_rows = np.unique(
+        np.stack([step_numbers, mechanisms, times], axis=1), axis=0, return_index=True
+    )
+    _rows = np.sort(_first_rows)
+    _step_numbers, _mechanisms = step_numbers[_rows], mechanisms[_rows]
+
+    # order the rows by first row of their step, then by first row of their mechanism in the step
+    _, _step_first_rows, _step_inverse = np.unique(
+        _step_numbers, return_index=True, return_inverse=True
+    )
+    _, _group_first_rows, _group_inverse = np.unique(
+        np.stack([_step_numbers, _mechanisms], axis=1),
+        axis=0,
+        return_index=True,
+        return_inverse=True,
+    )
+    _order = np.lexsort(
+        (
+            _group_first_rows[_group_inverse.reshape(-1)],
+            _step_first_rows[_step_inverse.reshape(-1)],
+        )
+    )
+    _rows = _rows[_order]
+    _step_numbers, _mechanisms = _step_numbers[_order], _mechanisms[_order]
+    _group_starts = np.flatnonzero(
+        np.diff(_step_numbers, prepend=_step_numbers[0] - 1)
+        | np.diff(_mechanisms, prepend=_mechanisms[0] - 1)
+    )
+
+    reliability_steps = {}
+    for _start, _end in zip(_group_starts, np.append(_group_starts[1:], len(_rows))):
+        _group_rows = _rows[_start:_end]
+        _step = reliability_steps.setdefault(
+            step_numbers[_group_rows[0]].item(),
+            {"section_id": section_ids[_group_rows[0]].item(), "reliability": {}},
+        )
+        _step["reliability"][mechanism_enums[mechanisms[_group_rows[0]].item()]] = {
+            "beta": betas[_group_rows].tolist(),
+            "time": times[_group_rows].tolist(),
+        }
+    return reliability_steps
+
+
 def get_reliability_for_each_step(database_path, measures_per_step):
     # read the OptimizationStepResultMechanism for those optimization_step_ids in measures_per_step
     # find min and max 'optimization_step_id' in measures_per_step dicts. where these values originates from lists inthe dictionary
@@ -77,58 +177,17 @@ def get_reliability_for_each_step(database_path, measures_per_step):
         max_step = _steps[-1]["optimization_step_id"][0]
         return min_step, max_step
 
-    def restructure_reliability_per_step(reliability_per_step):
-        """Restructures the reliability_per_step to a dictionary with stepnumber as key, and reliability and section_id as values.
-        Reliability itself is a dict with mechanism as key and lists of beta, time as values.
-
-        Args:
-        reliability_per_step: list of dicts with optimization_step_id, section_id, beta, time and mechanism_name
-
-        Returns:
-        reliability_steps: dict with stepnumber as key, and reliability and section_id as values.
-
-        """
-        reliability_steps = {}
-        for step in reliability_per_step:
-            if step["step_number"] not in reliability_steps:
-                reliability_steps[step["step_number"]] = {}
-                reliability_steps[step["step_number"]]["section_id"] = step["section"]
-                reliability_steps[step["step_number"]]["reliability"] = {}
-            if (
-                MechanismEnum.get_enum(step["mechanism_name"])
-                not in reliability_steps[step["step_number"]]["reliability"]
-            ):
-                reliability_steps[step["step_number"]]["reliability"][
-                    MechanismEnum.get_enum(step["mechanism_name"])
-                ] = {"beta": [], "time": []}
-            if (
-                step["time"]
-                not in reliability_steps[step["step_number"]]["reliability"][
-                    MechanismEnum.get_enum(step["mechanism_name"])
-                ]["time"]
-            ):
-                reliability_steps[step["step_number"]]["reliability"][
-                    MechanismEnum.get_enum(step["mechanism_name"])
-                ]["beta"].append(step["beta"])
-                reliability_steps[step["step_number"]]["reliability"][
-                    MechanismEnum.get_enum(step["mechanism_name"])
-                ]["time"].append(step["time"])
-        return reliability_steps
-
     # first get min and max step to get from DB.
     min_step, max_step = get_step_range(measures_per_step)
 
-    with open_database(database_path) as db:
-        reliability_values = (
+    with database_reader_session(database_path) as _database, _database.atomic():
+        _query = (
             OptimizationStepResultMechanism.select(
-                OptimizationStepResultMechanism.optimization_step_id,
-                OptimizationStepResultMechanism.mechanism_per_section_id,
-                OptimizationStepResultMechanism.beta,
-                OptimizationStepResultMechanism.time,
+                OptimizationStep.step_number,
                 MechanismPerSection.section_id,
                 MechanismPerSection.mechanism_id,
-                Mechanism.name.alias("mechanism_name"),
-                OptimizationStep.step_number,
+                OptimizationStepResultMechanism.time,
+                OptimizationStepResultMechanism.beta,
             )
             .join(
                 MechanismPerSection,
@@ -137,7 +196,6 @@ def get_reliability_for_each_step(database_path, measures_per_step):
                     == MechanismPerSection.id
                 ),
             )
-            .join(Mechanism)
             .join(
                 OptimizationStep,
                 on=(
@@ -149,14 +207,150 @@ def get_reliability_for_each_step(database_path, measures_per_step):
                 OptimizationStepResultMechanism.optimization_step_id >= min_step,
                 OptimizationStepResultMechanism.optimization_step_id <= max_step,
             )
-            .dicts()
+            .order_by(OptimizationStepResultMechanism.id)
         )
+        _mechanism_enums = {
+            _mechanism.id: MechanismEnum.get_enum(_mechanism.name)
+            for _mechanism in Mechanism.select()
+        }
+        _columns = read_query_columns(
+            _query, [np.int64, np.int64, np.int64, np.int64, np.float64]
+        )
+
     # restructure to a dictionary with stepnumber as key, mechanism as subkey and beta, time and section_id as values
+    return group_reliability_per_step(*_columns, mechanism_enums=_mechanism_enums)
+
+
+@dataclass
+class StepwiseAssessment:
+    """
+    Reliability of each section and mechanism after every optimization step, stored as the initial assessment and the
+    log of the changes of every step instead of a full copy of the assessment per step.
+
+    The assessment after a step is reconstructed on demand, see `__getitem__` and `__iter__`, and the traject
+    probability of all the steps is computed in a single vectorized pass, see `calculate_traject_probability_per_step`.
+    """
 
-    return restructure_reliability_per_step(list(reliability_values))
+    assessment_input: dict  # {mechanism: {section_id: {"beta": [...], "time": [...]}}} before the first step
+    steps: list[tuple[int, dict]] = field(
+        default_factory=list
+    )  # (section_id, {mechanism: {"beta": [...], "time": [...]}}) for every step
 
+    def __len__(self) -> int:
+        return len(self.steps)
 
-def assessment_for_each_step(assessment_input, reliability_per_step):
+    def __getitem__(self, index: int) -> dict:
+        """
+        Returns a new assessment dict after the step at index, as an element of the list returned by
+        `assessment_for_each_step` before.
+        """
+        if not -len(self.steps) <= index < len(self.steps):
+            raise IndexError("step index out of range")
+        _last_reliability = {}
+        for section_id, reliability in self.steps[: index % len(self.steps) + 1]:
+            for mechanism, mechanism_reliability in reliability.items():
+                _last_reliability[mechanism, section_id] = mechanism_reliability
+
+        _assessment = {}
+        for mechanism, sections in self.assessment_input.items():
+            _assessment[mechanism] = {}
+            for section_id, section_reliability in sections.items():
+                _reliability = _last_reliability.get(
+                    (mechanism, section_id), section_reliability
+                )
+                _assessment[mechanism][section_id] = {
+                    "beta": list(_reliability["beta"]),
+                    "time": list(_reliability["time"]),
+                }
+        return _assessment
+
+    def __iter__(self) -> Iterator[dict]:
+        """
+        Streams the assessment after every step. The yielded assessments share the reliability of the sections which
+        did not change, and must not be modified.
+        """
+        _assessment = self.assessment_input
+        for section_id, reliability in self.steps:
+            _assessment = dict(_assessment)
+            for mechanism, mechanism_reliability in reliability.items():
+                _assessment[mechanism] = dict(_assessment[mechanism])
+                _assessment[mechanism][section_id] = mechanism_reliability
+            yield _assessment
+
+    def get_reliability_arrays(self) -> tuple[np.ndarray, np.ndarray, list, list]:
+        """
+        Betas of the sections after every step, as the arrays of `calc_system_failure_probability` with the steps as
+        batch axis.
+
+        :return: tuple with the betas and presence mask (step, section, mechanism, time), the mechanisms and the sorted
+        times
+        """
+        _mechanisms = list(self.assessment_input)
+        _sections = list(
+            dict.fromkeys(
+                section
+                for sections in self.assessment_input.values()
+                for section in sections
+            )
+        )
+        _slots = [
+            (mechanism, section)
+            for mechanism, sections in self.assessment_input.items()
+            for section in sections
+        ]
+        _slot_index = {slot: i for i, slot in enumerate(_slots)}
+
+        # index of the reliability of every (mechanism, section) after every step: each change is a new row, the rows
+        # of the previous steps are carried forward with a cumulative maximum
+        _rows = [
+            self.assessment_input[mechanism][section] for mechanism, section in _slots
+        ]
+        _row_index = np.full((len(self.steps), len(_slots)), -1)
+        for step_index, (section_id, reliability) in enumerate(self.steps):
+            for mechanism, mechanism_reliability in reliability.items():
+                _row_index[step_index, _slot_index[mechanism, section_id]] = len(_rows)
+                _rows.append(mechanism_reliability)
+        _row_index = np.maximum.accumulate(_row_index, axis=0)
+        _row_index = np.where(_row_index < 0, np.arange(len(_slots)), _row_index)
+
+        _times = sorted({t for _row in _rows for t in _row["time"]})
+        _time_index = {t: i for i, t in enumerate(_times)}
+        _row_betas = np.zeros((len(_rows), len(_times)))
+        _row_is_present = np.zeros((len(_rows), len(_times)), dtype=bool)
+        for row, _reliability in enumerate(_rows):
+            _columns = [
+                _time_index[t]
+                for t, _ in zip(_reliability["time"], _reliability["beta"])
+            ]
+            _row_betas[row, _columns] = _reliability["beta"][: len(_columns)]
+            _row_is_present[row, _columns] = True
+
+        _shape = (len(self.steps), len(_sections), len(_mechanisms), len(_times))
+        _betas = np.zeros(_shape)
+        _is_present = np.zeros(_shape, dtype=bool)
+        _slot_sections = np.array(
+            [_sections.index(section) for _, section in _slots], dtype=int
+        )
+        _slot_mechanisms = np.array(
+            [_mechanisms.index(mechanism) for mechanism, _ in _slots], dtype=int
+        )
+        _betas[:, _slot_sections, _slot_mechanisms] = _row_betas[_row_index]
+        _is_present[:, _slot_sections, _slot_mechanisms] = _row_is_present[_row_index]
+        return _betas, _is_present, _mechanisms, _times
+
+    def calculate_traject_probability_per_step(self) -> list[dict]:
+        """
+        Computes the system failure probability of each mechanism after every step, in one vectorized call over all
+        the steps, same result as `calculate_traject_probability` for every step.
+
+        :return: list of dict {mechanism: {time: traject probability of failure}}, one per step
+        """
+        return get_traject_probability_per_mechanism(*self.get_reliability_arrays())
+
+
+def assessment_for_each_step(
+    assessment_input, reliability_per_step
+) -> StepwiseAssessment:
     """Combines the assessment input with the reliability per step to get the reliability assessment for each step.
 
     Args:
@@ -164,140 +358,45 @@ def assessment_for_each_step(assessment_input, reliability_per_step):
     reliability_per_step (dict): dictionary containing the reliability of the section with an investment for each mechanism for each step.
 
     Returns:
-    list: list of dictionaries containing the reliability of each section and mechanism for each step.
+    StepwiseAssessment: the reliability of each section and mechanism for each step, indexable like a list of
+    dictionaries.
     """
-    assessment_per_step = [copy.deepcopy(assessment_input)]
-    for step, data in reliability_per_step.items():
-        traject_reliability = copy.deepcopy(assessment_per_step[-1])
-        for mechanism, reliability in data["reliability"].items():
-            traject_reliability[mechanism][data["section_id"]]["beta"] = copy.deepcopy(
-                reliability["beta"]
-            )
-            traject_reliability[mechanism][data["section_id"]]["time"] = reliability[
-                "time"
-            ]
-        assessment_per_step.append(traject_reliability)
-    assessment_per_step.pop(0)
-    return assessment_per_step
+    return StepwiseAssessment(
+        assessment_input=assessment_input,
+        steps=[
+            (data["section_id"], data["reliability"])
+            for data in reliability_per_step.values()
+        ],
+    )
 
 
 def calculate_traject_probability(assessment):
     """Computes the system failure probability based on the reliability of sections and mechanisms for a given step/assessment.
-    Does so for each mechanism separately, and then combines.
+    Does so for each mechanism separately, see `calc_system_failure_probability`.
 
     Args:
-        assessment (list): list of dictionaries containing the reliability of each section and mechanism at a given step.
+        assessment (dict): dictionary containing the reliability of each section and mechanism at a given step.
 
     Returns:
         dict: dictionary containing the system failure probability for each mechanism at a given step.
     """
-
-    def convert_beta_to_pf_per_section(traject_reliability):
-        time = [t for section in traject_reliability.values() for t in section["time"]]
-        beta = [b for section in traject_reliability.values() for b in section["beta"]]
-        beta_per_time = {
-            t: [b for b, t_ in zip(beta, time) if t_ == t] for t in set(time)
-        }
-        pf_per_time = {
-            t: list(beta_to_pf(np.array(beta))) for t, beta in beta_per_time.items()
-        }
-        return pf_per_time
-
-    def compute_overflow(traject_reliability):
-        pf_per_time = convert_beta_to_pf_per_section(traject_reliability)
-        traject_pf_per_time = {t: max(pf) for t, pf in pf_per_time.items()}
-        return traject_pf_per_time
-
-    def compute_piping_stability(traject_reliability):
-        pf_per_time = convert_beta_to_pf_per_section(traject_reliability)
-        traject_pf_per_time = {
-            t: 1 - np.prod(np.subtract(1, pf)) for t, pf in pf_per_time.items()
-        }
-        return traject_pf_per_time
-
-    def compute_revetment(traject_reliability):
-        pf_per_time = convert_beta_to_pf_per_section(traject_reliability)
-        traject_pf_per_time = {t: max(pf) for t, pf in pf_per_time.items()}
-        return traject_pf_per_time
-
-    def compute_system_failure_probability(traject_reliability):
-        result = {}
-        for mechanism, data in traject_reliability.items():
-            if mechanism is MechanismEnum.OVERFLOW:
-                result[mechanism] = compute_overflow(data)
-            elif (
-                mechanism is MechanismEnum.PIPING
-                or mechanism is MechanismEnum.STABILITY_INNER
-            ):
-                result[mechanism] = compute_piping_stability(data)
-            elif mechanism is MechanismEnum.REVETMENT:
-                result[mechanism] = compute_revetment(data)
-            else:
-                raise ValueError(f"Mechanism {mechanism} not recognized.")
-        return result
-
-    traject_probability = compute_system_failure_probability(assessment)
-    return traject_probability
+    return calc_traject_probability_per_mechanism([assessment])[0]
 
 
 def calculate_traject_probability_for_steps(stepwise_assessment):
-    """Computes the system failure probability based on the reliability of sections and mechanisms for each step. Does so for each mechanism separately, and then combines.
+    """Computes the system failure probability based on the reliability of sections and mechanisms for each step,
+    in one vectorized call over all the steps. Does so for each mechanism separately.
 
     Args:
-        stepwise_assessment (list): list of dictionaries containing the reliability of each section and mechanism for each step.
+        stepwise_assessment (StepwiseAssessment | list): reliability of each section and mechanism for each step, see
+        `assessment_for_each_step`, or list of dictionaries containing the reliability for each step.
 
     Returns:
-        dict: dictionary containing the system failure probability for each mechanism for each step.
+        list: dictionaries containing the system failure probability for each mechanism for each step.
     """
-
-    def convert_beta_to_pf_per_section(traject_reliability):
-        time = [t for section in traject_reliability.values() for t in section["time"]]
-        beta = [b for section in traject_reliability.values() for b in section["beta"]]
-        beta_per_time = {
-            t: [b for b, t_ in zip(beta, time) if t_ == t] for t in set(time)
-        }
-        pf_per_time = {
-            t: list(beta_to_pf(np.array(beta))) for t, beta in beta_per_time.items()
-        }
-        return pf_per_time
-
-    def compute_overflow(traject_reliability):
-        pf_per_time = convert_beta_to_pf_per_section(traject_reliability)
-        traject_pf_per_time = {t: max(pf) for t, pf in pf_per_time.items()}
-        return traject_pf_per_time
-
-    def compute_piping_stability(traject_reliability):
-        pf_per_time = convert_beta_to_pf_per_section(traject_reliability)
-        traject_pf_per_time = {
-            t: 1 - np.prod(np.subtract(1, pf)) for t, pf in pf_per_time.items()
-        }
-        return traject_pf_per_time
-
-    def compute_revetment(traject_reliability):
-        pf_per_time = convert_beta_to_pf_per_section(traject_reliability)
-        traject_pf_per_time = {t: max(pf) for t, pf in pf_per_time.items()}
-        return traject_pf_per_time
-
-    def compute_system_failure_probability(traject_reliability):
-        result = {}
-        for mechanism, data in traject_reliability.items():
-            if mechanism is MechanismEnum.OVERFLOW:
-                result[mechanism] = compute_overflow(data)
-            elif (
-                mechanism is MechanismEnum.PIPING
-                or mechanism is MechanismEnum.STABILITY_INNER
-            ):
-                result[mechanism] = compute_piping_stability(data)
-            elif mechanism is MechanismEnum.REVETMENT:
-                result[mechanism] = compute_revetment(data)
-            else:
-                raise ValueError(f"Mechanism {mechanism} not recognized.")
-        return result
-
-    traject_probability = []
-    for step in stepwise_assessment:
-        traject_probability.append(compute_system_failure_probability(step))
-    return traject_probability
+    if isinstance(stepwise_assessment, StepwiseAssessment):
+        return stepwise_assessment.calculate_traject_probability_per_step()
+    return calc_traject_probability_per_mechanism(list(stepwise_assessment))
 
 
 def get_measures_per_section_for_step(measures_per_step, final_step_no):
@@ -362,7 +461,7 @@ def get_unique_years(measures_per_section):
 
 def get_traject_pf_required(database_path):
     # open the database:
-    with open_database(database_path) as db:
+    with database_reader_session(database_path) as _database, _database.atomic():
         # read from DikeTrajectInfo the p_max (this is 1 value):
         p_max = DikeTrajectInfo.get(DikeTrajectInfo.id == 1).p_max
         return p_max
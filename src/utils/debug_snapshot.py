@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from src.utils.utils import MyEncoder
+
+# set the environment variable to the snapshot directory to enable the snapshots at start-up
+DEBUG_SNAPSHOT_ENV_VARIABLE = "VRTOOL_DASHBOARD_DEBUG_SNAPSHOT_DIR"
+# minimum time in seconds between two snapshots with the same name
+DEBUG_SNAPSHOT_MIN_INTERVAL = 10.0
+# number of pending snapshots, new snapshots are dropped when the queue is full
+DEBUG_SNAPSHOT_QUEUE_SIZE = 4
+
+_directory: Optional[Path] = None
+_min_interval: float = DEBUG_SNAPSHOT_MIN_INTERVAL
+_last_requests: dict[str, float] = {}  # name: time of the last accepted snapshot
+_last_digests: dict[str, str] = {}  # name: digest of the last written snapshot
+_queue: "queue.Queue[tuple[Path, str, object]]" = queue.Queue(
+    maxsize=DEBUG_SNAPSHOT_QUEUE_SIZE
+)
+_writer: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def enable_debug_snapshots(
+    directory: Path, min_interval: float = DEBUG_SNAPSHOT_MIN_INTERVAL
+):
+    """
+    Enable the debug snapshots, see `request_debug_snapshot`.
+
+    :param directory: directory the snapshots are written to, created if needed
+    :param min_interval: minimum time in seconds between two snapshots with the same name
+    """
+    global _directory, _min_interval
+    with _lock:
+        _directory = Path(directory)
+        _min_interval = min_interval
+        _last_requests.clear()
+
+
+def disable_debug_snapshots():
+    """Disable the debug snapshots, the pending snapshots are still written."""
+    global _directory
+    with _lock:
+        _directory = None
+
+
+def is_debug_snapshot_enabled() -> bool:
+    return _directory is not None
+
+
+def request_debug_snapshot(name: str, data) -> bool:
+    """
+    Request a JSON snapshot of some data for debugging, e.g. the serialized DikeTraject displayed on the traject page.
+    The snapshots are disabled by default (see `enable_debug_snapshots`), in which case this function does nothing.
+
+    When enabled, the snapshot is written to "<directory>/<name>.json" by a background thread, so the caller does no
+    file I/O. The snapshots are rate-limited per name, and a snapshot with the same content as the last written one is
+    not written again.
+
+    :param name: name of the snapshot, used as file name
+    :param data: JSON serializable data, must not be modified by the caller afterward
+    :return: True if the snapshot is queued to be written
+    """
+    if _directory is None or data is None:
+        return False
+
+    with _lock:
+        _now = time.monotonic()
+        if _now - _last_requests.get(name, -_min_interval) < _min_interval:
+            return False
+        try:
+            _queue.put_nowait((_directory, name, data))
+        except queue.Full:
+            return False
+        _last_requests[name] = _now
+        _start_writer()
+    return True
+
+
+def wait_for_debug_snapshots():
+    """Block until all the queued snapshots are written."""
+    _queue.join()
+
+
+def _start_writer():
+    global _writer
+    if _writer is None or not _writer.is_alive():
+        _writer = threading.Thread(
+            target=_write_snapshots, name="debug-snapshot-writer", daemon=True
+        )
+        _writer.start()
+
+
+def _write_snapshots():
+    while True:
+        _directory, _name, _data = _queue.get()
+        try:
+            _write_snapshot(_directory, _name, _data)
+        except Exception as e:
+            print(f"Debug snapshot {_name} could not be written: {e}")
+        finally:
+            _queue.task_done()
+
+
+def _write_snapshot(directory: Path, name: str, data):
+    _content = json.dumps(data, cls=MyEncoder).encode()
+    _digest = hashlib.sha256(_content).hexdigest()
+    if _last_digests.get(name) == _digest:
+        return
+
+    directory.mkdir(parents=True, exist_ok=True)
+    _path = directory / f"{name}.json"
+    # write to a temporary file first, so a snapshot is never read half written
+    _tmp_path = _path.with_suffix(f".{threading.get_ident()}.tmp")
+    _tmp_path.write_bytes(_content)
+    os.replace(_tmp_path, _path)
+    _last_digests[name] = _digest
+
+
+if os.environ.get(DEBUG_SNAPSHOT_ENV_VARIABLE):
+    enable_debug_snapshots(Path(os.environ[DEBUG_SNAPSHOT_ENV_VARIABLE]))
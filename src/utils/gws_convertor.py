@@ -5,6 +5,7 @@ Slightly modified to make the package more practical.
 
 from dataclasses import dataclass
 
+import numpy as np
 from shapely import LineString, MultiPolygon, Polygon
 
 
@@ -16,9 +17,10 @@ class GWSRDConvertor:
         self.PHI0 = 52.15517440
         self.LAM0 = 5.38720621
 
-    def to_rd(self, latin, lonin):
-        # based off of https://github.com/djvanderlaan/rijksdriehoek
-        pqr = [
+    # based off of https://github.com/djvanderlaan/rijksdriehoek
+    # (p, q, coefficient) of the polynomial series, see `to_rd_array` and `to_wgs_array`
+    PQR = np.array(
+        [
             (0, 1, 190094.945),
             (1, 1, -11832.228),
             (2, 1, -114.221),
@@ -29,8 +31,10 @@ class GWSRDConvertor:
             (0, 2, -0.008),
             (2, 3, 0.148),
         ]
+    )
 
-        pqs = [
+    PQS = np.array(
+        [
             (1, 0, 309056.544),
             (0, 2, 3638.893),
             (2, 0, 73.077),
@@ -42,25 +46,10 @@ class GWSRDConvertor:
             (0, 4, 0.092),
             (1, 4, -0.054),
         ]
+    )
 
-        dphi = 0.36 * (latin - self.PHI0)
-        dlam = 0.36 * (lonin - self.LAM0)
-
-        X = self.X0
-        Y = self.Y0
-
-        for p, q, r in pqr:
-            X += r * dphi**p * dlam**q
-
-        for p, q, s in pqs:
-            Y += s * dphi**p * dlam**q
-
-        return [X, Y]
-
-    def to_wgs(self, xin, yin):
-        # based off of https://github.com/djvanderlaan/rijksdriehoek
-
-        pqk = [
+    PQK = np.array(
+        [
             (0, 1, 3235.65389),
             (2, 0, -32.58297),
             (0, 2, -0.24750),
@@ -73,8 +62,10 @@ class GWSRDConvertor:
             (4, 1, 0.00033),
             (1, 1, -0.00012),
         ]
+    )
 
-        pql = [
+    PQL = np.array(
+        [
             (1, 0, 5260.52916),
             (1, 1, 105.94684),
             (1, 2, 2.45656),
@@ -88,25 +79,71 @@ class GWSRDConvertor:
             (2, 0, -0.00022),
             (5, 0, 0.00026),
         ]
+    )
+
+    @staticmethod
+    def _evaluate_series(
+        origin: float, pqc: np.ndarray, u: np.ndarray, v: np.ndarray
+    ) -> np.ndarray:
+        """Evaluate origin + sum(c * u**p * v**q) for all the points at once, terms are added in the series order."""
+        _result = np.full(u.shape, origin, dtype=float)
+        for p, q, c in pqc:
+            _result += c * u ** int(p) * v ** int(q)
+        return _result
+
+    def to_rd_array(self, latin, lonin) -> np.ndarray:
+        """
+        Convert WGS84 coordinates to RD coordinates for all the points at once.
 
-        dx = 1e-5 * (xin - self.X0)
-        dy = 1e-5 * (yin - self.Y0)
+        :param latin: array of latitudes
+        :param lonin: array of longitudes
+        :return: array of shape (number of points, 2) with the X and Y RD coordinates
+        """
+        dphi = 0.36 * (np.asarray(latin, dtype=float) - self.PHI0)
+        dlam = 0.36 * (np.asarray(lonin, dtype=float) - self.LAM0)
+
+        X = self._evaluate_series(self.X0, self.PQR, dphi, dlam)
+        Y = self._evaluate_series(self.Y0, self.PQS, dphi, dlam)
+        return np.stack([X, Y], axis=-1)
+
+    def to_wgs_array(self, xin, yin) -> np.ndarray:
+        """
+        Convert RD coordinates to WGS84 coordinates for all the points at once.
 
-        phi = self.PHI0
-        lam = self.LAM0
+        :param xin: array of X RD coordinates
+        :param yin: array of Y RD coordinates
+        :return: array of shape (number of points, 2) with the latitudes and longitudes
+        """
+        dx = 1e-5 * (np.asarray(xin, dtype=float) - self.X0)
+        dy = 1e-5 * (np.asarray(yin, dtype=float) - self.Y0)
 
-        for p, q, k in pqk:
-            phi += k * dx**p * dy**q / 3600
+        # the series are in arc seconds
+        _pqk = self.PQK * [1, 1, 1 / 3600]
+        _pql = self.PQL * [1, 1, 1 / 3600]
+        phi = self._evaluate_series(self.PHI0, _pqk, dx, dy)
+        lam = self._evaluate_series(self.LAM0, _pql, dx, dy)
+        return np.stack([phi, lam], axis=-1)
 
-        for p, q, l in pql:
-            lam += l * dx**p * dy**q / 3600
+    def coordinates_to_wgs(self, coordinates_rd) -> np.ndarray:
+        """
+        Convert a sequence of (X, Y) RD points to WGS84.
 
-        return [phi, lam]
+        :param coordinates_rd: sequence of (X, Y) RD coordinates, e.g. `DikeSection.coordinates_rd`
+        :return: array of shape (number of points, 2) with the latitudes and longitudes
+        """
+        _coordinates_rd = np.asarray(coordinates_rd, dtype=float).reshape(-1, 2)
+        return self.to_wgs_array(_coordinates_rd[:, 0], _coordinates_rd[:, 1])
+
+    def to_rd(self, latin, lonin):
+        return self.to_rd_array(latin, lonin).tolist()
+
+    def to_wgs(self, xin, yin):
+        return self.to_wgs_array(xin, yin).tolist()
 
     @staticmethod
     def generate_coordinates_from_buffer(
         section_coordinates_rd: list, buffersize=60
-    ) -> list[list[float]]:
+    ) -> np.ndarray:
         """
         Generate the GWS coordinates for the buffer area around a section. This function distinguishes between cases
         where the buffer is a Polygon (most of the time) or a MultiPolygon (when the section is very short and at a
@@ -115,22 +152,23 @@ class GWSRDConvertor:
         :param section_coordinates_rd: coordinates of the section in RD
         :param buffersize: size of the buffer in meters
 
-        :return:
+        :return: array of shape (number of points, 2) with the latitudes and longitudes
         """
         _section_trajectory_rd = LineString(section_coordinates_rd)
         _trajectory_buffer = _section_trajectory_rd.buffer(buffersize, cap_style=2)
         # distinguish Polygon and MultiPolygon
         if isinstance(_trajectory_buffer, Polygon):
-            coordinates_wgs = [
-                GWSRDConvertor().to_wgs(pt[0], pt[1])
-                for pt in _trajectory_buffer.exterior.coords
-            ]  # convert in GWS coordinates:
+            coordinates_wgs = GWSRDConvertor().coordinates_to_wgs(
+                _trajectory_buffer.exterior.coords
+            )  # convert in GWS coordinates:
         elif isinstance(_trajectory_buffer, MultiPolygon):
-            coordinates_wgs = [
-                GWSRDConvertor().to_wgs(pt[0], pt[1])
-                for _trajectory_buffer_poly in _trajectory_buffer.geoms
-                for pt in _trajectory_buffer_poly.exterior.coords
-            ]
+            coordinates_wgs = GWSRDConvertor().coordinates_to_wgs(
+                [
+                    pt
+                    for _trajectory_buffer_poly in _trajectory_buffer.geoms
+                    for pt in _trajectory_buffer_poly.exterior.coords
+                ]
+            )
         else:
             raise ValueError("The buffer is not a Polygon or MultiPolygon")
         return coordinates_wgs
@@ -0,0 +1,140 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from src.linear_objects.dike_traject import DikeTraject
+from src.linear_objects.reinforcement_program import (
+    DikeProgram,
+    calc_area_stats_new,
+    deserialize_imported_runs,
+)
+from src.utils.traject_probability import TrajectProbabilityEngine
+
+RISK_YEARS = [2030, 2040, 2050, 2075]  # years of the risk table of the project page
+
+_worker_evaluator: Optional["ProgramBatchEvaluator"] = None
+
+
+@dataclass(frozen=True)
+class ProgramEvaluation:
+    name: str  # name of the candidate program
+    nb_projects: int
+    end_year: Optional[int]  # end year of the last project of the program
+    trajects_pf_over_time: dict  # see `DikeProgram.calc_trajects_failure_proba`
+    cost: float  # total cost of the projects of the program
+    risk_metrics: dict  # {"current": {year: risk}, "program": {year: risk}}
+
+    def to_table_row(self) -> dict:
+        """Row of the comparison table, the cost and risks in M€ as in the risk table of the project page."""
+        _row = {
+            "program": self.name,
+            "nb_projects": self.nb_projects,
+            "end_year": self.end_year,
+            "cost": round(self.cost / 1e6, 1),
+        }
+        for year in RISK_YEARS:
+            _row[f"program_risk_{year}"] = round(
+                self.risk_metrics["program"][year] / 1e6, 1
+            )
+        return _row
+
+
+class ProgramBatchEvaluator:
+    """
+    Evaluate alternative programs (project overviews) on the same imported runs. The trajects are deserialized and
+    their initial TrajectProbabilityEngine built once, and shared by all the evaluated programs.
+    """
+
+    dike_trajects: dict[str, DikeTraject]
+    traject_engines: dict[str, TrajectProbabilityEngine]
+
+    def __init__(self, imported_runs_data: dict):
+        """
+        :param imported_runs_data: stored data of all the imported runs as a dict with key format: "traject|run"
+        """
+        self.dike_trajects = deserialize_imported_runs(imported_runs_data)
+        self.traject_engines = {
+            run_name: TrajectProbabilityEngine.from_sections(dike_traject.dike_sections)
+            for run_name, dike_traject in self.dike_trajects.items()
+        }
+
+    def evaluate(self, name: str, project_overview_data: list) -> ProgramEvaluation:
+        """
+        Compute the traject probabilities of failure over time, the cost and the risks of a program.
+
+        :param name: name of the candidate program
+        :param project_overview_data: Overview of the projects with the selected sections, as in the project overview
+        store of the project page
+        :return: ProgramEvaluation
+        """
+        _program = DikeProgram.from_dike_trajects(
+            self.dike_trajects,
+            project_overview_data,
+            traject_engines=self.traject_engines,
+        )
+        _cost, _risk_metrics = calc_area_stats_new(_program)
+        return ProgramEvaluation(
+            name=name,
+            nb_projects=len(_program.projects),
+            end_year=max(
+                (project.end_year for project in _program.projects), default=None
+            ),
+            trajects_pf_over_time=_program.trajects_pf_over_time,
+            cost=_cost,
+            risk_metrics=_risk_metrics,
+        )
+
+
+def _initialize_worker(imported_runs_data: dict):
+    global _worker_evaluator
+    _worker_evaluator = ProgramBatchEvaluator(imported_runs_data)
+
+
+def _evaluate_in_worker(name: str, project_overview_data: list) -> ProgramEvaluation:
+    return _worker_evaluator.evaluate(name, project_overview_data)
+
+
+def evaluate_programs(
+    imported_runs_data: dict,
+    candidate_programs: dict[str, list],
+    max_workers: Optional[int] = None,
+) -> list[ProgramEvaluation]:
+    """
+    Evaluate many alternative programs on the same imported runs, without loading them one by one in the project page.
+    The programs are evaluated on a process pool, each worker deserializes the trajects once and reuses them for all the
+    programs it evaluates. The workers are spawned rather than forked, so they do not inherit the threads, locks and
+    open connections of the current (Dash server) process.
+
+    :param imported_runs_data: stored data of all the imported runs as a dict with key format: "traject|run"
+    :param candidate_programs: dict {program name: project overview data}
+    :param max_workers: number of worker processes, defaults to the number of CPUs. With 1 worker or a single program,
+    the programs are evaluated in the current process.
+    :return: list of ProgramEvaluation, in the order of candidate_programs
+    """
+    _names = list(candidate_programs.keys())
+    _project_overviews = [candidate_programs[name] for name in _names]
+    _max_workers = min(max_workers or os.cpu_count() or 1, len(_names))
+
+    if _max_workers <= 1:
+        _evaluator = ProgramBatchEvaluator(imported_runs_data)
+        return list(map(_evaluator.evaluate, _names, _project_overviews))
+
+    with ProcessPoolExecutor(
+        max_workers=_max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_initialize_worker,
+        initargs=(imported_runs_data,),
+    ) as _executor:
+        return list(_executor.map(_evaluate_in_worker, _names, _project_overviews))
+
+
+def get_program_comparison_table(evaluations: list[ProgramEvaluation]) -> list[dict]:
+    """
+    Return the comparison table of the evaluated programs as rowData for a dash AgGrid.
+
+    :param evaluations: list of ProgramEvaluation, see `evaluate_programs`
+    :return: list of dict, one row per program
+    """
+    return [evaluation.to_table_row() for evaluation in evaluations]
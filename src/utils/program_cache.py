@@ -0,0 +1,67 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.linear_objects.reinforcement_program import DikeProgram, calc_area_stats_new
+from src.utils.utils import MyEncoder
+
+PROGRAM_CACHE_SIZE = 8  # number of programs kept in memory
+
+_programs: OrderedDict[str, "CachedProgram"] = OrderedDict()
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CachedProgram:
+    program: DikeProgram
+    cost: float  # total cost of the projects of the program
+    risk_metrics: dict  # {"current": {year: risk}, "program": {year: risk}}
+
+
+def get_program_digest(imported_runs_data: dict, project_overview_data: list) -> str:
+    """
+    Returns a stable digest of the content of the imported runs and project overview stores: the same content gives
+    the same digest, whatever the order of the keys.
+
+    :param imported_runs_data: stored data of all the imported runs
+    :param project_overview_data: overview of the projects with the selected sections
+    :return: sha256 hex digest
+    """
+    return hashlib.sha256(
+        json.dumps(
+            [imported_runs_data, project_overview_data], cls=MyEncoder, sort_keys=True
+        ).encode()
+    ).hexdigest()
+
+
+def get_cached_program(
+    imported_runs_data: dict, project_overview_data: list
+) -> CachedProgram:
+    """
+    Returns the DikeProgram of the imported runs and projects together with its cost and risk metrics (see
+    `calc_area_stats_new`). The program is only built the first time for a given content of the stores, e.g. switching
+    the result type displayed on the project page reuses it.
+
+    The returned program is shared and must not be modified.
+
+    :param imported_runs_data: stored data of all the imported runs
+    :param project_overview_data: overview of the projects with the selected sections
+    :return: CachedProgram
+    """
+    _key = get_program_digest(imported_runs_data, project_overview_data)
+    with _lock:
+        if _key in _programs:
+            _programs.move_to_end(_key)
+            return _programs[_key]
+
+    _program = DikeProgram(imported_runs_data, project_overview_data)
+    _cost, _risk_metrics = calc_area_stats_new(_program)
+    _cached_program = CachedProgram(_program, _cost, _risk_metrics)
+
+    with _lock:
+        _programs[_key] = _cached_program
+        while len(_programs) > PROGRAM_CACHE_SIZE:
+            _programs.popitem(last=False)
+    return _cached_program
@@ -0,0 +1,69 @@
+"""
+Conversions between the reliability index beta and the probability of failure pf = Phi(-beta).
+
+The functions are ufunc based: they accept a scalar, a list or an array of any shape (e.g. a section x year matrix)
+and convert it in one call. They give the same values as `scipy.stats.norm.cdf` and `scipy.stats.norm.ppf`, without
+the overhead of the scipy.stats distributions, which dominates when converting scalars or small arrays.
+
+For high reliability indices (beta > ~37) pf underflows to 0, use the log-space functions to keep the precision.
+"""
+
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.special import log_ndtr, ndtr, ndtri, ndtri_exp
+
+
+def beta_to_pf(beta: ArrayLike) -> Union[np.ndarray, float]:
+    """
+    Probability of failure of a reliability index beta.
+
+    :param beta: reliability index, scalar or array-like
+    :return: pf = Phi(-beta), with the shape of beta
+    """
+    return ndtr(np.negative(beta))
+
+
+def pf_to_beta(pf: ArrayLike) -> Union[np.ndarray, float]:
+    """
+    Reliability index beta of a probability of failure.
+
+    :param pf: probability of failure, scalar or array-like, NaN outside [0, 1]
+    :return: beta = -Phi^-1(pf), with the shape of pf
+    """
+    return np.negative(ndtri(pf))
+
+
+def beta_to_log_pf(beta: ArrayLike) -> Union[np.ndarray, float]:
+    """
+    Natural logarithm of the probability of failure of a reliability index beta, accurate for high betas.
+
+    :param beta: reliability index, scalar or array-like
+    :return: log(Phi(-beta)), with the shape of beta
+    """
+    return log_ndtr(np.negative(beta))
+
+
+def log_pf_to_beta(log_pf: ArrayLike) -> Union[np.ndarray, float]:
+    """
+    Reliability index beta of the natural logarithm of a probability of failure, inverse of `beta_to_log_pf`.
+
+    :param log_pf: logarithm of the probability of failure, scalar or array-like
+    :return: beta = -Phi^-1(exp(log_pf)), with the shape of log_pf
+    """
+    return np.negative(ndtri_exp(log_pf))
+
+
+def combine_betas_in_series(betas: ArrayLike, axis: int = 0) -> np.ndarray:
+    """
+    Reliability index of independent components in series, e.g. the mechanisms of a section:
+    pf = 1 - prod(1 - pf_i). The product is computed as a sum of log(1 - pf_i) = log(Phi(beta_i)), so the combined
+    beta stays accurate when all the pf_i are small.
+
+    :param betas: reliability indices of the components, array-like
+    :param axis: axis of the components
+    :return: combined reliability indices, betas reduced over axis
+    """
+    _log_p_non_failure = np.sum(log_ndtr(np.asarray(betas, dtype=float)), axis=axis)
+    return pf_to_beta(-np.expm1(_log_p_non_failure))
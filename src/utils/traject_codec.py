@@ -0,0 +1,210 @@
+import json
+import struct
+import zlib
+from typing import Any
+
+import numpy as np
+
+FORMAT_MAGIC = b"VRDT"
+FORMAT_VERSION = 1
+FORMAT_EXTENSION = ".vrdt"
+
+# magic, version, flags, size of the (uncompressed) header
+_PREFIX = struct.Struct("<4sHHI")
+_FLAG_ZLIB = 1
+_ALIGNMENT = 8
+
+# buffer of the floats, of the integers and of the indices in the string table
+_FLOAT_REF, _INT_REF, _STRING_REF, _DICT_REF = "$f", "$i", "$s", "$d"
+_INT_DTYPE = np.dtype("<i8")
+_STRING_INDEX_DTYPE = np.dtype("<i4")
+
+
+def _is_float(value: Any) -> bool:
+    return type(value) is float or isinstance(value, np.floating)
+
+
+def _is_int(value: Any) -> bool:
+    return type(value) is int or isinstance(value, np.integer)
+
+
+class _Encoder:
+    """Walk a serialized object and move the numeric and string lists to the columnar buffers."""
+
+    def __init__(self):
+        self.floats: list[float] = []
+        self.ints: list[int] = []
+        self.string_indices: list[int] = []
+        self.strings: dict[str, int] = {}
+
+    def encode(self, obj: Any) -> Any:
+        if isinstance(obj, np.ndarray):
+            return self.encode(obj.tolist())
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, dict):
+            _encoded = {key: self.encode(value) for key, value in obj.items()}
+            if any(isinstance(key, str) and key.startswith("$") for key in obj):
+                return {_DICT_REF: _encoded}
+            return _encoded
+        if isinstance(obj, (list, tuple)):
+            return self._encode_list(obj)
+        return obj
+
+    def _encode_list(self, values: list) -> Any:
+        if len(values) == 0:
+            return []
+        if all(_is_float(value) for value in values):
+            return {_FLOAT_REF: self._append(self.floats, values)}
+        if all(_is_int(value) for value in values):
+            return {_INT_REF: self._append(self.ints, values)}
+        if all(type(value) is str for value in values):
+            _indices = [
+                self.strings.setdefault(value, len(self.strings)) for value in values
+            ]
+            return {_STRING_REF: self._append(self.string_indices, _indices)}
+        # rows of floats of the same length, e.g. coordinates
+        if all(
+            isinstance(row, (list, tuple))
+            and len(row) == len(values[0]) > 0
+            and all(_is_float(value) for value in row)
+            for row in values
+        ):
+            _start = len(self.floats)
+            for row in values:
+                self.floats.extend(row)
+            return {_FLOAT_REF: [_start, len(values), len(values[0])]}
+        return [self.encode(value) for value in values]
+
+    @staticmethod
+    def _append(buffer: list, values: list) -> list[int]:
+        _start = len(buffer)
+        buffer.extend(values)
+        return [_start, len(values)]
+
+
+def _align(size: int) -> int:
+    return -size % _ALIGNMENT
+
+
+def encode_dike_traject_data(
+    data: dict, float_dtype: str = "<f8", compress: bool = True
+) -> bytes:
+    """
+    Encode a serialized DikeTraject (see `DikeTraject.serialize`), or any JSON-like dict of serialized trajects, in a
+    compact columnar binary format:
+        - all the lists of floats (betas per section, mechanism and year, coordinates, ...) are stored in one float
+        buffer, the lists of integers in one integer buffer,
+        - the lists of strings (reinforcement orders, mechanisms) are stored as indices in a string table,
+        - the remaining structure is kept as a small JSON header referencing the buffers.
+
+    With the default float64 the data is decoded exactly (see `decode_dike_traject_data`), float32 halves the size of
+    the float buffer but rounds the values.
+
+    :param data: serialized DikeTraject
+    :param float_dtype: dtype of the float buffer, "<f8" (exact) or "<f4"
+    :param compress: compress the header and buffers with zlib
+    :return: encoded bytes, starting with FORMAT_MAGIC
+    """
+    _encoder = _Encoder()
+    _root = _encoder.encode(data)
+
+    _buffers = [
+        np.asarray(_encoder.floats, dtype=np.dtype(float_dtype)),
+        np.asarray(_encoder.ints, dtype=_INT_DTYPE),
+        np.asarray(_encoder.string_indices, dtype=_STRING_INDEX_DTYPE),
+    ]
+    _header = {
+        "root": _root,
+        "strings": list(_encoder.strings),
+        "buffers": [[_buffer.dtype.str, _buffer.size] for _buffer in _buffers],
+    }
+    _header_bytes = json.dumps(_header, separators=(",", ":")).encode()
+
+    _body = [_header_bytes, b"\0" * _align(len(_header_bytes))]
+    for _buffer in _buffers:
+        _body.append(_buffer.tobytes())
+        _body.append(b"\0" * _align(_buffer.nbytes))
+    _body = b"".join(_body)
+
+    _flags = 0
+    if compress:
+        _body = zlib.compress(_body)
+        _flags |= _FLAG_ZLIB
+    return (
+        _PREFIX.pack(FORMAT_MAGIC, FORMAT_VERSION, _flags, len(_header_bytes)) + _body
+    )
+
+
+def is_encoded_dike_traject_data(content: bytes) -> bool:
+    """Returns True if the content is in the binary format of `encode_dike_traject_data`."""
+    return bytes(content[: len(FORMAT_MAGIC)]) == FORMAT_MAGIC
+
+
+def decode_dike_traject_data(content: bytes, as_arrays: bool = False) -> dict:
+    """
+    Decode the binary format of `encode_dike_traject_data`.
+
+    :param content: encoded bytes
+    :param as_arrays: if True, the numeric lists are returned as read-only NumPy arrays viewing the decoded buffers
+    (without copy), and the lists of strings as lists. Otherwise the lists are returned as lists, equal to the
+    serialized data, so the result can be passed to `DikeTraject.deserialize`.
+    :return: serialized DikeTraject
+    """
+    _magic, _version, _flags, _header_size = _PREFIX.unpack_from(content)
+    if _magic != FORMAT_MAGIC:
+        raise ValueError("Not an encoded dike traject")
+    if _version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported version {_version} of the dike traject format")
+
+    _body = memoryview(content)[_PREFIX.size :]
+    if _flags & _FLAG_ZLIB:
+        _body = memoryview(zlib.decompress(_body))
+
+    _header = json.loads(bytes(_body[:_header_size]))
+    _offset = _header_size + _align(_header_size)
+    _buffers = []
+    for _dtype, _size in _header["buffers"]:
+        _buffer = np.frombuffer(
+            _body, dtype=np.dtype(_dtype), count=_size, offset=_offset
+        )
+        _buffers.append(_buffer)
+        _offset += _buffer.nbytes + _align(_buffer.nbytes)
+    _floats, _ints, _string_indices = _buffers
+    _strings = _header["strings"]
+
+    def decode(obj: Any) -> Any:
+        if isinstance(obj, list):
+            return [decode(value) for value in obj]
+        if not isinstance(obj, dict):
+            return obj
+        if _DICT_REF in obj:
+            return {key: decode(value) for key, value in obj[_DICT_REF].items()}
+        if _FLOAT_REF in obj:
+            _start, _length, *_width = obj[_FLOAT_REF]
+            _size = _length * (_width[0] if _width else 1)
+            _values = _floats[_start : _start + _size].reshape(_length, *_width)
+            return _values if as_arrays else _values.tolist()
+        if _INT_REF in obj:
+            _start, _length = obj[_INT_REF]
+            _values = _ints[_start : _start + _length]
+            return _values if as_arrays else _values.tolist()
+        if _STRING_REF in obj:
+            _start, _length = obj[_STRING_REF]
+            return [_strings[i] for i in _string_indices[_start : _start + _length]]
+        return {key: decode(value) for key, value in obj.items()}
+
+    return decode(_header["root"])
+
+
+def load_dike_traject_data(content: bytes) -> dict:
+    """
+    Load a serialized DikeTraject from the content of a file, either in the binary format of
+    `encode_dike_traject_data` or, as fallback, in JSON.
+
+    :param content: content of the file
+    :return: serialized DikeTraject
+    """
+    if is_encoded_dike_traject_data(content):
+        return decode_dike_traject_data(content)
+    return json.loads(content)
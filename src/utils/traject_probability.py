@@ -1,6 +1,11 @@
+from typing import Sequence
+
+import numpy as np
 import pandas as pd
+from vrtool.common.enums import MechanismEnum
 
 from src.linear_objects.dike_section import DikeSection
+from src.utils.utils import beta_to_pf
 
 
 def get_updated_beta_df(
@@ -36,3 +41,474 @@ def get_updated_beta_df(
                 beta_df.loc[mask, year] = beta
 
     return beta_df
+
+
+TRAJECT_MECHANISMS = ["Overflow", "Piping", "StabilityInner", "Revetment"]
+MIN_BETA_MECHANISMS = [
+    "Overflow",
+    "Revetment",
+]  # the weakest section governs the traject, the other mechanisms are combined as 1-prod(1-pf)
+MIN_BETA_MECHANISM_ENUMS = [MechanismEnum.OVERFLOW, MechanismEnum.REVETMENT]
+PRODUCT_MECHANISM_ENUMS = [MechanismEnum.PIPING, MechanismEnum.STABILITY_INNER]
+
+
+def calc_system_failure_probability(
+    betas: np.ndarray, is_present: np.ndarray, is_min_beta: Sequence[bool]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the probability of failure of a traject from the betas of its sections, per mechanism and combined:
+        - for the mechanisms with is_min_beta (Overflow, Revetment) the weakest section governs, the traject pf is the
+        pf of the minimum beta over the sections,
+        - for the other mechanisms (Piping, StabilityInner) the sections are independent, 1 - prod(1 - pf),
+        - the mechanisms are combined as 1 - prod(1 - pf), see `calculate_traject_probability`.
+
+    Any leading axes are batch axes, e.g. all the greedy steps of a run or all the candidate programs are evaluated in
+    one call.
+
+    :param betas: array (..., section, mechanism, time) of the betas of the sections
+    :param is_present: boolean array (..., section, mechanism, time), or (..., section, mechanism) when a section has
+    a beta for all the times or none. The betas of the absent entries are ignored.
+    :param is_min_beta: for every mechanism, True if the weakest section governs the traject
+    :return: tuple with
+        - the traject pf per mechanism, array (..., mechanism, time), 0 where no section has a beta,
+        - the mask of the traject pf per mechanism, array (..., mechanism, time), True where a section has a beta,
+        - the traject pf of all the mechanisms combined, array (..., time)
+    """
+    _betas = np.asarray(betas, dtype=float)
+    _is_present = np.asarray(is_present, dtype=bool)
+    if _is_present.ndim == _betas.ndim - 1:
+        _is_present = _is_present[..., None]
+    _is_present = np.broadcast_to(_is_present, _betas.shape)
+    _is_min_beta = np.asarray(is_min_beta, dtype=bool)
+
+    _mechanism_pf = np.empty(_betas.shape[:-3] + _betas.shape[-2:])
+    if _is_min_beta.any():
+        _min_betas = np.where(_is_present, _betas, np.inf)[..., _is_min_beta, :]
+        _mechanism_pf[..., _is_min_beta, :] = beta_to_pf(np.min(_min_betas, axis=-3))
+    if not _is_min_beta.all():
+        _p_non_failure = np.where(
+            _is_present[..., ~_is_min_beta, :],
+            np.subtract(1, beta_to_pf(_betas[..., ~_is_min_beta, :])),
+            1,
+        )
+        _mechanism_pf[..., ~_is_min_beta, :] = 1 - np.prod(_p_non_failure, axis=-3)
+
+    _is_mechanism_present = _is_present.any(axis=-3)
+    _traject_pf = 1 - np.prod(
+        np.where(_is_mechanism_present, np.subtract(1, _mechanism_pf), 1), axis=-2
+    )
+    return _mechanism_pf, _is_mechanism_present, _traject_pf
+
+
+def calc_leave_one_out_failure_probability(
+    betas: np.ndarray,
+    is_present: np.ndarray,
+    replacement_betas: np.ndarray,
+    replacement_is_present: np.ndarray,
+    is_min_beta: Sequence[bool],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the traject probability of failure per mechanism when the betas of a single section are replaced, for
+    every section at once, same result as `calc_system_failure_probability` on the traject with the replaced section.
+
+    The aggregates over all the sections are computed once, together with what is needed to take a section out of
+    them: the two lowest betas for the mechanisms where the weakest section governs, and the products of (1 - pf) of
+    the sections before and after each section for the other mechanisms. The effect of each section is then
+    O(mechanisms x times).
+
+    :param betas: array (section, mechanism, time) of the betas of the sections
+    :param is_present: boolean array (section, mechanism, time), False where the section has no beta
+    :param replacement_betas: array (section, mechanism, time), betas replacing the betas of each section
+    :param replacement_is_present: boolean array (section, mechanism, time), presence of the replacement betas
+    :param is_min_beta: for every mechanism, True if the weakest section governs the traject
+    :return: tuple with the traject pf per mechanism and its mask, arrays (section, mechanism, time): the traject
+    with the betas of the section at the first index replaced, see `calc_system_failure_probability`
+    """
+    _betas = np.asarray(betas, dtype=float)
+    _is_present = np.asarray(is_present, dtype=bool)
+    _replacement_betas = np.asarray(replacement_betas, dtype=float)
+    _replacement_is_present = np.asarray(replacement_is_present, dtype=bool)
+    _is_min_beta = np.asarray(is_min_beta, dtype=bool)
+    _nb_sections = _betas.shape[0]
+
+    _mechanism_pf = np.empty(_betas.shape)
+    if _is_min_beta.any():
+        _min_betas = np.where(_is_present, _betas, np.inf)[:, _is_min_beta]
+        _lowest = np.min(_min_betas, axis=0)
+        _second_lowest = (
+            np.partition(_min_betas, 1, axis=0)[1]
+            if _nb_sections > 1
+            else np.full_like(_lowest, np.inf)
+        )
+        _is_governing = np.arange(_nb_sections)[:, None, None] == np.argmin(
+            _min_betas, axis=0
+        )
+        _lowest_of_others = np.where(_is_governing, _second_lowest, _lowest)
+        _replacement = np.where(_replacement_is_present, _replacement_betas, np.inf)[
+            :, _is_min_beta
+        ]
+        _mechanism_pf[:, _is_min_beta] = beta_to_pf(
+            np.minimum(_lowest_of_others, _replacement)
+        )
+    if not _is_min_beta.all():
+        _p_non_failure = np.where(
+            _is_present[:, ~_is_min_beta],
+            np.subtract(1, beta_to_pf(_betas[:, ~_is_min_beta])),
+            1,
+        )
+        # products of the sections before and after each section
+        _ones = np.ones((1,) + _p_non_failure.shape[1:])
+        _before = np.cumprod(np.concatenate([_ones, _p_non_failure[:-1]]), axis=0)
+        _after = np.cumprod(np.concatenate([_ones, _p_non_failure[:0:-1]]), axis=0)[
+            ::-1
+        ]
+        _replacement = np.where(
+            _replacement_is_present[:, ~_is_min_beta],
+            np.subtract(1, beta_to_pf(_replacement_betas[:, ~_is_min_beta])),
+            1,
+        )
+        _mechanism_pf[:, ~_is_min_beta] = 1 - _before * _after * _replacement
+
+    _nb_present = _is_present.sum(axis=0)
+    _is_mechanism_present = (_nb_present - _is_present + _replacement_is_present) > 0
+    _mechanism_pf[~_is_mechanism_present] = 0
+    return _mechanism_pf, _is_mechanism_present
+
+
+def is_min_beta_mechanism(mechanism: MechanismEnum) -> bool:
+    """Returns True if the weakest section governs the traject for the mechanism, see
+    `calc_system_failure_probability`."""
+    if mechanism in MIN_BETA_MECHANISM_ENUMS:
+        return True
+    if mechanism in PRODUCT_MECHANISM_ENUMS:
+        return False
+    raise ValueError(f"Mechanism {mechanism} not recognized.")
+
+
+def get_traject_reliability_sections(traject_reliabilities: list[dict]) -> list:
+    """Returns the sections of the traject reliabilities, in the order of the section axis of
+    `get_traject_reliability_arrays`."""
+    return list(
+        dict.fromkeys(
+            section
+            for _reliability in traject_reliabilities
+            for _sections in _reliability.values()
+            for section in _sections
+        )
+    )
+
+
+def get_traject_reliability_arrays(
+    traject_reliabilities: list[dict],
+) -> tuple[np.ndarray, np.ndarray, list[MechanismEnum], list]:
+    """
+    Convert traject reliabilities {mechanism: {section: {"beta": [...], "time": [...]}}}, see
+    `get_traject_reliability`, to the arrays of `calc_system_failure_probability`. The sections, mechanisms and times
+    are the union of the ones of all the traject reliabilities.
+
+    :param traject_reliabilities: list of traject reliabilities, first (batch) axis of the arrays
+    :return: tuple with the betas and presence mask (batch, section, mechanism, time), the mechanisms and the sorted
+    times
+    """
+    _mechanisms = list(
+        dict.fromkeys(m for _reliability in traject_reliabilities for m in _reliability)
+    )
+    _sections = get_traject_reliability_sections(traject_reliabilities)
+    _times = sorted(
+        {
+            t
+            for _reliability in traject_reliabilities
+            for _sections in _reliability.values()
+            for _section_reliability in _sections.values()
+            for t in _section_reliability["time"]
+        }
+    )
+    _section_index = {section: i for i, section in enumerate(_sections)}
+    _time_index = {t: i for i, t in enumerate(_times)}
+
+    _shape = (len(traject_reliabilities), len(_sections), len(_mechanisms), len(_times))
+    _betas = np.zeros(_shape)
+    _is_present = np.zeros(_shape, dtype=bool)
+    for _batch_index, _reliability in enumerate(traject_reliabilities):
+        for _mechanism_index, mechanism in enumerate(_mechanisms):
+            for section, _section_reliability in _reliability.get(
+                mechanism, {}
+            ).items():
+                _columns = [
+                    _time_index[t]
+                    for t, _ in zip(
+                        _section_reliability["time"], _section_reliability["beta"]
+                    )
+                ]
+                _index = (_batch_index, _section_index[section], _mechanism_index)
+                _betas[_index + (_columns,)] = _section_reliability["beta"][
+                    : len(_columns)
+                ]
+                _is_present[_index + (_columns,)] = True
+    return _betas, _is_present, _mechanisms, _times
+
+
+def calc_traject_probability_per_mechanism(
+    traject_reliabilities: list[dict],
+) -> list[dict]:
+    """
+    Compute in one call the traject probability of failure per mechanism of several traject reliabilities
+    {mechanism: {section: {"beta": [...], "time": [...]}}}, e.g. the assessment after every greedy step.
+
+    :param traject_reliabilities: list of traject reliabilities
+    :return: list of dict {mechanism: {time: traject pf}}, the times without any section beta are left out
+    """
+    _betas, _is_present, _mechanisms, _times = get_traject_reliability_arrays(
+        traject_reliabilities
+    )
+    return get_traject_probability_per_mechanism(
+        _betas, _is_present, _mechanisms, _times
+    )
+
+
+def get_traject_probability_per_mechanism(
+    betas: np.ndarray, is_present: np.ndarray, mechanisms: list, times: list
+) -> list[dict]:
+    """
+    Compute the traject probability of failure per mechanism of a batch of arrays, see
+    `get_traject_reliability_arrays`.
+
+    :return: list of dict {mechanism: {time: traject pf}}, one per batch index
+    """
+    _mechanism_pf, _is_mechanism_present, _ = calc_system_failure_probability(
+        betas, is_present, [is_min_beta_mechanism(m) for m in mechanisms]
+    )
+    _mechanism_pf = _mechanism_pf.tolist()
+    return [
+        {
+            mechanism: {
+                t: _mechanism_pf[_batch_index][_mechanism_index][_time_index]
+                for _time_index, t in enumerate(times)
+                if _is_mechanism_present[_batch_index, _mechanism_index, _time_index]
+            }
+            for _mechanism_index, mechanism in enumerate(mechanisms)
+        }
+        for _batch_index in range(len(betas))
+    ]
+
+
+class TrajectProbabilityEngine:
+    """
+    NumPy engine computing the probability of failure of a traject from the betas of its sections.
+
+    The betas are stored in a dense (section, mechanism, year) tensor. Updating the betas of a section is an index
+    write, after which the traject probability is updated incrementally:
+        - for Overflow and Revetment, the minimum beta over the sections is only recomputed for the years where the
+        replaced section was governing,
+        - for Piping and StabilityInner, the running product of (1-pf) over the sections is updated by dividing out the
+        replaced section and multiplying in the new one.
+
+    The returned probabilities have the same format as `get_traject_prob`.
+    """
+
+    section_names: list[str]
+    years: list[int]
+
+    def __init__(
+        self,
+        section_names: list[str],
+        years: list[int],
+        betas: np.ndarray,
+        is_present: np.ndarray,
+    ):
+        """
+        :param section_names: names of the sections, first axis of the tensor
+        :param years: years of the betas, last axis of the tensor
+        :param betas: array of shape (section, mechanism, year) with the betas, mechanisms ordered as
+        TRAJECT_MECHANISMS.
+        :param is_present: boolean array of shape (section, mechanism), False when the section has no result for the
+        mechanism (e.g. no revetment). Absent rows are ignored in the traject probability and by the updates.
+        """
+        self.section_names = list(section_names)
+        self.years = list(years)
+        self._section_index = {name: i for i, name in enumerate(self.section_names)}
+        self._is_present = np.asarray(is_present, dtype=bool).reshape(
+            len(self.section_names), len(TRAJECT_MECHANISMS)
+        )
+        self._betas = np.asarray(betas, dtype=float).reshape(
+            len(self.section_names), len(TRAJECT_MECHANISMS), len(self.years)
+        )
+        self._betas[~self._is_present] = np.nan
+        self._aggregates = np.empty((len(TRAJECT_MECHANISMS), len(self.years)))
+        for _mechanism_index in range(len(TRAJECT_MECHANISMS)):
+            self._recompute_aggregate(_mechanism_index)
+
+    @classmethod
+    def from_sections(cls, sections: list[DikeSection]) -> "TrajectProbabilityEngine":
+        """Initialize the engine with the initial assessment of the sections, same selection as
+        `get_initial_assessment_df`."""
+        years = sections[0].years
+        _names, _betas, _is_present = [], [], []
+
+        for section in sections:
+            if not section.in_analyse:
+                continue
+            if (
+                not section.is_reinforced_doorsnede
+                and not section.is_reinforced_veiligheidsrendement
+            ):
+                continue
+
+            mechanisms = ["Overflow", "StabilityInner", "Piping"]
+            if section.revetment and len(section.initial_assessment["Revetment"]) > 0:
+                mechanisms.append("Revetment")
+
+            _section_betas = np.full((len(TRAJECT_MECHANISMS), len(years)), np.nan)
+            for mechanism in mechanisms:
+                _values = section.initial_assessment[mechanism][: len(years)]
+                _section_betas[TRAJECT_MECHANISMS.index(mechanism), : len(_values)] = (
+                    _values
+                )
+            _names.append(section.name)
+            _betas.append(_section_betas)
+            _is_present.append(
+                [mechanism in mechanisms for mechanism in TRAJECT_MECHANISMS]
+            )
+
+        return cls(_names, years, np.array(_betas), np.array(_is_present))
+
+    @classmethod
+    def from_beta_df(cls, beta_df: pd.DataFrame) -> "TrajectProbabilityEngine":
+        """Initialize the engine from a dataframe as returned by `get_initial_assessment_df`."""
+        years = [
+            column
+            for column in beta_df.columns
+            if column not in ["name", "mechanism", "Length", "index"]
+        ]
+        _names = list(dict.fromkeys(beta_df["name"]))
+        _section_index = {name: i for i, name in enumerate(_names)}
+        _betas = np.full((len(_names), len(TRAJECT_MECHANISMS), len(years)), np.nan)
+        _is_present = np.zeros((len(_names), len(TRAJECT_MECHANISMS)), dtype=bool)
+
+        _values = beta_df[years].to_numpy(dtype=float)
+        for _row, (name, mechanism) in enumerate(
+            zip(beta_df["name"], beta_df["mechanism"])
+        ):
+            if mechanism not in TRAJECT_MECHANISMS:
+                continue
+            _index = (_section_index[name], TRAJECT_MECHANISMS.index(mechanism))
+            _betas[_index] = _values[_row]
+            _is_present[_index] = True
+
+        return cls(_names, years, _betas, _is_present)
+
+    def copy(self) -> "TrajectProbabilityEngine":
+        """Return an independent copy of the engine, e.g. to apply different updates to the same initial betas."""
+        _engine = TrajectProbabilityEngine.__new__(TrajectProbabilityEngine)
+        _engine.section_names = self.section_names
+        _engine.years = self.years
+        _engine._section_index = self._section_index
+        _engine._is_present = self._is_present
+        _engine._betas = self._betas.copy()
+        _engine._aggregates = self._aggregates.copy()
+        return _engine
+
+    def _recompute_aggregate(self, mechanism_index: int):
+        _betas = self._betas[:, mechanism_index, :]
+        if TRAJECT_MECHANISMS[mechanism_index] in MIN_BETA_MECHANISMS:
+            self._aggregates[mechanism_index] = (
+                np.fmin.reduce(_betas, axis=0)
+                if len(_betas)
+                else np.full(len(self.years), np.nan)
+            )
+        else:
+            _p_non_failure = np.where(
+                self._is_present[:, mechanism_index, None], 1 - beta_to_pf(_betas), 1
+            )
+            self._aggregates[mechanism_index] = np.prod(_p_non_failure, axis=0)
+
+    def update_section(self, section_name: str, betas: dict[str, list[float]]):
+        """
+        Replace the betas of a section for the given mechanisms and update the traject aggregates.
+        Sections or mechanisms that are not part of the engine are ignored. When fewer betas than years are given,
+        only the first years are replaced.
+
+        :param section_name: name of the section to update
+        :param betas: dict {mechanism: list of betas per year}
+        """
+        _section_index = self._section_index.get(section_name)
+        if _section_index is None:
+            return
+
+        for mechanism, _new_values in betas.items():
+            if mechanism not in TRAJECT_MECHANISMS:
+                continue
+            _mechanism_index = TRAJECT_MECHANISMS.index(mechanism)
+            if not self._is_present[_section_index, _mechanism_index]:
+                continue
+
+            _old = self._betas[_section_index, _mechanism_index].copy()
+            _new_values = np.asarray(_new_values, dtype=float)[: len(self.years)]
+            _new = _old.copy()
+            _new[: len(_new_values)] = _new_values
+            self._betas[_section_index, _mechanism_index] = _new
+
+            if mechanism in MIN_BETA_MECHANISMS:
+                self._update_min(_mechanism_index, _old, _new)
+            else:
+                self._update_product(_mechanism_index, _old, _new)
+
+    def _update_min(self, mechanism_index: int, old: np.ndarray, new: np.ndarray):
+        _current = self._aggregates[mechanism_index]
+        # years where the replaced section was governing and is weakened (or lost): the minimum must be recomputed
+        _is_stale = (old == _current) & ~(new <= old)
+        self._aggregates[mechanism_index] = np.fmin(_current, new)
+        if _is_stale.any():
+            self._aggregates[mechanism_index, _is_stale] = np.fmin.reduce(
+                self._betas[:, mechanism_index, _is_stale], axis=0
+            )
+
+    def _update_product(self, mechanism_index: int, old: np.ndarray, new: np.ndarray):
+        _old_p_non_failure = 1 - beta_to_pf(old)
+        if not np.all(_old_p_non_failure > 0) or not np.all(
+            np.isfinite(self._aggregates[mechanism_index])
+        ):
+            # the replaced section cannot be divided out (pf = 1 or missing values)
+            self._recompute_aggregate(mechanism_index)
+            return
+        self._aggregates[mechanism_index] *= (1 - beta_to_pf(new)) / _old_p_non_failure
+
+    def traject_probability(self) -> tuple[np.ndarray, dict]:
+        """
+        Return the probability of failure of the traject for every year, as the sum of the traject probability of each
+        mechanism, and the traject probability per mechanism.
+
+        :return: tuple with an array of shape (1, year) and a dict {mechanism: array of pf per year}. The mechanisms
+        without any section result are an empty list and are not included in the total.
+        """
+        traject_probs = dict((mechanism, []) for mechanism in TRAJECT_MECHANISMS)
+        total_traject_prob = np.zeros((1, len(self.years)))
+        for _mechanism_index, mechanism in enumerate(TRAJECT_MECHANISMS):
+            if not self._is_present[:, _mechanism_index].any():
+                continue
+            if mechanism in MIN_BETA_MECHANISMS:
+                traject_probs[mechanism] = beta_to_pf(
+                    self._aggregates[_mechanism_index]
+                )
+            else:
+                traject_probs[mechanism] = 1 - self._aggregates[_mechanism_index]
+            total_traject_prob += traject_probs[mechanism]
+        return total_traject_prob, traject_probs
+
+    def replay(
+        self, section_updates: list[tuple[str, dict[str, list[float]]]]
+    ) -> np.ndarray:
+        """
+        Apply successively the updates of the sections and return the traject probability of failure after each of
+        them in one pass.
+
+        :param section_updates: list of tuples (section name, {mechanism: betas}) in the order they are applied
+        :return: array of shape (1 + number of updates, year). The first row is the traject probability before the
+        updates.
+        """
+        _traject_pf = np.empty((len(section_updates) + 1, len(self.years)))
+        _traject_pf[0] = self.traject_probability()[0]
+        for _step, (section_name, betas) in enumerate(section_updates, 1):
+            self.update_section(section_name, betas)
+            _traject_pf[_step] = self.traject_probability()[0]
+        return _traject_pf
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import diskcache
+from dash.exceptions import PreventUpdate
+
+from src.linear_objects.dike_traject import DikeTraject
+from src.utils.traject_codec import decode_dike_traject_data, encode_dike_traject_data
+from src.utils.utils import MyEncoder
+
+TRAJECT_TOKEN_KEY = "dike_traject_token"
+TRAJECT_STORE_DIRECTORY = Path("./cache/traject_store")
+# 1 GB on disk, least recently used trajects are evicted first
+TRAJECT_STORE_SIZE_LIMIT = 2**30
+TRAJECT_STORE_LRU_SIZE = 16  # number of deserialized DikeTraject kept in memory
+
+_traject_store: Optional[diskcache.Cache] = None
+_deserialized_trajects: OrderedDict[str, DikeTraject] = OrderedDict()
+_lock = threading.Lock()
+
+
+class TrajectNotFound(PreventUpdate):
+    """
+    Raised when the token of "stored-data" is not (anymore) in the traject store, e.g. after the eviction of the traject
+    or when the cache directory was cleared. As a PreventUpdate, it stops the callback reading the traject without
+    updating its outputs. The user is asked to re-import the run, see `is_dike_traject_stored`.
+    """
+
+
+def get_traject_store() -> diskcache.Cache:
+    """Returns the server-side store of the serialized DikeTraject objects, the store is created on first use."""
+    global _traject_store
+    if _traject_store is None:
+        _traject_store = diskcache.Cache(
+            str(TRAJECT_STORE_DIRECTORY),
+            size_limit=TRAJECT_STORE_SIZE_LIMIT,
+            eviction_policy="least-recently-used",
+        )
+    return _traject_store
+
+
+def store_dike_traject_data(dike_traject_data: dict) -> dict:
+    """
+    Save a serialized DikeTraject server-side and return the small payload to be kept in the dcc.Store "stored-data"
+    instead of the full serialized traject. The token is the hash of the content, so storing the same traject twice
+    returns the same token.
+
+    :param dike_traject_data: serialized DikeTraject, see `DikeTraject.serialize`
+    :return: dict {TRAJECT_TOKEN_KEY: token}
+    """
+    _token = hashlib.sha256(
+        json.dumps(dike_traject_data, cls=MyEncoder, sort_keys=True).encode()
+    ).hexdigest()
+    # the traject is kept in the compact binary format, see `encode_dike_traject_data`
+    get_traject_store().set(_token, encode_dike_traject_data(dike_traject_data))
+    return {TRAJECT_TOKEN_KEY: _token}
+
+
+def get_traject_token(stored_data: dict) -> Optional[str]:
+    """Returns the token of the content of "stored-data", None for a full serialized DikeTraject."""
+    if isinstance(stored_data, dict) and TRAJECT_TOKEN_KEY in stored_data:
+        return stored_data[TRAJECT_TOKEN_KEY]
+    return None
+
+
+def is_dike_traject_stored(stored_data: dict) -> bool:
+    """Returns False if the content of "stored-data" is a token which is not (anymore) in the traject store."""
+    _token = get_traject_token(stored_data)
+    return _token is None or _token in get_traject_store()
+
+
+def get_dike_traject_data(stored_data: dict) -> dict:
+    """
+    Returns the serialized DikeTraject from the content of the dcc.Store "stored-data". A full serialized traject (e.g.
+    a run saved before the server-side store) is returned as is.
+
+    :param stored_data: content of "stored-data", either a token payload or a serialized DikeTraject
+    :return: serialized DikeTraject, TrajectNotFound is raised if the token is not (anymore) in the store
+    """
+    _token = get_traject_token(stored_data)
+    if _token is None:
+        return stored_data
+    return _get_stored_dike_traject_data(_token)
+
+
+def _get_stored_dike_traject_data(token: str) -> dict:
+    _encoded_data = get_traject_store().get(token)
+    if _encoded_data is None:
+        raise TrajectNotFound(f"Dike traject {token} is not in the traject store")
+    return decode_dike_traject_data(_encoded_data)
+
+
+def get_dike_traject(stored_data: dict) -> DikeTraject:
+    """
+    Returns the DikeTraject from the content of the dcc.Store "stored-data". The deserialized objects are kept in an
+    in-process LRU shared by all the callbacks, the returned DikeTraject must therefore not be modified.
+
+    :param stored_data: content of "stored-data", either a token payload or a serialized DikeTraject
+    :return: DikeTraject, TrajectNotFound is raised if the token is not (anymore) in the store
+    """
+    _token = get_traject_token(stored_data)
+    if _token is None:
+        return DikeTraject.deserialize(stored_data)
+
+    with _lock:
+        if _token in _deserialized_trajects:
+            _deserialized_trajects.move_to_end(_token)
+            return _deserialized_trajects[_token]
+
+    _dike_traject_data = _get_stored_dike_traject_data(_token)
+    _dike_traject = DikeTraject.deserialize(_dike_traject_data)
+
+    with _lock:
+        _deserialized_trajects[_token] = _dike_traject
+        while len(_deserialized_trajects) > TRAJECT_STORE_LRU_SIZE:
+            _deserialized_trajects.popitem(last=False)
+    return _dike_traject
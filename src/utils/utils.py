@@ -3,11 +3,11 @@ from pathlib import Path
 from typing import Optional
 
 import numpy as np
-from scipy.stats import norm
 from vrtool.common.enums import MechanismEnum
 from vrtool.defaults.vrtool_config import VrtoolConfig
 
 from src.constants import Mechanism
+from src.utils.reliability import beta_to_pf, pf_to_beta  # re-exported
 
 
 def to_million_euros(cost: float) -> float:
@@ -15,16 +15,6 @@ def to_million_euros(cost: float) -> float:
     return round(cost / 1e6, 2)
 
 
-def beta_to_pf(beta):
-    # alternative: use scipy
-    return norm.cdf(-beta)
-
-
-def pf_to_beta(pf):
-    # alternative: use scipy
-    return -norm.ppf(pf)
-
-
 class CombinFunctions:
     """Copy-pasted from Core v0.1.3 because it has been deprecated in Core v0.2.0"""
 
@@ -56,6 +46,8 @@ class MyEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, np.ndarray):
             return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
         return json.JSONEncoder.default(self, obj)
 
 
@@ -173,15 +165,42 @@ def interpolate_beta_values(
     :param years: The years for which the beta values are known.
     :return: The interpolated beta values for the years_output list.
     """
-    _betas_output = np.zeros(len(years_output))
-    for i, year in enumerate(years_output):
-        if year < years[0]:
-            _betas_output[i] = betas[0]
-        elif year > years[-1]:
-            _betas_output[i] = betas[-1]
-        else:
-            _betas_output[i] = np.interp(year, years, betas)
-    return _betas_output
+    # np.interp already returns the first (last) beta for the years before (after) the known years
+    return np.interp(
+        np.asarray(years_output, dtype=float),
+        np.asarray(years, dtype=float),
+        np.asarray(betas, dtype=float),
+    )
+
+
+def interpolate_beta_values_per_segment(
+    years_output: list[np.ndarray], betas: np.ndarray, years: np.ndarray
+) -> np.ndarray:
+    """
+    Interpolate, in a single call, the beta values of several segments sharing the same known years. Segment i is
+    interpolated on years_output[i] from the betas of row i, as `interpolate_beta_values` would do. The segments are
+    laid out one after the other on the year axis, each shifted by the span of the known years plus one, and the
+    output years are clipped to the known years so that a segment never interpolates with its neighbours.
+
+    :param years_output: The years for which the beta values need to be interpolated, one array per segment.
+    :param betas: Array of shape (segment, year) with the beta values for the years in the years list.
+    :param years: The (increasing) years for which the beta values are known.
+    :return: The interpolated beta values of all the segments, concatenated.
+    """
+    _years = np.asarray(years, dtype=float)
+    _betas = np.asarray(betas, dtype=float).reshape(len(years_output), len(_years))
+    _offsets = np.arange(len(years_output)) * (_years[-1] - _years[0] + 1)
+
+    _years_output = np.concatenate(
+        [
+            np.clip(np.asarray(_segment_years, dtype=float), _years[0], _years[-1])
+            + _offset
+            for _segment_years, _offset in zip(years_output, _offsets)
+        ]
+    )
+    return np.interp(
+        _years_output, (_years[None, :] + _offsets[:, None]).ravel(), _betas.ravel()
+    )
 
 
 def calculate_traject_probability(traject_prob):
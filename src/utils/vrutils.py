@@ -1,6 +1,7 @@
 from vrtool.common.enums import MechanismEnum
 from vrtool.orm.models import *
-from vrtool.orm.orm_controllers import open_database
+
+from src.orm.database_session import database_reader_session
 
 
 def get_overview_of_runs(db_path):
@@ -13,7 +14,7 @@ def get_overview_of_runs(db_path):
     list of dicts, each dict contains the run id, run name, optimization type, and the discount rate
     """
 
-    with open_database(db_path).connection_context():
+    with database_reader_session(db_path) as _database, _database.atomic():
         optimization_types = OptimizationRun.select(
             OptimizationRun, OptimizationType.name.alias("optimization_type_name")
         ).join(
@@ -34,10 +35,10 @@ def get_section_assessment_results(db_path):
     list of dicts, each dict contains the section_data_id, beta, and time
     """
 
-    with open_database(db_path).connection_context():
+    with database_reader_session(db_path) as _database, _database.atomic():
         section_assessment_results = AssessmentSectionResult.select().dicts()
 
-    return list(section_assessment_results.dicts())
+        return list(section_assessment_results.dicts())
 
 
 def get_optimization_steps_for_run_id(db_path, run_id):
@@ -56,7 +57,7 @@ def get_optimization_steps_for_run_id(db_path, run_id):
             step["total_cost"] = step["total_lcc"] + step["total_risk"]
         return steps
 
-    with open_database(db_path).connection_context():
+    with database_reader_session(db_path) as _database, _database.atomic():
         optimization_steps = (
             OptimizationStep.select(
                 OptimizationStep, OptimizationSelectedMeasure.optimization_run_id
@@ -70,9 +71,9 @@ def get_optimization_steps_for_run_id(db_path, run_id):
                 OptimizationStep.total_risk,
             )
         )
-    return add_total_cost_to_steps(
-        list(optimization_steps.dicts())
-    )  # desired output like this? TODO
+        return add_total_cost_to_steps(
+            list(optimization_steps.dicts())
+        )  # desired output like this? TODO
 
 
 # import AssessmentMechanismResult for a given mechanism and order this by section
@@ -87,7 +88,7 @@ def import_original_assessment(database_path, mechanism: MechanismEnum):
     Returns:
     dict: dictionary with section_ids as key and a list of time and beta as values"""
 
-    with open_database(database_path):
+    with database_reader_session(database_path) as _database, _database.atomic():
         assessment = (
             AssessmentMechanismResult.select(
                 AssessmentMechanismResult, MechanismPerSection, Mechanism.name
@@ -104,6 +105,7 @@ def import_original_assessment(database_path, mechanism: MechanismEnum):
             .order_by(MechanismPerSection.id)
             .dicts()
         )
+        assessment = list(assessment)
 
     # reorder such that each entry has 1 section, and a list of time and beta
     result = {}
@@ -125,7 +127,7 @@ def get_measures_for_run_id(database_path, run_id):
     Returns:
     list of dicts, each dict contains the optimization step number, optimization_selected_measure_id, measure_result_id, investment_year, measure_per_section_id, section_id
     """
-    with open_database(database_path) as db:
+    with database_reader_session(database_path) as _database, _database.atomic():
         measures = (
             OptimizationStep.select(
                 OptimizationStep.id,
@@ -168,7 +170,7 @@ def get_measure_costs(measure_result_id, database_path):
     Returns:
     dict, containing the cost of the measure
     """
-    with open_database(database_path) as db:
+    with database_reader_session(database_path) as _database, _database.atomic():
         measure = MeasureResult.get(MeasureResult.id == measure_result_id)
         measure_cost = MeasureResultSection.get(
             MeasureResultSection.measure_result == measure
@@ -187,7 +189,7 @@ def get_measure_parameters(measure_result_id, database_path):
     dict, containing the parameters of the measure
     """
     # get parameters from MeasureResultParameter where measure_result_id = measure_result_id
-    with open_database(database_path) as db:
+    with database_reader_session(database_path) as _database, _database.atomic():
         measure = MeasureResult.get(MeasureResult.id == measure_result_id)
         # get parameters from MeasureResultParameter where measure_result_id = measure_result_id
         try:
@@ -209,7 +211,7 @@ def get_measure_type(measure_result_id, database_path):
     Returns:
     dict, containing the type of the measure
     """
-    with open_database(database_path) as db:
+    with database_reader_session(database_path) as _database, _database.atomic():
         measure = MeasureResult.get(MeasureResult.id == measure_result_id)
         measure_name = (
             MeasurePerSection.select(MeasurePerSection, Measure.name)
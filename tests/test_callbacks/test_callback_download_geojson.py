@@ -1,9 +1,12 @@
 import json
+from collections import OrderedDict
 from contextvars import copy_context
 from pathlib import Path
 
+import diskcache
 import pytest
 from dash import dcc
+from dash.exceptions import PreventUpdate
 
 from src.callbacks.traject_page.callback_download_geojson import (
     download_assessment_geojson,
@@ -12,6 +15,8 @@ from src.callbacks.traject_page.callback_download_geojson import (
 )
 from src.callbacks.traject_page.callbacks_tab_content import make_graph_overview_dike
 from src.constants import CalcType
+from src.utils import traject_store
+from src.utils.traject_store import store_dike_traject_data
 
 
 class TestCallbackDownloadGeojson:
@@ -77,3 +82,31 @@ class TestCallbackDownloadGeojson:
 
         # 3. Assert
         assert isinstance(output[0], dict)
+
+    def test_download_evicted_traject_prevents_update(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        # 1. Define data
+        _dike_data = json.load(
+            open(
+                Path(__file__).parent.parent
+                / "data/31-1 base coastal case/reference"
+                / "dike_data.json"
+            )
+        )
+        _store = diskcache.Cache(str(tmp_path))
+        monkeypatch.setattr(traject_store, "_traject_store", _store)
+        monkeypatch.setattr(traject_store, "_deserialized_trajects", OrderedDict())
+        _stored_data = store_dike_traject_data(_dike_data)
+        _store.clear()
+
+        # 2. Define callback
+        def run_callback():
+            return download_overview_geojson(_stored_data, 2, 3)
+
+        ctx = copy_context()
+
+        # 3. Assert
+        with pytest.raises(PreventUpdate):
+            ctx.run(run_callback)
+        _store.close()
@@ -0,0 +1,241 @@
+import copy
+
+import numpy as np
+import pytest
+from vrtool.common.enums import MechanismEnum
+
+from src.utils.database_analytics import (
+    StepwiseAssessment,
+    assessment_for_each_step,
+    calculate_traject_probability,
+    calculate_traject_probability_for_steps,
+    group_reliability_per_step,
+)
+from src.utils.utils import beta_to_pf
+
+
+def _calculate_traject_probability_reference(assessment: dict) -> dict:
+    """
+    Former per-time loop of `calculate_traject_probability`, kept as the reference of the vectorized kernel:
+    the traject pf of Overflow and Revetment is the maximum pf over the sections, the one of Piping and
+    StabilityInner is 1 - prod(1 - pf) over the sections.
+    """
+
+    def convert_beta_to_pf_per_section(traject_reliability):
+        time = [t for section in traject_reliability.values() for t in section["time"]]
+        beta = [b for section in traject_reliability.values() for b in section["beta"]]
+        beta_per_time = {
+            t: [b for b, t_ in zip(beta, time) if t_ == t] for t in set(time)
+        }
+        return {
+            t: list(beta_to_pf(np.array(beta))) for t, beta in beta_per_time.items()
+        }
+
+    result = {}
+    for mechanism, data in assessment.items():
+        pf_per_time = convert_beta_to_pf_per_section(data)
+        if mechanism in (MechanismEnum.OVERFLOW, MechanismEnum.REVETMENT):
+            result[mechanism] = {t: max(pf) for t, pf in pf_per_time.items()}
+        elif mechanism in (MechanismEnum.PIPING, MechanismEnum.STABILITY_INNER):
+            result[mechanism] = {
+                t: 1 - np.prod(np.subtract(1, pf)) for t, pf in pf_per_time.items()
+            }
+        else:
+            raise ValueError(f"Mechanism {mechanism} not recognized.")
+    return result
+
+
+class TestStepwiseAssessment:
+
+    @pytest.fixture(name="stepwise_assessment")
+    def _get_stepwise_assessment(self) -> StepwiseAssessment:
+        _time = [0, 20, 50]
+        _assessment_input = {
+            MechanismEnum.OVERFLOW: {
+                1: {"beta": [3.0, 2.8, 2.5], "time": _time},
+                2: {"beta": [4.0, 3.9, 3.8], "time": _time},
+            },
+            MechanismEnum.PIPING: {
+                1: {"beta": [2.5, 2.5, 2.5], "time": _time},
+                2: {"beta": [3.5, 3.4], "time": [0, 20]},  # no beta for t=50
+            },
+            MechanismEnum.REVETMENT: {},
+        }
+        _reliability_per_step = {
+            1: {
+                "section_id": 1,
+                "reliability": {
+                    MechanismEnum.PIPING: {"beta": [5.0, 5.0, 4.9], "time": _time}
+                },
+            },
+            2: {
+                "section_id": 2,
+                "reliability": {
+                    MechanismEnum.OVERFLOW: {"beta": [5.5, 5.4, 5.3], "time": _time},
+                    MechanismEnum.PIPING: {"beta": [6.0, 6.0, 6.0], "time": _time},
+                },
+            },
+            3: {
+                "section_id": 1,
+                "reliability": {
+                    MechanismEnum.OVERFLOW: {"beta": [4.5, 4.4, 4.2], "time": _time}
+                },
+            },
+        }
+        return assessment_for_each_step(_assessment_input, _reliability_per_step)
+
+    def test_get_assessment_after_step(self, stepwise_assessment: StepwiseAssessment):
+        # 1. Define data
+        _step_index = 1
+
+        # 2. Define test
+        _assessment = stepwise_assessment[_step_index]
+
+        # 3. Assert
+        assert len(stepwise_assessment) == 3
+        assert _assessment[MechanismEnum.OVERFLOW][1]["beta"] == [3.0, 2.8, 2.5]
+        assert _assessment[MechanismEnum.OVERFLOW][2]["beta"] == [5.5, 5.4, 5.3]
+        assert _assessment[MechanismEnum.PIPING][1]["beta"] == [5.0, 5.0, 4.9]
+        assert _assessment[MechanismEnum.REVETMENT] == {}
+        assert stepwise_assessment[-1] == list(stepwise_assessment)[-1]
+
+    def test_get_assessment_does_not_modify_steps(
+        self, stepwise_assessment: StepwiseAssessment
+    ):
+        # 1. Define data
+        _assessment = stepwise_assessment[0]
+
+        # 2. Define test
+        _assessment[MechanismEnum.PIPING][1]["beta"][0] = 0.0
+
+        # 3. Assert
+        assert stepwise_assessment[0][MechanismEnum.PIPING][1]["beta"][0] == 5.0
+
+    def test_traject_probability_equals_per_step_calculation(
+        self, stepwise_assessment: StepwiseAssessment
+    ):
+        # 1. Define data
+        _expected_probability = [
+            _calculate_traject_probability_reference(copy.deepcopy(assessment))
+            for assessment in stepwise_assessment
+        ]
+
+        # 2. Define test
+        _traject_probability = calculate_traject_probability_for_steps(
+            stepwise_assessment
+        )
+
+        # 3. Assert
+        assert len(_traject_probability) == len(_expected_probability)
+        for _probability, _expected in zip(_traject_probability, _expected_probability):
+            assert _probability.keys() == _expected.keys()
+            for mechanism, _expected_per_time in _expected.items():
+                assert _probability[mechanism] == pytest.approx(_expected_per_time)
+
+
+class TestCalculateTrajectProbability:
+
+    @pytest.fixture(name="assessment")
+    def _get_assessment(self) -> dict:
+        return {
+            MechanismEnum.OVERFLOW: {
+                1: {"beta": [3.0, 2.8], "time": [0, 50]},
+                2: {"beta": [4.0, 3.9], "time": [0, 50]},
+                3: {"beta": [3.5], "time": [0]},
+            },
+            MechanismEnum.REVETMENT: {
+                1: {"beta": [3.2, 3.1], "time": [0, 50]},
+                3: {"beta": [2.9, 2.8], "time": [0, 50]},
+            },
+            MechanismEnum.PIPING: {
+                1: {"beta": [2.5, 2.5], "time": [0, 50]},
+                2: {"beta": [3.5], "time": [0]},
+            },
+            MechanismEnum.STABILITY_INNER: {
+                2: {"beta": [4.5, 4.4], "time": [0, 50]},
+            },
+        }
+
+    def test_traject_probability_per_mechanism(self, assessment: dict):
+        # 1. Define data
+        # lowest beta over the sections for Overflow (3.0) and Revetment (2.9), product over the sections for
+        # Piping (2.5 and 3.5) and StabilityInner (4.5)
+        _expected_at_time_0 = {
+            MechanismEnum.OVERFLOW: 0.0013498980316300933,
+            MechanismEnum.REVETMENT: 0.0018658133003840375,
+            MechanismEnum.PIPING: 0.00644084985608584,
+            MechanismEnum.STABILITY_INNER: 3.3976731247300535e-06,
+        }
+
+        # 2. Define test
+        _traject_probability = calculate_traject_probability(assessment)
+
+        # 3. Assert
+        assert _traject_probability.keys() == _expected_at_time_0.keys()
+        for mechanism, _expected in _expected_at_time_0.items():
+            assert _traject_probability[mechanism][0] == pytest.approx(_expected)
+        assert _traject_probability[MechanismEnum.OVERFLOW][50] == pytest.approx(
+            0.002555130330427932
+        )
+        assert _traject_probability[MechanismEnum.PIPING][50] == pytest.approx(
+            0.006209665325776132
+        )
+
+    def test_traject_probability_equals_per_time_calculation(self, assessment: dict):
+        # 1. Define data
+        _expected = _calculate_traject_probability_reference(assessment)
+
+        # 2. Define test
+        _traject_probability = calculate_traject_probability(assessment)
+        _traject_probability_for_steps = calculate_traject_probability_for_steps(
+            [assessment, assessment]
+        )
+
+        # 3. Assert
+        for _probability in [_traject_probability, *_traject_probability_for_steps]:
+            assert _probability.keys() == _expected.keys()
+            for mechanism, _expected_per_time in _expected.items():
+                assert _probability[mechanism] == pytest.approx(_expected_per_time)
+
+
+class TestGroupReliabilityPerStep:
+    def test_group_rows_per_step_and_mechanism(self):
+        # 1. Define data
+        # step number, section id, mechanism id, time, beta
+        _rows = [
+            (5, 2, 1, 0, 4.0),
+            (3, 1, 2, 0, 3.0),
+            (5, 2, 1, 20, 3.9),
+            (3, 1, 1, 0, 5.0),
+            (3, 1, 2, 20, 2.9),
+            (3, 1, 2, 0, 1.0),  # duplicated time, not kept
+        ]
+        _columns = [np.array(column) for column in zip(*_rows)]
+        _mechanism_enums = {1: MechanismEnum.OVERFLOW, 2: MechanismEnum.PIPING}
+
+        # 2. Define test
+        _reliability_per_step = group_reliability_per_step(
+            *_columns, mechanism_enums=_mechanism_enums
+        )
+
+        # 3. Assert
+        assert _reliability_per_step == {
+            5: {
+                "section_id": 2,
+                "reliability": {
+                    MechanismEnum.OVERFLOW: {"beta": [4.0, 3.9], "time": [0, 20]}
+                },
+            },
+            3: {
+                "section_id": 1,
+                "reliability": {
+                    MechanismEnum.PIPING: {"beta": [3.0, 2.9], "time": [0, 20]},
+                    MechanismEnum.OVERFLOW: {"beta": [5.0], "time": [0]},
+                },
+            },
+        }
+        assert list(_reliability_per_step) == [5, 3]
+        assert list(_reliability_per_step[3]["reliability"]) == [
+            MechanismEnum.PIPING,
+            MechanismEnum.OVERFLOW,
+        ]
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.utils import debug_snapshot
+from src.utils.debug_snapshot import (
+    disable_debug_snapshots,
+    enable_debug_snapshots,
+    request_debug_snapshot,
+    wait_for_debug_snapshots,
+)
+
+
+class TestDebugSnapshot:
+
+    @pytest.fixture(autouse=True)
+    def _reset_snapshots(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(debug_snapshot, "_last_requests", {})
+        monkeypatch.setattr(debug_snapshot, "_last_digests", {})
+        yield
+        disable_debug_snapshots()
+
+    def test_disabled_by_default_writes_nothing(self, tmp_path: Path):
+        # 1. Define data
+        disable_debug_snapshots()
+
+        # 2. Define test
+        _queued = request_debug_snapshot("dike_traject_data", {"name": "38-1"})
+        wait_for_debug_snapshots()
+
+        # 3. Assert
+        assert not _queued
+        assert list(tmp_path.iterdir()) == []
+
+    def test_snapshot_is_written_in_directory(self, tmp_path: Path):
+        # 1. Define data
+        _data = {"name": "38-1", "years": [2025, 2045]}
+        enable_debug_snapshots(tmp_path, min_interval=0)
+
+        # 2. Define test
+        _queued = request_debug_snapshot("dike_traject_data", _data)
+        wait_for_debug_snapshots()
+
+        # 3. Assert
+        assert _queued
+        assert [_path.name for _path in tmp_path.iterdir()] == [
+            "dike_traject_data.json"
+        ]
+        assert json.loads((tmp_path / "dike_traject_data.json").read_text()) == _data
+
+    def test_snapshots_are_rate_limited(self, tmp_path: Path):
+        # 1. Define data
+        enable_debug_snapshots(tmp_path, min_interval=3600)
+
+        # 2. Define test
+        _first_queued = request_debug_snapshot("dike_traject_data", {"name": "38-1"})
+        _second_queued = request_debug_snapshot("dike_traject_data", {"name": "38-2"})
+        wait_for_debug_snapshots()
+
+        # 3. Assert
+        assert _first_queued
+        assert not _second_queued
+        assert json.loads((tmp_path / "dike_traject_data.json").read_text()) == {
+            "name": "38-1"
+        }
+
+    def test_same_content_is_not_written_again(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        # 1. Define data
+        _written_paths = []
+        _write_bytes = Path.write_bytes
+
+        def _record_write_bytes(path: Path, content: bytes):
+            _written_paths.append(path)
+            return _write_bytes(path, content)
+
+        monkeypatch.setattr(Path, "write_bytes", _record_write_bytes)
+        enable_debug_snapshots(tmp_path, min_interval=0)
+
+        # 2. Define test
+        for _ in range(3):
+            request_debug_snapshot("dike_traject_data", {"name": "38-1"})
+            wait_for_debug_snapshots()
+
+        # 3. Assert
+        assert len(_written_paths) == 1
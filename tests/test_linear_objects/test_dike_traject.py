@@ -2,10 +2,23 @@ import json
 from pathlib import Path
 
 import numpy as np
+import pytest
 from vrtool.common.enums import MechanismEnum
 
 from src.linear_objects.dike_section import DikeSection
-from src.linear_objects.dike_traject import DikeTraject, get_traject_prob_fast
+from src.linear_objects.dike_traject import (
+    DikeTraject,
+    get_initial_assessment_df,
+    get_traject_prob,
+    get_traject_prob_fast,
+)
+from src.utils.traject_probability import (
+    TrajectProbabilityEngine,
+    calc_leave_one_out_failure_probability,
+    calc_system_failure_probability,
+    get_traject_reliability_arrays,
+    is_min_beta_mechanism,
+)
 from src.utils.utils import get_traject_reliability
 
 
@@ -78,3 +91,120 @@ class TestDikeTraject:
         #                                           0.00041913, 0.00051377])}
 
         assert np.allclose(_traject_pf, _expected_traject_pf, atol=1e-2)
+
+    def test_traject_probability_engine_incremental_update(self):
+        # 1. Define data
+        _dike_data = json.load(
+            open(
+                Path(__file__).parent.parent
+                / "data/31-1 base coastal case/reference"
+                / "dike_data.json"
+            )
+        )
+        _dike_traject = DikeTraject.deserialize(_dike_data)
+        dike_sections = _dike_traject.dike_sections
+        _beta_df = get_initial_assessment_df(dike_sections)
+
+        # 2. Define test
+        _traject_engine = TrajectProbabilityEngine.from_sections(dike_sections)
+        _initial_traject_pf, _ = _traject_engine.traject_probability()
+
+        _section = _traject_engine.section_names[0]
+        _new_betas = {
+            mechanism: [8.0] * len(_traject_engine.years)
+            for mechanism in ["Overflow", "Piping", "StabilityInner"]
+        }
+        _traject_engine.update_section(_section, _new_betas)
+        _updated_traject_pf, _ = _traject_engine.traject_probability()
+
+        for mechanism, betas in _new_betas.items():
+            _mask = (_beta_df["name"] == _section) & (
+                _beta_df["mechanism"] == mechanism
+            )
+            _beta_df.loc[_mask, _traject_engine.years] = betas
+        _expected_traject_pf, _ = TrajectProbabilityEngine.from_beta_df(
+            _beta_df
+        ).traject_probability()
+
+        # 3. Assert
+        assert np.allclose(
+            _initial_traject_pf,
+            get_traject_prob(get_initial_assessment_df(dike_sections))[0],
+        )
+        assert np.all(_updated_traject_pf <= _initial_traject_pf)
+        assert np.allclose(_updated_traject_pf, _expected_traject_pf, rtol=1e-10)
+
+    def test_calc_system_failure_probability_batch(self):
+        # 1. Define data
+        _dike_data = json.load(
+            open(
+                Path(__file__).parent.parent
+                / "data/31-1 base coastal case/reference"
+                / "dike_data.json"
+            )
+        )
+        _dike_traject = DikeTraject.deserialize(_dike_data)
+        _traject_reliabilities = [
+            get_traject_reliability(_dike_traject.dike_sections, "initial"),
+            get_traject_reliability(
+                _dike_traject.dike_sections, "veiligheidsrendement"
+            ),
+        ]
+        _betas, _is_present, _mechanisms, _times = get_traject_reliability_arrays(
+            _traject_reliabilities
+        )
+
+        # 2. Define test
+        _mechanism_pf, _is_mechanism_present, _traject_pf = (
+            calc_system_failure_probability(
+                _betas, _is_present, [is_min_beta_mechanism(m) for m in _mechanisms]
+            )
+        )
+
+        # 3. Assert
+        assert _betas.shape == (2, len(_dike_traject.dike_sections), 4, len(_times))
+        assert _mechanism_pf.shape == (2, 4, len(_times))
+        assert _is_mechanism_present.all()
+        for _traject_reliability, _batch_traject_pf in zip(
+            _traject_reliabilities, _traject_pf
+        ):
+            assert list(_batch_traject_pf) == pytest.approx(
+                get_traject_prob_fast(_traject_reliability)[1], rel=1e-12
+            )
+        assert np.all(_traject_pf[1] <= _traject_pf[0])
+
+    def test_calc_leave_one_out_failure_probability(self):
+        # 1. Define data
+        _dike_data = json.load(
+            open(
+                Path(__file__).parent.parent
+                / "data/31-1 base coastal case/reference"
+                / "dike_data.json"
+            )
+        )
+        _dike_traject = DikeTraject.deserialize(_dike_data)
+        _betas, _is_present, _mechanisms, _ = get_traject_reliability_arrays(
+            [get_traject_reliability(_dike_traject.dike_sections, "initial")]
+        )
+        _betas, _is_present = _betas[0], _is_present[0]
+        _is_min_beta = [is_min_beta_mechanism(m) for m in _mechanisms]
+        _replacement_betas = _betas + 1.0
+
+        # 2. Define test
+        _mechanism_pf, _is_mechanism_present = calc_leave_one_out_failure_probability(
+            _betas, _is_present, _replacement_betas, _is_present, _is_min_beta
+        )
+
+        # 3. Assert
+        for _section_index in range(len(_betas)):
+            _replaced_betas = _betas.copy()
+            _replaced_betas[_section_index] = _replacement_betas[_section_index]
+            _expected_pf, _expected_is_present, _ = calc_system_failure_probability(
+                _replaced_betas, _is_present, _is_min_beta
+            )
+            assert np.array_equal(
+                _is_mechanism_present[_section_index], _expected_is_present
+            )
+            assert np.allclose(
+                _mechanism_pf[_section_index], _expected_pf, rtol=1e-9, atol=0
+            )
@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from src.linear_objects.reinforcement_program import DikeProgram
+
+
+class TestDikeProgram:
+    def test_calc_traject_failure_proba_incremental(self):
+        # 1. Define data
+        _data = json.load(
+            open(
+                Path(__file__).parent.parent.joinpath(
+                    "data", "programmering_WDOD", "Programmering WDOD.json"
+                )
+            )
+        )
+        _program = DikeProgram(_data["imported_runs_data"], _data["project_data"])
+        _projects = sorted(_program.projects, key=lambda x: x.end_year)
+
+        for _dike_traject in _program.dike_trajects.values():
+            # 2. Define test
+            _years, _betas = DikeProgram.calc_traject_failure_proba_incremental(
+                _dike_traject, _projects
+            )
+            _expected_years, _expected_betas = (
+                DikeProgram.calc_traject_failure_proba_from_program_old_df(
+                    _dike_traject, _projects
+                )
+            )
+
+            # 3. Assert
+            assert np.array_equal(_years, _expected_years)
+            assert np.allclose(_betas, _expected_betas, rtol=1e-10)
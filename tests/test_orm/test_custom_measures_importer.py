@@ -0,0 +1,94 @@
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+from vrtool.defaults.vrtool_config import VrtoolConfig
+from vrtool.orm.orm_controllers import open_database
+
+from src.constants import Mechanism
+from src.orm import models as orm_model
+from src.orm.importers.custom_measures_importer import (
+    CustomMeasureImporter,
+    get_last_custom_measure_id,
+)
+
+
+class TestCustomMeasureImporter:
+
+    @pytest.fixture(name="vr_config")
+    def _get_vr_config(self, tmp_path: Path) -> VrtoolConfig:
+        _data_dir = Path(__file__).parent.parent / "data/TestCase1_38-1_no_housing"
+        _vr_config = VrtoolConfig().from_json(_data_dir / "vr_config.json")
+        # the custom measures are added to a copy of the database
+        shutil.copy2(_data_dir / _vr_config.input_database_name, tmp_path)
+        _vr_config.input_directory = tmp_path
+        return _vr_config
+
+    @staticmethod
+    def _add_custom_measure(database_path: Path, name: str, nb_times: int):
+        # mechanism per section 1 and 2: overflow and piping of the first section
+        with sqlite3.connect(database_path) as _connection:
+            _measure_id = _connection.execute(
+                "INSERT INTO Measure (measure_type_id, combinable_type_id, name) "
+                "VALUES (1, 1, ?)",
+                (name,),
+            ).lastrowid
+            _connection.executemany(
+                "INSERT INTO CustomMeasureDetail "
+                "(measure_id, mechanism_per_section_id, cost, beta, time) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (_measure_id, _mechanism_per_section_id, 1e6, 4.0 + time, time)
+                    for _mechanism_per_section_id in [1, 2]
+                    for time in range(nb_times)
+                ],
+            )
+
+    def test_read_custom_measures(self, vr_config: VrtoolConfig):
+        # 1. Define data
+        _database_path = vr_config.input_directory / vr_config.input_database_name
+        self._add_custom_measure(_database_path, "measure_1", nb_times=3)
+        open_database(_database_path)
+
+        # 2. Define test
+        _importer = CustomMeasureImporter(vr_config)
+        _custom_measures = _importer.read_custom_measures()
+
+        # 3. Assert
+        assert len(_custom_measures) == 6
+        assert list(_custom_measures["id"]) == sorted(_custom_measures["id"])
+        assert set(_custom_measures["measure_name"]) == {"measure_1"}
+        assert set(_custom_measures["mechanism"]) == {
+            Mechanism.OVERFLOW.value,
+            Mechanism.PIPING.value,
+        }
+        assert _importer.import_orm(orm_model)[0] == dict(
+            beta=4.0,
+            cost=1e6,
+            time=0,
+            section_name=_custom_measures["section_name"][0],
+            mechanism=Mechanism.OVERFLOW.value,
+            measure_name="measure_1",
+        )
+
+    def test_read_custom_measures_after_id(self, vr_config: VrtoolConfig):
+        # 1. Define data
+        _database_path = vr_config.input_directory / vr_config.input_database_name
+        self._add_custom_measure(_database_path, "measure_1", nb_times=3)
+        open_database(_database_path)
+        _importer = CustomMeasureImporter(vr_config)
+        _custom_measures_ini = _importer.read_custom_measures()
+        self._add_custom_measure(_database_path, "measure_2", nb_times=2)
+
+        # 2. Define test
+        _added_custom_measures = _importer.read_custom_measures(
+            after_id=get_last_custom_measure_id(_custom_measures_ini)
+        )
+
+        # 3. Assert
+        assert len(_added_custom_measures) == 4
+        assert set(_added_custom_measures["measure_name"]) == {"measure_2"}
+        assert get_last_custom_measure_id(
+            _added_custom_measures
+        ) == get_last_custom_measure_id(_importer.read_custom_measures())
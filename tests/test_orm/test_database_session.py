@@ -0,0 +1,165 @@
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+from peewee import OperationalError
+from vrtool.orm.models import OptimizationRun
+
+from src.orm.database_session import (
+    close_database_reader_sessions,
+    database_reader_session,
+    database_writer_session,
+    get_database_version,
+)
+
+
+class TestDatabaseSession:
+
+    @staticmethod
+    def _copy_database(database_path: Path):
+        shutil.copy2(
+            Path(__file__).parent.parent
+            / "data/TestCase1_38-1_no_housing/vrtool_input.db",
+            database_path,
+        )
+
+    @pytest.fixture(name="database_path")
+    def _get_database_path(self, tmp_path: Path) -> Path:
+        _database_path = tmp_path / "database.db"
+        self._copy_database(_database_path)
+        yield _database_path
+        close_database_reader_sessions()
+
+    def test_read_session_is_reused(self, database_path: Path):
+        # 1. Define data
+        with database_reader_session(database_path) as _database:
+            _connection = _database.connection()
+            _nb_runs = OptimizationRun.select().count()
+
+        # 2. Define test
+        with database_reader_session(database_path) as _database_2:
+            _connection_2 = _database_2.connection()
+            _query_only = _database_2.execute_sql("PRAGMA query_only").fetchone()[0]
+            with pytest.raises(OperationalError):
+                OptimizationRun.update(name="new name").execute()
+
+        # 3. Assert
+        assert _nb_runs > 0
+        assert _connection_2 is _connection
+        assert _query_only == 1
+
+    def test_read_session_per_database(self, database_path: Path, tmp_path: Path):
+        # 1. Define data
+        _database_path_2 = tmp_path / "database_2.db"
+        self._copy_database(_database_path_2)
+        with database_reader_session(database_path) as _database:
+            _connection = _database.connection()
+
+        # 2. Define test
+        with database_reader_session(_database_path_2) as _database_2:
+            _connection_2 = _database_2.connection()
+        with database_reader_session(database_path) as _database:
+            _connection_after_switch = _database.connection()
+
+        # 3. Assert
+        assert _connection_2 is not _connection
+        assert _connection_after_switch is _connection
+
+    def test_read_sessions_of_threads_read_their_own_database(
+        self, database_path: Path, tmp_path: Path
+    ):
+        # 1. Define data
+        _database_path_2 = tmp_path / "database_2.db"
+        self._copy_database(_database_path_2)
+        with sqlite3.connect(_database_path_2) as _connection:
+            _connection.execute(
+                "UPDATE OptimizationRun SET name = 'second database' WHERE id = 1"
+            )
+        _connection.close()
+        with database_reader_session(database_path):
+            _name = OptimizationRun.get_by_id(1).name
+        _names = {}
+        _first_session_open = threading.Event()
+        _second_session_open = threading.Event()
+        _first_read_done = threading.Event()
+
+        def read_first_database():
+            with database_reader_session(database_path):
+                _first_session_open.set()
+                # the second thread opens its session in between, unless it waits for this one to end
+                _second_session_open.wait(timeout=0.5)
+                _names[database_path] = OptimizationRun.get_by_id(1).name
+                _first_read_done.set()
+            close_database_reader_sessions()
+
+        def read_second_database():
+            _first_session_open.wait()
+            with database_reader_session(_database_path_2):
+                _second_session_open.set()
+                _first_read_done.wait(timeout=0.5)
+                _names[_database_path_2] = OptimizationRun.get_by_id(1).name
+            close_database_reader_sessions()
+
+        # 2. Define test
+        _threads = [
+            threading.Thread(target=read_first_database),
+            threading.Thread(target=read_second_database),
+        ]
+        for _thread in _threads:
+            _thread.start()
+        for _thread in _threads:
+            _thread.join()
+
+        # 3. Assert
+        assert _name != "second database"
+        assert _names == {database_path: _name, _database_path_2: "second database"}
+
+    def test_writer_session_uses_separate_database(self, database_path: Path):
+        # 1. Define data
+        with database_reader_session(database_path) as _read_database:
+            _read_connection = _read_database.connection()
+
+        # 2. Define test
+        with database_writer_session(database_path) as _database:
+            _write_connection = _database.connection()
+            _query_only = _database.execute_sql("PRAGMA query_only").fetchone()[0]
+            _connect_params = dict(_database.connect_params)
+
+        # 3. Assert
+        assert _database is not _read_database
+        assert _write_connection is not _read_connection
+        assert _query_only == 0
+        assert "uri" not in _connect_params
+
+    def test_read_session_does_not_modify_database(self, database_path: Path):
+        # 1. Define data
+        _connection = sqlite3.connect(database_path)
+        _connection.execute("PRAGMA journal_mode=DELETE")
+        _connection.close()
+        _version = get_database_version(database_path)
+
+        # 2. Define test
+        with database_reader_session(database_path) as _database:
+            _nb_runs = OptimizationRun.select().count()
+            _journal_mode = _database.execute_sql("PRAGMA journal_mode").fetchone()[0]
+
+        # 3. Assert
+        assert _nb_runs > 0
+        assert _journal_mode == "delete"
+        assert not Path(f"{database_path}-wal").exists()
+        assert get_database_version(database_path) == _version
+
+    def test_database_version_changes_after_write(self, database_path: Path):
+        # 1. Define data
+        _version = get_database_version(database_path)
+
+        # 2. Define test
+        with database_writer_session(database_path):
+            OptimizationRun.update(name="new name").where(
+                OptimizationRun.id == 1
+            ).execute()
+
+        # 3. Assert
+        assert get_database_version(database_path) != _version
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from scipy.interpolate import interp1d
+from vrtool.common.enums import MechanismEnum
+
+from src.orm.importers.greedy_trajectory import (
+    RISK_NB_YEARS,
+    calculate_total_risk,
+    get_interpolation_weights,
+)
+
+
+class TestGreedyTrajectory:
+
+    def test_interpolation_weights_equal_interp1d(self):
+        # 1. Define data
+        _times = np.array([0, 19, 20, 25, 50, 75, 100])
+        _values = np.array([1e-4, 2e-4, 2.1e-4, 3e-4, 6e-4, 1e-3, 2e-3])
+        _years = np.arange(-5, 110)
+
+        # 2. Define test
+        _weights = get_interpolation_weights(_times, _years)
+
+        # 3. Assert
+        _expected = interp1d(_times, _values, kind="linear", fill_value="extrapolate")
+        assert _weights.shape == (len(_years), len(_times))
+        assert _weights @ _values == pytest.approx(_expected(_years), rel=1e-12)
+
+    def test_calculate_total_risk(self):
+        # 1. Define data
+        _traject_probability = {
+            MechanismEnum.OVERFLOW: {0: 1e-4, 50: 4e-4, 100: 1e-3},
+            MechanismEnum.PIPING: {0: 2e-3, 20: 3e-3, 100: 3e-3},  # other times
+            MechanismEnum.REVETMENT: {},  # traject without revetment
+        }
+        _damage, _discount_rate = 1e9, 0.03
+
+        # 2. Define test
+        _total_risk = calculate_total_risk(
+            _traject_probability, _damage, _discount_rate
+        )
+
+        # 3. Assert
+        _years = np.arange(RISK_NB_YEARS)
+        _p_non_failure = np.ones(RISK_NB_YEARS)
+        for _pf in _traject_probability.values():
+            if len(_pf) > 0:
+                _p_non_failure *= 1 - np.interp(_years, list(_pf), list(_pf.values()))
+        _expected_risk = np.sum(
+            _damage / (1 + _discount_rate) ** _years * (1 - _p_non_failure)
+        )
+        assert _total_risk == pytest.approx(_expected_risk, rel=1e-12)
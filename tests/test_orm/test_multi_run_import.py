@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import diskcache
+import pytest
+from vrtool.defaults.vrtool_config import VrtoolConfig
+
+from src.orm import traject_cache
+from src.orm.multi_run_import import import_runs
+
+
+class TestMultiRunImport:
+
+    @pytest.fixture(name="vr_config_data")
+    def _get_vr_config_data(self) -> dict:
+        return {
+            "traject": "38-1",
+            "input_directory": str(
+                Path(__file__).parent.parent / "data/TestCase1_38-1_no_housing"
+            ),
+            "input_database_name": "vrtool_input_2runs.db",
+            "excluded_mechanisms": [],
+            "T": VrtoolConfig().T,
+        }
+
+    @pytest.fixture(autouse=True)
+    def _use_temporary_cache(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        _cache = diskcache.Cache(str(tmp_path), tag_index=True)
+        monkeypatch.setattr(traject_cache, "_traject_cache", _cache)
+        yield
+        _cache.close()
+
+    def test_import_runs_in_current_process(self, vr_config_data: dict):
+        # 1. Define data
+        _run_selections = [
+            (vr_config_data, "Basisberekening"),
+            (vr_config_data, "test"),
+        ]
+        _progress = []
+
+        # 2. Define test
+        _imported_runs_data = import_runs(
+            _run_selections,
+            max_workers=1,
+            set_progress=lambda nb_imported, nb_runs: _progress.append(
+                (nb_imported, nb_runs)
+            ),
+        )
+
+        # 3. Assert
+        assert list(_imported_runs_data.keys()) == ["38-1|Basisberekening", "38-1|test"]
+        assert _imported_runs_data["38-1|test"]["run_name"] == "test"
+        assert _progress == [(1, 2), (2, 2)]
+
+    def test_import_runs_on_process_pool(self, vr_config_data: dict):
+        # 1. Define data
+        _run_selections = [
+            (vr_config_data, "Basisberekening"),
+            (vr_config_data, "test"),
+        ]
+        _progress = []
+
+        # 2. Define test
+        _imported_runs_data = import_runs(
+            _run_selections,
+            max_workers=2,
+            set_progress=lambda nb_imported, nb_runs: _progress.append(
+                (nb_imported, nb_runs)
+            ),
+        )
+
+        # 3. Assert
+        assert list(_imported_runs_data.keys()) == ["38-1|Basisberekening", "38-1|test"]
+        assert _imported_runs_data["38-1|Basisberekening"]["name"] == "38-1"
+        assert _progress[-1] == (2, 2)
@@ -1,12 +1,17 @@
 import json
 from pathlib import Path
 
+import pytest
 from vrtool.defaults.vrtool_config import VrtoolConfig
 
+from src.constants import Measures
 from src.linear_objects.dike_section import DikeSection
 from src.linear_objects.dike_traject import DikeTraject
 from src.orm.import_database import (
+    get_all_measure_results,
     get_dike_traject_from_config_ORM,
+    get_measure_result_ids_index,
+    get_measure_result_ids_per_section,
     get_name_optimization_runs,
     get_run_optimization_ids,
 )
@@ -118,3 +123,70 @@ class TestOrmControllers:
         assert isinstance(id_dsn, int)
         assert id_vr == 1
         assert id_dsn == 2
+
+    def test_get_measure_result_ids_index(self):
+        # 1. Define data
+        _vr_config = VrtoolConfig().from_json(
+            Path(__file__).parent.parent
+            / "data/TestCase1_38-1_no_housing/vr_config.json"
+        )
+        _vr_config.input_directory = (
+            Path(__file__).parent.parent / "data/TestCase1_38-1_no_housing"
+        )
+        _dike_traject = get_dike_traject_from_config_ORM(
+            _vr_config, run_id_dsn=2, run_is_vr=1
+        )
+
+        # 2. Define test
+        _index = get_measure_result_ids_index(_vr_config)
+
+        # 3. Assert
+        assert get_measure_result_ids_index(_vr_config) is _index
+        for section in _dike_traject.dike_sections:
+            for measure in Measures:
+                assert sorted(_index.get((section.name, measure.name), [])) == sorted(
+                    get_measure_result_ids_per_section(
+                        _vr_config, section.name, measure.name
+                    )
+                )
+
+    @pytest.mark.parametrize("mechanism", ["Section", "Overflow"])
+    def test_get_all_measure_results_returns_one_row_per_measure_result(
+        self, mechanism: str
+    ):
+        # 1. Define data
+        _vr_config = VrtoolConfig().from_json(
+            Path(__file__).parent.parent
+            / "data/TestCase1_38-1_no_housing/vr_config.json"
+        )
+        _vr_config.input_directory = (
+            Path(__file__).parent.parent / "data/TestCase1_38-1_no_housing"
+        )
+
+        # 2. Define test
+        _measures_df, _, _ = get_all_measure_results(
+            _vr_config,
+            section_name="1A",
+            mechanism=mechanism,
+            time=0,
+            run_id_vr=1,
+            run_id_dsn=2,
+            active_mechanisms=["Overflow", "Piping", "StabilityInner"],
+        )
+
+        # 3. Assert
+        assert list(_measures_df.columns) == [
+            "LCC",
+            "beta",
+            "measure",
+            "dberm",
+            "dcrest",
+            "measure_result_id",
+            "cost",
+        ]
+        assert len(_measures_df) == 83
+        assert _measures_df["measure_result_id"].is_unique
+        assert (_measures_df["LCC"] == _measures_df["cost"]).all()
+        assert _measures_df["beta"].notna().all()
+        assert _measures_df["measure"].notna().all()
+        assert _measures_df["dberm"].notna().sum() == 80
@@ -0,0 +1,108 @@
+import json
+from pathlib import Path
+
+import pytest
+from vrtool.defaults.vrtool_config import VrtoolConfig
+from vrtool.orm.orm_controllers import open_database
+
+from src.constants import GreedyOPtimizationCriteria
+from src.orm import models as orm_model
+from src.orm.importers.dike_traject_importer import DikeTrajectImporter
+from src.orm.importers.solution_bulk_reader import SolutionRunBulkReader
+from src.utils.utils import MyEncoder
+
+
+class TestTrajectSolutionRunImporter:
+
+    @pytest.fixture(name="vr_config")
+    def _get_vr_config(self) -> VrtoolConfig:
+        _vr_config = VrtoolConfig().from_json(
+            Path(__file__).parent.parent
+            / "data/TestCase1_38-1_no_housing/vr_config.json"
+        )
+        _vr_config.input_directory = (
+            Path(__file__).parent.parent / "data/TestCase1_38-1_no_housing"
+        )
+        return _vr_config
+
+    def test_bulk_reader_groups_steps_by_step_number(self, vr_config: VrtoolConfig):
+        # 1. Define data
+        open_database(vr_config.input_directory / vr_config.input_database_name)
+
+        # 2. Define test
+        _reader = SolutionRunBulkReader(run_id=1)
+        _step_numbers = [_step_number for _step_number, _ in _reader.iter_step_groups()]
+
+        # 3. Assert
+        assert len(_step_numbers) > 0
+        assert _step_numbers == sorted(set(_step_numbers))
+
+    def test_bulk_import_is_identical_to_step_import(self, vr_config: VrtoolConfig):
+        # 1. Define data
+        _path_database = vr_config.input_directory / vr_config.input_database_name
+
+        def import_traject(bulk_import: bool) -> str:
+            open_database(_path_database)
+            _dike_traject = DikeTrajectImporter(
+                vr_config=vr_config,
+                run_id_vr=1,
+                run_id_dsn=2,
+                greedy_optimization_criteria=GreedyOPtimizationCriteria.ECONOMIC_OPTIMAL.name,
+                bulk_import=bulk_import,
+            ).import_orm(orm_model, _path_database)
+            return json.dumps(_dike_traject.serialize(), cls=MyEncoder)
+
+        # 2. Define test
+        _serialized_bulk = import_traject(bulk_import=True)
+        _serialized_steps = import_traject(bulk_import=False)
+
+        # 3. Assert
+        assert _serialized_bulk == _serialized_steps
+
+    @pytest.mark.parametrize(
+        "greedy_criteria_year, greedy_criteria_beta",
+        [
+            pytest.param(2045, 2.5, id="2045-2.5"),
+            pytest.param(2075, 3.0, id="2075-3.0"),
+        ],
+    )
+    def test_greedy_trajectory_is_identical_to_target_pf_import(
+        self,
+        vr_config: VrtoolConfig,
+        greedy_criteria_year: int,
+        greedy_criteria_beta: float,
+    ):
+        # 1. Define data
+        _path_database = vr_config.input_directory / vr_config.input_database_name
+        open_database(_path_database)
+        _importer = DikeTrajectImporter(
+            vr_config=vr_config,
+            run_id_vr=1,
+            run_id_dsn=2,
+            greedy_optimization_criteria=GreedyOPtimizationCriteria.ECONOMIC_OPTIMAL.name,
+        )
+        _dike_traject = _importer.import_orm(orm_model, _path_database)
+
+        open_database(_path_database)
+        _expected_dike_traject = DikeTrajectImporter(
+            vr_config=vr_config,
+            run_id_vr=1,
+            run_id_dsn=2,
+            greedy_optimization_criteria=GreedyOPtimizationCriteria.TARGET_PF.name,
+            greedy_criteria_year=greedy_criteria_year,
+            greedy_criteria_beta=greedy_criteria_beta,
+            bulk_import=False,
+        ).import_orm(orm_model, _path_database)
+
+        # 2. Define test
+        _importer.greedy_trajectory.apply(
+            _dike_traject,
+            GreedyOPtimizationCriteria.TARGET_PF.name,
+            greedy_criteria_year,
+            greedy_criteria_beta,
+        )
+
+        # 3. Assert
+        assert json.dumps(_dike_traject.serialize(), cls=MyEncoder) == json.dumps(
+            _expected_dike_traject.serialize(), cls=MyEncoder
+        )
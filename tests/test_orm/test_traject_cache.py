@@ -0,0 +1,131 @@
+from pathlib import Path
+
+import diskcache
+import pytest
+from vrtool.defaults.vrtool_config import VrtoolConfig
+
+from src.constants import GreedyOPtimizationCriteria
+from src.orm import traject_cache
+from src.orm.import_database import get_measure_result_ids_index
+from src.orm.traject_cache import (
+    get_cached_dike_traject_data,
+    get_cached_step_numbers_per_section,
+    get_traject_cache_key,
+    invalidate_traject_cache,
+)
+
+
+class TestTrajectCache:
+
+    @pytest.fixture(name="vr_config")
+    def _get_vr_config(self) -> VrtoolConfig:
+        _vr_config = VrtoolConfig().from_json(
+            Path(__file__).parent.parent
+            / "data/TestCase1_38-1_no_housing/vr_config.json"
+        )
+        _vr_config.input_directory = (
+            Path(__file__).parent.parent / "data/TestCase1_38-1_no_housing"
+        )
+        return _vr_config
+
+    @pytest.fixture(autouse=True)
+    def _use_temporary_cache(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        _cache = diskcache.Cache(str(tmp_path), tag_index=True)
+        monkeypatch.setattr(traject_cache, "_traject_cache", _cache)
+        yield
+        _cache.close()
+
+    def test_cache_key_depends_on_greedy_criteria(self, vr_config: VrtoolConfig):
+        # 1. Define data
+        _economic_optimal = GreedyOPtimizationCriteria.ECONOMIC_OPTIMAL.name
+        _target_pf = GreedyOPtimizationCriteria.TARGET_PF.name
+
+        # 2. Define test
+        _key_1 = get_traject_cache_key(vr_config, 2, 1, _economic_optimal, None, None)
+        _key_2 = get_traject_cache_key(vr_config, 2, 1, _economic_optimal, None, None)
+        _key_3 = get_traject_cache_key(vr_config, 2, 1, _target_pf, 2075, 4.5)
+
+        # 3. Assert
+        assert _key_1 == _key_2
+        assert _key_1 != _key_3
+
+    def test_traject_is_imported_once(
+        self, vr_config: VrtoolConfig, monkeypatch: pytest.MonkeyPatch
+    ):
+        # 1. Define data
+        _nb_imports = []
+        _get_greedy_solution = (
+            traject_cache.get_dike_traject_and_greedy_trajectory_from_config_ORM
+        )
+
+        def count_imports(*args, **kwargs):
+            _nb_imports.append(1)
+            return _get_greedy_solution(*args, **kwargs)
+
+        monkeypatch.setattr(
+            traject_cache,
+            "get_dike_traject_and_greedy_trajectory_from_config_ORM",
+            count_imports,
+        )
+
+        # 2. Define test
+        _data_1 = get_cached_dike_traject_data(vr_config, run_id_dsn=2, run_is_vr=1)
+        _data_2 = get_cached_dike_traject_data(vr_config, run_id_dsn=2, run_is_vr=1)
+        _data_target_pf = get_cached_dike_traject_data(
+            vr_config,
+            run_id_dsn=2,
+            run_is_vr=1,
+            greedy_optimization_criteria=GreedyOPtimizationCriteria.TARGET_PF.name,
+            greedy_criteria_year=2075,
+            greedy_criteria_beta=4.5,
+        )
+        invalidate_traject_cache(vr_config)
+        _data_3 = get_cached_dike_traject_data(vr_config, run_id_dsn=2, run_is_vr=1)
+
+        # 3. Assert
+        assert _data_1 == _data_2 == _data_3
+        assert _data_target_pf["greedy_stop_criteria_beta"] == 4.5
+        assert len(_nb_imports) == 2
+
+    def test_step_numbers_per_section_cover_all_the_steps(
+        self, vr_config: VrtoolConfig, monkeypatch: pytest.MonkeyPatch
+    ):
+        # 1. Define data
+        _nb_imports = []
+        _get_step_numbers = traject_cache.get_step_numbers_per_section_from_config
+
+        def count_imports(*args, **kwargs):
+            _nb_imports.append(1)
+            return _get_step_numbers(*args, **kwargs)
+
+        monkeypatch.setattr(
+            traject_cache, "get_step_numbers_per_section_from_config", count_imports
+        )
+
+        # 2. Define test
+        _index = get_cached_step_numbers_per_section(vr_config, run_id=1)
+        _index_cached = get_cached_step_numbers_per_section(vr_config, run_id=1)
+
+        # 3. Assert
+        assert _index == _index_cached
+        assert len(_nb_imports) == 1
+        _all_step_numbers = [
+            _step_number
+            for _step_numbers in _index.values()
+            for _step_number in _step_numbers
+        ]
+        assert len(_all_step_numbers) > 0
+        assert len(_all_step_numbers) == len(set(_all_step_numbers))
+        for _step_numbers in _index.values():
+            assert _step_numbers == sorted(_step_numbers)
+
+    def test_invalidate_clears_measure_result_ids_index(self, vr_config: VrtoolConfig):
+        # 1. Define data
+        _index = get_measure_result_ids_index(vr_config)
+
+        # 2. Define test
+        invalidate_traject_cache(vr_config)
+
+        # 3. Assert
+        assert get_measure_result_ids_index(vr_config) == _index
+        assert get_measure_result_ids_index(vr_config) is not _index
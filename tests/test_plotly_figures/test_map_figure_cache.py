@@ -0,0 +1,76 @@
+import json
+from collections import OrderedDict
+from pathlib import Path
+
+import diskcache
+import pytest
+
+from src.constants import Mechanism, ResultType
+from src.plotly_graphs import map_figure_cache
+from src.plotly_graphs.map_figure_cache import get_cached_map_figure, get_year_indices
+from src.plotly_graphs.plotly_maps import (
+    plot_dike_traject_reliability_initial_assessment_map,
+)
+from src.utils import traject_store
+from src.utils.traject_store import get_dike_traject, store_dike_traject_data
+
+
+class TestMapFigureCache:
+
+    @pytest.fixture(autouse=True)
+    def _use_temporary_store(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        _store = diskcache.Cache(str(tmp_path))
+        monkeypatch.setattr(traject_store, "_traject_store", _store)
+        monkeypatch.setattr(traject_store, "_deserialized_trajects", OrderedDict())
+        monkeypatch.setattr(map_figure_cache, "_map_figures", OrderedDict())
+        yield
+        _store.close()
+
+    @pytest.fixture(name="stored_data")
+    def _get_stored_data(self) -> dict:
+        _dike_data = json.load(
+            open(
+                Path(__file__).parent.parent
+                / "data/31-1 base coastal case/reference"
+                / "dike_data.json"
+            )
+        )
+        return store_dike_traject_data(_dike_data)
+
+    def test_years_between_assessment_years_share_the_figure(self, stored_data: dict):
+        # 1. Define data
+        _dike_traject = get_dike_traject(stored_data)
+        _nb_plots = []
+
+        def plot(selected_year: int):
+            _nb_plots.append(selected_year)
+            return plot_dike_traject_reliability_initial_assessment_map(
+                _dike_traject,
+                selected_year,
+                ResultType.RELIABILITY.name,
+                Mechanism.SECTION.name,
+            )
+
+        def get_figure(selected_year: int) -> dict:
+            return get_cached_map_figure(
+                stored_data,
+                (
+                    get_year_indices(_dike_traject, selected_year),
+                    ResultType.RELIABILITY.name,
+                    Mechanism.SECTION.name,
+                ),
+                lambda: plot(selected_year),
+            )
+
+        # 2. Define test
+        _figure_2025 = get_figure(2025)
+        _figure_2040 = get_figure(2040)
+        _figure_2075 = get_figure(2075)
+
+        # 3. Assert
+        assert get_year_indices(_dike_traject, 2025) == get_year_indices(
+            _dike_traject, 2040
+        )
+        assert _figure_2025 is _figure_2040
+        assert _figure_2025 != _figure_2075
+        assert _nb_plots == [2025, 2075]
@@ -1,7 +1,9 @@
 import json
+from bisect import bisect_right
 from enum import Enum
 from pathlib import Path
 
+import numpy as np
 import pytest
 from plotly.graph_objs import Figure
 
@@ -16,12 +18,16 @@ from src.linear_objects.dike_traject import DikeTraject
 from src.plotly_graphs.plotly_maps import (
     dike_traject_pf_cost_helping_map_detail,
     dike_traject_pf_cost_helping_map_simple,
+    get_initial_assessment_map_frames,
+    get_measures_assessment_map_frames,
+    get_pf_per_year,
     plot_default_overview_map_dummy,
     plot_dike_traject_reliability_initial_assessment_map,
     plot_dike_traject_reliability_measures_assessment_map,
     plot_dike_traject_urgency,
     plot_overview_map,
 )
+from src.utils.utils import beta_to_pf
 
 
 class TestPlotlyScatterMapBox:
@@ -50,6 +56,30 @@ class TestPlotlyScatterMapBox:
         # 3. Assert
         assert isinstance(_fig, Figure)
 
+    def test_plot_overview_map_draws_one_trace_per_color(self):
+        # 1. Define data
+        _dike_data = json.load(
+            open(
+                Path(__file__).parent.parent
+                / "data/31-1 base coastal case/reference"
+                / "dike_data.json"
+            )
+        )
+        _dike_traject = DikeTraject.deserialize(_dike_data)
+        _nb_points = sum(
+            len(section.coordinates_rd) for section in _dike_traject.dike_sections
+        )
+
+        # 2. Call
+        _fig = plot_overview_map(_dike_traject)
+
+        # 3. Assert
+        assert len(_fig.data) <= 3
+        _lat = np.concatenate([np.asarray(trace.lat) for trace in _fig.data])
+        assert np.count_nonzero(~np.isnan(_lat)) == _nb_points
+        for _trace in _fig.data:
+            assert len(_trace.customdata) == len(_trace.lat)
+
     @pytest.mark.parametrize(
         "result_type", [ResultType.RELIABILITY, ResultType.PROBABILITY]
     )
@@ -77,6 +107,89 @@ class TestPlotlyScatterMapBox:
         # 3. Assert
         assert isinstance(_fig, Figure)
 
+    def test_get_initial_assessment_map_frames_match_the_map(self):
+        # 1. Define data
+        _dike_data = json.load(
+            open(
+                Path(__file__).parent.parent
+                / "data/31-1 base coastal case/reference"
+                / "dike_data.json"
+            )
+        )
+        _dike_traject = DikeTraject.deserialize(_dike_data)
+        _selected_year = 2045
+
+        # 2. Call
+        _frames = get_initial_assessment_map_frames(
+            _dike_traject, ResultType.RELIABILITY.name, Mechanism.SECTION.name
+        )
+        _fig = plot_dike_traject_reliability_initial_assessment_map(
+            _dike_traject,
+            _selected_year,
+            ResultType.RELIABILITY.name,
+            Mechanism.SECTION.name,
+        )
+
+        # 3. Assert
+        _sections_in_analysis = [
+            section for section in _dike_traject.dike_sections if section.in_analyse
+        ]
+        assert len(_frames["sections"]) == len(_sections_in_analysis)
+        _fig_colors = {_trace.line.color for _trace in _fig.data if _trace.lat}
+        for _section in _frames["sections"]:
+            assert len(_section["colors"]) == len(_section["hovertemplates"])
+            assert len(_section["lat"]) == len(_section["lon"])
+            _year_index = bisect_right(_section["years"], _selected_year) - 1
+            assert _section["colors"][_year_index] in _fig_colors
+
+    def test_get_measures_assessment_map_frames_measure_is_none(self):
+        # 1. Define data
+        _dike_data = json.load(
+            open(
+                Path(__file__).parent.parent
+                / "data/31-1 base coastal case/reference"
+                / "dike_data.json"
+            )
+        )
+        _dike_traject = DikeTraject.deserialize(_dike_data)
+
+        # 2. Call
+        _frames = get_measures_assessment_map_frames(
+            _dike_traject,
+            ResultType.RELIABILITY.name,
+            CalcType.VEILIGHEIDSRENDEMENT.name,
+            ColorBarResultType.MEASURE.name,
+            Mechanism.SECTION.name,
+            SubResultType.ABSOLUTE.name,
+        )
+
+        # 3. Assert
+        assert _frames is None
+
+    def test_get_pf_per_year_equals_per_year_conversion(self):
+        # 1. Define data
+        _results_per_section = [
+            {"Piping": [4.2, 4.0, 3.1], "Revetment": []},
+            None,
+            {"Piping": [5.3, None], "Revetment": [3.5, 3.4]},
+            {"Overflow": [4.6]},
+        ]
+
+        # 2. Define test
+        _pf_per_year = get_pf_per_year(_results_per_section, Mechanism.PIPING.name)
+
+        # 3. Assert
+        assert len(_pf_per_year) == len(_results_per_section)
+        assert _pf_per_year[1] is None and _pf_per_year[3] is None
+        for _results, _pf in zip(_results_per_section, _pf_per_year):
+            if _results is None or "Piping" not in _results:
+                continue
+            for _beta, _pf_year in zip(_results["Piping"], _pf):
+                if _beta is None:
+                    assert np.isnan(_pf_year)
+                else:
+                    assert _pf_year == beta_to_pf(_beta)
+
     @pytest.mark.parametrize(
         "result_type", [ResultType.RELIABILITY, ResultType.PROBABILITY]
     )
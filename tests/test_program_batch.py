@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.linear_objects.reinforcement_program import DikeProgram, calc_area_stats_new
+from src.utils.program_batch import evaluate_programs, get_program_comparison_table
+
+
+class TestProgramBatch:
+
+    @pytest.fixture(name="program_data")
+    def _get_program_data(self) -> dict:
+        return json.load(
+            open(
+                Path(__file__).parent.joinpath(
+                    "data", "programmering_WDOD", "Programmering WDOD.json"
+                )
+            )
+        )
+
+    def test_evaluate_programs_matches_dike_program(self, program_data: dict):
+        # 1. Define data
+        _imported_runs_data = program_data["imported_runs_data"]
+        _candidate_programs = {
+            "all projects": program_data["project_data"],
+            "first projects": program_data["project_data"][:3],
+        }
+
+        # 2. Define test
+        _evaluations = evaluate_programs(
+            _imported_runs_data, _candidate_programs, max_workers=1
+        )
+
+        # 3. Assert
+        assert [_evaluation.name for _evaluation in _evaluations] == list(
+            _candidate_programs
+        )
+        for _evaluation, _project_overview_data in zip(
+            _evaluations, _candidate_programs.values()
+        ):
+            _program = DikeProgram(_imported_runs_data, _project_overview_data)
+            _cost, _risk_metrics = calc_area_stats_new(_program)
+            assert _evaluation.cost == pytest.approx(_cost)
+            for _situation in ["current", "program"]:
+                assert _evaluation.risk_metrics[_situation] == pytest.approx(
+                    _risk_metrics[_situation]
+                )
+            for _traject_name, _pf_over_time in _program.trajects_pf_over_time.items():
+                assert np.allclose(
+                    _evaluation.trajects_pf_over_time[_traject_name]["betas"],
+                    _pf_over_time["betas"],
+                )
+
+    def test_evaluate_programs_on_process_pool(self, program_data: dict):
+        # 1. Define data
+        _imported_runs_data = program_data["imported_runs_data"]
+        _candidate_programs = {
+            "all projects": program_data["project_data"],
+            "first projects": program_data["project_data"][:3],
+        }
+
+        # 2. Define test
+        _table = get_program_comparison_table(
+            evaluate_programs(_imported_runs_data, _candidate_programs, max_workers=2)
+        )
+        _expected_table = get_program_comparison_table(
+            evaluate_programs(_imported_runs_data, _candidate_programs, max_workers=1)
+        )
+
+        # 3. Assert
+        assert _table == _expected_table
+        assert [_row["program"] for _row in _table] == list(_candidate_programs)
+        assert _table[0]["nb_projects"] == len(program_data["project_data"])
@@ -0,0 +1,68 @@
+import copy
+import json
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+
+from src.utils import program_cache
+from src.utils.program_cache import get_cached_program, get_program_digest
+
+
+class TestProgramCache:
+
+    @pytest.fixture(autouse=True)
+    def _use_empty_cache(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(program_cache, "_programs", OrderedDict())
+
+    @pytest.fixture(name="program_data")
+    def _get_program_data(self) -> dict:
+        return json.load(
+            open(
+                Path(__file__).parent.joinpath(
+                    "data", "programmering_WDOD", "Programmering WDOD.json"
+                )
+            )
+        )
+
+    def test_same_stores_share_the_program(self, program_data: dict):
+        # 1. Define data
+        _imported_runs_data = program_data["imported_runs_data"]
+        _projects_overview_data = program_data["project_data"]
+
+        # 2. Define test
+        _cached_program = get_cached_program(
+            _imported_runs_data, _projects_overview_data
+        )
+        _cached_program_copy = get_cached_program(
+            copy.deepcopy(_imported_runs_data),
+            copy.deepcopy(_projects_overview_data),
+        )
+
+        # 3. Assert
+        assert _cached_program_copy is _cached_program
+        assert _cached_program.cost > 0
+        assert set(_cached_program.risk_metrics) == {"current", "program"}
+
+    def test_changed_projects_give_another_program(self, program_data: dict):
+        # 1. Define data
+        _imported_runs_data = program_data["imported_runs_data"]
+        _projects_overview_data = program_data["project_data"]
+        _fewer_projects_data = _projects_overview_data[:-1]
+
+        # 2. Define test
+        _cached_program = get_cached_program(
+            _imported_runs_data, _projects_overview_data
+        )
+        _other_cached_program = get_cached_program(
+            _imported_runs_data, _fewer_projects_data
+        )
+
+        # 3. Assert
+        assert get_program_digest(
+            _imported_runs_data, _projects_overview_data
+        ) != get_program_digest(_imported_runs_data, _fewer_projects_data)
+        assert _other_cached_program is not _cached_program
+        assert len(_other_cached_program.program.projects) == (
+            len(_cached_program.program.projects) - 1
+        )
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from src.utils.reliability import (
+    beta_to_log_pf,
+    beta_to_pf,
+    combine_betas_in_series,
+    log_pf_to_beta,
+    pf_to_beta,
+)
+
+
+class TestReliability:
+
+    @pytest.mark.parametrize("beta", [3.5, -1.0, [2.0, 4.5], np.nan])
+    def test_beta_to_pf_equals_norm_cdf(self, beta):
+        # 1. Define data
+        _expected_pf = norm.cdf(-np.asarray(beta))
+
+        # 2. Define test
+        _pf = beta_to_pf(beta)
+
+        # 3. Assert
+        assert np.array_equal(_pf, _expected_pf, equal_nan=True)
+
+    @pytest.mark.parametrize("pf", [1e-5, 0.5, 0.0, 1.0, [1e-4, 0.3], 1.5])
+    def test_pf_to_beta_equals_norm_ppf(self, pf):
+        # 1. Define data
+        _expected_beta = -norm.ppf(pf)
+
+        # 2. Define test
+        _beta = pf_to_beta(pf)
+
+        # 3. Assert
+        assert np.array_equal(_beta, _expected_beta, equal_nan=True)
+
+    def test_matrix_conversion_round_trip(self):
+        # 1. Define data
+        _betas = np.linspace(-1.0, 8.0, 30).reshape(5, 6)
+
+        # 2. Define test
+        _round_trip_betas = pf_to_beta(beta_to_pf(_betas))
+
+        # 3. Assert
+        assert _round_trip_betas.shape == (5, 6)
+        assert _round_trip_betas == pytest.approx(_betas)
+
+    def test_log_pf_keeps_precision_at_high_beta(self):
+        # 1. Define data
+        _betas = np.array([10.0, 40.0, 60.0])
+
+        # 2. Define test
+        _log_pf = beta_to_log_pf(_betas)
+
+        # 3. Assert
+        assert np.all(np.isfinite(_log_pf))
+        assert log_pf_to_beta(_log_pf) == pytest.approx(_betas)
+        assert beta_to_pf(60.0) == 0.0
+
+    def test_combine_betas_in_series(self):
+        # 1. Define data
+        _betas = np.array([[3.0, 4.0], [3.5, 20.0], [4.0, 5.0]])  # mechanism x year
+        _expected_pf = 1 - np.prod(1 - norm.cdf(-_betas), axis=0)
+
+        # 2. Define test
+        _combined_betas = combine_betas_in_series(_betas, axis=0)
+
+        # 3. Assert
+        assert beta_to_pf(_combined_betas) == pytest.approx(_expected_pf, rel=1e-9)
+        assert _combined_betas[1] == pytest.approx(3.9978, abs=1e-4)
@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.linear_objects.dike_traject import DikeTraject
+from src.utils.traject_codec import (
+    decode_dike_traject_data,
+    encode_dike_traject_data,
+    is_encoded_dike_traject_data,
+    load_dike_traject_data,
+)
+
+
+class TestTrajectCodec:
+
+    @pytest.fixture(name="dike_traject_data")
+    def _get_dike_traject_data(self) -> dict:
+        return json.load(
+            open(
+                Path(__file__).parent
+                / "data/31-1 base coastal case/reference"
+                / "dike_data.json"
+            )
+        )
+
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_round_trip_is_exact(self, dike_traject_data: dict, compress: bool):
+        # 1. Define data
+        _content = encode_dike_traject_data(dike_traject_data, compress=compress)
+
+        # 2. Define test
+        _decoded_data = decode_dike_traject_data(_content)
+        _dike_traject = DikeTraject.deserialize(_decoded_data)
+
+        # 3. Assert
+        assert is_encoded_dike_traject_data(_content)
+        assert len(_content) < len(json.dumps(dike_traject_data))
+        assert _decoded_data == dike_traject_data
+        assert (
+            _dike_traject.serialize()
+            == DikeTraject.deserialize(dike_traject_data).serialize()
+        )
+
+    def test_decode_as_arrays(self, dike_traject_data: dict):
+        # 1. Define data
+        _content = encode_dike_traject_data(dike_traject_data, compress=False)
+        _section_data = dike_traject_data["dike_sections"][0]
+
+        # 2. Define test
+        _decoded_section_data = decode_dike_traject_data(_content, as_arrays=True)[
+            "dike_sections"
+        ][0]
+
+        # 3. Assert
+        _betas = _decoded_section_data["initial_assessment"]["Overflow"]
+        assert isinstance(_betas, np.ndarray)
+        assert not _betas.flags.writeable
+        assert np.array_equal(_betas, _section_data["initial_assessment"]["Overflow"])
+
+    def test_float32_is_close(self, dike_traject_data: dict):
+        # 1. Define data
+        _content = encode_dike_traject_data(dike_traject_data, float_dtype="<f4")
+
+        # 2. Define test
+        _decoded_data = decode_dike_traject_data(_content)
+
+        # 3. Assert
+        assert len(_content) < len(encode_dike_traject_data(dike_traject_data))
+        assert np.allclose(
+            _decoded_data["greedy_steps"][1]["pf"],
+            dike_traject_data["greedy_steps"][1]["pf"],
+            rtol=1e-6,
+        )
+
+    def test_load_falls_back_to_json(self, dike_traject_data: dict):
+        # 1. Define data
+        _json_content = json.dumps(dike_traject_data).encode()
+
+        # 2. Define test
+        _loaded_data = load_dike_traject_data(_json_content)
+
+        # 3. Assert
+        assert not is_encoded_dike_traject_data(_json_content)
+        assert _loaded_data == dike_traject_data
@@ -0,0 +1,76 @@
+import json
+from collections import OrderedDict
+from pathlib import Path
+
+import diskcache
+import pytest
+
+from src.linear_objects.dike_traject import DikeTraject
+from src.utils import traject_store
+from src.utils.traject_store import (
+    TRAJECT_TOKEN_KEY,
+    TrajectNotFound,
+    get_dike_traject,
+    get_dike_traject_data,
+    is_dike_traject_stored,
+    store_dike_traject_data,
+)
+
+
+class TestTrajectStore:
+
+    @pytest.fixture(autouse=True)
+    def _use_temporary_store(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        _store = diskcache.Cache(str(tmp_path))
+        monkeypatch.setattr(traject_store, "_traject_store", _store)
+        monkeypatch.setattr(traject_store, "_deserialized_trajects", OrderedDict())
+        yield
+        _store.close()
+
+    @pytest.fixture(name="dike_traject_data")
+    def _get_dike_traject_data(self) -> dict:
+        return json.load(
+            open(
+                Path(__file__).parent
+                / "data/31-1 base coastal case/reference"
+                / "dike_data.json"
+            )
+        )
+
+    def test_store_returns_token(self, dike_traject_data: dict):
+        # 1. Define data
+        _stored_data = store_dike_traject_data(dike_traject_data)
+
+        # 2. Define test
+        _dike_traject_1 = get_dike_traject(_stored_data)
+        _dike_traject_2 = get_dike_traject(_stored_data)
+
+        # 3. Assert
+        assert list(_stored_data.keys()) == [TRAJECT_TOKEN_KEY]
+        assert _stored_data == store_dike_traject_data(dike_traject_data)
+        assert get_dike_traject_data(_stored_data) == dike_traject_data
+        assert isinstance(_dike_traject_1, DikeTraject)
+        assert _dike_traject_1 is _dike_traject_2
+
+    def test_serialized_traject_is_accepted(self, dike_traject_data: dict):
+        # 1. Define data / 2. Define test
+        _dike_traject = get_dike_traject(dike_traject_data)
+
+        # 3. Assert
+        assert isinstance(_dike_traject, DikeTraject)
+        assert get_dike_traject_data(dike_traject_data) is dike_traject_data
+
+    def test_evicted_traject_is_not_found(self, dike_traject_data: dict):
+        # 1. Define data
+        _stored_data = store_dike_traject_data(dike_traject_data)
+
+        # 2. Define test
+        traject_store.get_traject_store().clear()
+
+        # 3. Assert
+        assert not is_dike_traject_stored(_stored_data)
+        assert is_dike_traject_stored(dike_traject_data)
+        with pytest.raises(TrajectNotFound):
+            get_dike_traject_data(_stored_data)
+        with pytest.raises(TrajectNotFound):
+            get_dike_traject(_stored_data)
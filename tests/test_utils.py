@@ -1,6 +1,11 @@
 import numpy as np
 
-from src.utils.utils import interpolate_beta_values
+from src.linear_objects.dike_section import DikeSection
+from src.utils.gws_convertor import GWSRDConvertor
+from src.utils.utils import (
+    interpolate_beta_values,
+    interpolate_beta_values_per_segment,
+)
 
 
 class TestUtils:
@@ -21,3 +26,90 @@ class TestUtils:
         betas = interpolate_beta_values(years_output, betas, years)
 
         assert isinstance(betas, np.ndarray)
+
+    def test_interpolate_beta_values_per_segment(self):
+        # 1. Define data
+        _years = np.array([2025, 2044, 2050, 2075, 2100, 2125])
+        _betas = np.array(
+            [[3.2, 3.1, 3.0, 2.9, 2.8, 2.7], [4.5, 4.4, 4.3, 4.2, 4.1, 4.0]]
+        )
+        _years_output = [np.linspace(2025, 2040, 16), np.linspace(2040, 2130, 91)]
+
+        # 2. Define test
+        _segment_betas = interpolate_beta_values_per_segment(
+            _years_output, _betas, _years
+        )
+
+        # 3. Assert
+        assert np.array_equal(
+            _segment_betas,
+            np.concatenate(
+                [
+                    interpolate_beta_values(_years_output[0], _betas[0], _years),
+                    interpolate_beta_values(_years_output[1], _betas[1], _years),
+                ]
+            ),
+        )
+        assert _segment_betas[-1] == _betas[1, -1]
+
+
+class TestGWSRDConvertor:
+
+    def test_to_wgs_array_matches_point_conversion(self):
+        # 1. Define data
+        _x = np.array([155000.0, 120000.5, 200100.0])
+        _y = np.array([463000.0, 430000.0, 480250.5])
+        # computed point by point with the former scalar series
+        _expected_wgs = [
+            [52.1551744, 5.38720621],
+            [51.85746748048594, 4.8791548805535285],
+            [52.30836837986701, 6.048511880261627],
+        ]
+
+        # 2. Define test
+        _coordinates_wgs = GWSRDConvertor().to_wgs_array(_x, _y)
+        _coordinates_rd = GWSRDConvertor().to_rd_array(
+            _coordinates_wgs[:, 0], _coordinates_wgs[:, 1]
+        )
+
+        # 3. Assert
+        assert _coordinates_wgs.shape == (3, 2)
+        assert np.allclose(_coordinates_wgs, _expected_wgs, rtol=0, atol=1e-10)
+        assert np.allclose(GWSRDConvertor().to_wgs(_x[1], _y[1]), _expected_wgs[1])
+        # the series are approximations, the round trip is accurate to less than a meter
+        assert np.allclose(_coordinates_rd, np.stack([_x, _y], axis=-1), atol=1)
+
+    def test_to_rd_array_matches_point_conversion(self):
+        # 1. Define data
+        _lat = np.array([52.0, 51.5, 53.2])
+        _lon = np.array([5.0, 4.25, 6.6])
+        # computed point by point with the former scalar series
+        _expected_rd = [
+            [128409.89997767913, 445806.27561779344],
+            [76038.66104330578, 390724.2435835153],
+            [236043.32708840034, 579943.5362081928],
+        ]
+
+        # 2. Define test
+        _coordinates_rd = GWSRDConvertor().to_rd_array(_lat, _lon)
+
+        # 3. Assert
+        assert _coordinates_rd.shape == (3, 2)
+        assert np.allclose(_coordinates_rd, _expected_rd, rtol=0, atol=1e-6)
+        assert np.allclose(GWSRDConvertor().to_rd(_lat[2], _lon[2]), _expected_rd[2])
+
+    def test_section_coordinates_wgs84_are_cached(self):
+        # 1. Define data
+        _section = DikeSection(
+            name="1", coordinates_rd=[(155000, 463000), (155100, 463100)], in_analyse=1
+        )
+
+        # 2. Define test
+        _coordinates_wgs = _section.coordinates_wgs84
+        _coordinates_wgs_cached = _section.coordinates_wgs84
+        _section.coordinates_rd = [(155000, 463000), (156000, 464000)]
+
+        # 3. Assert
+        assert _coordinates_wgs is _coordinates_wgs_cached
+        assert not _coordinates_wgs.flags.writeable
+        assert not np.allclose(_section.coordinates_wgs84, _coordinates_wgs)